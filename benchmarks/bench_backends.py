@@ -0,0 +1,47 @@
+"""
+    Benchmark of the execution backends of Feed.fetch_all against the local stub Blogger server.
+
+    python benchmarks/bench_backends.py --posts 1000 --latency 0.02 --workers 10
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import StubBlog, StubServer  # noqa: E402
+from blogger_scrapper.blog import Blogsite  # noqa: E402
+from blogger_scrapper.executor import BACKENDS  # noqa: E402
+
+
+def run(backend, url, workers):
+    site = Blogsite(url, backend=backend, max_workers=workers)
+    feed = site.blog_feed
+    start = time.perf_counter()
+    articles = feed.fetch_all()
+    elapsed = time.perf_counter() - start
+    return len(feed.pages), len(articles), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds slept by the stub before every response")
+    parser.add_argument("--workers", type=int, default=10)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    with StubServer(StubBlog(posts=args.posts), latency=args.latency) as stub:
+        print(f"{args.posts} posts, {args.latency * 1000:.0f}ms latency, {args.workers} workers")
+        print(f"{'backend':<10}{'pages':>8}{'articles':>10}{'seconds':>10}{'pages/sec':>12}")
+        for backend in args.backends:
+            pages, articles, elapsed = run(backend, stub.url, args.workers)
+            print(f"{backend:<10}{pages:>8}{articles:>10}{elapsed:>10.2f}{pages / elapsed:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
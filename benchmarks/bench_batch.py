@@ -0,0 +1,63 @@
+"""
+    Benchmark of the BatchScrapper against sequential Scrapper runs, scraping several stub Blogger sites - each one
+    served by its own stub server, ie. its own host - with all requests of the batch going through one shared pool.
+
+    python benchmarks/bench_batch.py --sites 20 --posts 200 --latency 0.02 --workers 32 --per-host 4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import warnings
+from contextlib import ExitStack
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import StubBlog, StubServer  # noqa: E402
+from blogger_scrapper.batch import BatchScrapper  # noqa: E402
+from blogger_scrapper.scrapper import Scrapper  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sites", type=int, default=20)
+    parser.add_argument("--posts", type=int, default=200, help="Posts per site")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds slept by the stubs before every response")
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--max-sites", type=int, default=8)
+    parser.add_argument("--per-host", type=int, default=4)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    with ExitStack() as stack, tempfile.TemporaryDirectory() as directory:
+        stubs = [stack.enter_context(StubServer(StubBlog(posts=args.posts, comments_every=2), latency=args.latency))
+                 for _ in range(args.sites)]
+        os.chdir(directory)
+        os.mkdir("output")
+        print(f"{args.sites} sites of {args.posts} posts, {args.latency * 1000:.0f} ms latency")
+        print(f"{'run':<12}{'seconds':>9}{'requests':>10}{'max at once/host':>18}")
+
+        start, requests = time.perf_counter(), sum(stub.requests for stub in stubs)
+        for stub in stubs:
+            Scrapper(stub.url, max_workers=args.per_host).scrap()
+        print(f"{'sequential':<12}{time.perf_counter() - start:>9.2f}"
+              f"{sum(stub.requests for stub in stubs) - requests:>10}"
+              f"{max(stub.peak_in_flight for stub in stubs):>18}")
+
+        for stub in stubs:
+            stub._server.peak_in_flight = 0
+        start, requests = time.perf_counter(), sum(stub.requests for stub in stubs)
+        batch = BatchScrapper([stub.url for stub in stubs], max_workers=args.workers, max_sites=args.max_sites,
+                              per_host=args.per_host)
+        progress = batch.run()
+        failed = sum(site_progress['status'] == "failed" for site_progress in progress.values())
+        print(f"{'batch':<12}{time.perf_counter() - start:>9.2f}"
+              f"{sum(stub.requests for stub in stubs) - requests:>10}"
+              f"{max(stub.peak_in_flight for stub in stubs):>18}{f'  ({failed} sites failed)' if failed else ''}")
+        print(f"exports: {len(os.listdir('output'))} files")
+
+
+if __name__ == "__main__":
+    main()
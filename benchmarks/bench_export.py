@@ -0,0 +1,109 @@
+"""
+    Benchmark of the XML export - the previous path (JSON dumped to a temporary file, loaded back and converted with
+    dicttoxml) versus the streaming lxml writer of FileExport - export time, peak memory allocated while exporting and
+    whether both files hold the same XML tree. Memory is measured with tracemalloc, which only sees the Python
+    allocations, not the ones libxml2 makes.
+
+    python benchmarks/bench_export.py --articles 2000 --rounds 3
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dicttoxml import dicttoxml  # noqa: E402
+from lxml import etree  # noqa: E402
+from stub_server import StubBlog  # noqa: E402
+from blogger_scrapper import parser  # noqa: E402
+from blogger_scrapper.export import FileExport  # noqa: E402
+
+
+def generate(articles_num, authors_num=20):
+    blog = StubBlog(posts=articles_num, comments_every=2, comments_per_post=4, authors=authors_num)
+    blog.base_url = "http://127.0.0.1"
+    articles = []
+    for start_index in range(1, articles_num + 1, 500):
+        page = blog.posts_feed(blog.base_url, {'start-index': [str(start_index)], 'max-results': ['500']})
+        articles.extend(parser.iter_articles(page.encode("UTF-8"), "atom"))
+    for article in articles:
+        article.comments = list(parser.iter_comments(blog.comments_feed(blog.base_url, {}, article.article_id)
+                                                     .encode("UTF-8"), article_backref=article.article_id))
+    authors = list({author for article in articles for author in [article.author, *(c.author for c in
+                                                                                    article.comments)]})
+    comments = [comment for article in articles for comment in article.comments]
+    return articles, authors, comments
+
+
+def previous_export(export):
+    data_dict = {
+        'articles': {f"article-{i}": export._article_with_comments_data(article)
+                     for i, article in enumerate(export.all_articles, start=1)},
+        'authors': {f"author-{i}": export._author_data(author) for i, author in enumerate(export.all_authors, start=1)},
+        'comments': {f"comment-{i}": export._comment_data(comment)
+                     for i, comment in enumerate(export.all_comments, start=1)}
+    }
+    with open("output/.tmp.json", "w+", encoding=export.encoding) as f:
+        f.write(json.dumps(data_dict, indent=4, ensure_ascii=False))
+    with open("output/.tmp.json", "r+") as f:
+        data = json.load(f)
+    os.remove("output/.tmp.json")
+    with open("output/previous.xml", "wb") as f:
+        f.write(dicttoxml({"export": data}))
+    return "output/previous.xml"
+
+
+def streaming_export(export):
+    export.do_export()
+    return max(glob.glob("output/xml_export-*.xml"), key=os.path.getmtime)
+
+
+def measure(function, export, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function(export)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    path = function(export)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return path, best, peak
+
+
+def tree(path):
+    return [(element.tag, element.get("type"), element.text or "") for element in etree.parse(path).iter()]
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argument_parser.add_argument("--articles", type=int, default=2000)
+    argument_parser.add_argument("--rounds", type=int, default=3)
+    args = argument_parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    articles, authors, comments = generate(args.articles)
+    export = FileExport(articles, authors, comments, 'xml')
+    os.chdir(tempfile.mkdtemp())
+    os.mkdir("output")
+
+    print(f"{args.articles} articles, {len(comments)} comments")
+    print(f"{'export':<12}{'MB':>8}{'seconds':>10}{'peak MiB':>10}")
+    paths = []
+    for label, function in (("previous", previous_export), ("streaming", streaming_export)):
+        path, best, peak = measure(function, export, args.rounds)
+        paths.append(path)
+        print(f"{label:<12}{os.path.getsize(path) / 2 ** 20:>8.1f}{best:>10.2f}{peak / 2 ** 20:>10.2f}")
+    print(f"same XML tree: {tree(paths[0]) == tree(paths[1])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+    Benchmark of lookups on scrapped articles - linear scans of the list of articles versus the ArticleIndex the Feed
+    builds during 'fetch_all': article by ID, comment by ID, articles of an author, articles published within a week,
+    and collecting all authors and comments the way 'get_all_authors'/'get_all_comments' do.
+
+    python benchmarks/bench_index.py --articles 20000 --queries 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import warnings
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_export import generate  # noqa: E402
+from blogger_scrapper.index import ArticleIndex  # noqa: E402
+
+
+def scan_article(articles, article):
+    return next(a for a in articles if a.article_id == article.article_id)
+
+
+def scan_comment(articles, article):
+    comment_id = article.comments[0].comment_id if article.comments else -1
+    return next((c for a in articles for c in a.comments if c.comment_id == comment_id), None)
+
+
+def scan_author(articles, article):
+    return [a for a in articles if a.author == article.author]
+
+
+def scan_week(articles, article):
+    end = article.published_date + timedelta(days=7)
+    return sorted((a for a in articles if article.published_date <= a.published_date < end),
+                  key=lambda a: a.published_date)
+
+
+def index_article(index, article):
+    return index.article(article.article_id)
+
+
+def index_comment(index, article):
+    return index.comment(article.comments[0].comment_id if article.comments else -1)
+
+
+def index_author(index, article):
+    return index.articles_by(article.author)
+
+
+def index_week(index, article):
+    return index.published_between(article.published_date, article.published_date + timedelta(days=7))
+
+
+def scan_all(articles):
+    authors = {author for a in articles for author in [a.author, *(c.author for c in a.comments)]}
+    comments = {c for a in articles for c in a.comments}
+    return authors, comments
+
+
+def run(function, data, sample):
+    start = time.perf_counter()
+    for article in sample:
+        function(data, article)
+    return (time.perf_counter() - start) / len(sample)
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argument_parser.add_argument("--articles", type=int, default=20000)
+    argument_parser.add_argument("--authors", type=int, default=500)
+    argument_parser.add_argument("--queries", type=int, default=200)
+    args = argument_parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    articles, _authors, comments = generate(args.articles, args.authors)
+    start = time.perf_counter()
+    index = ArticleIndex(articles)
+    built = time.perf_counter() - start
+    random.seed(1)
+    sample = random.sample(articles, args.queries)
+
+    print(f"{len(articles)} articles, {len(comments)} comments, index built in {built * 1000:.0f}ms")
+    print(f"{'lookup':<26}{'scan ms':>10}{'index ms':>10}")
+    for label, scan, indexed in (("article by ID", scan_article, index_article),
+                                 ("comment by ID", scan_comment, index_comment),
+                                 ("author posts", scan_author, index_author),
+                                 ("week range", scan_week, index_week)):
+        print(f"{label:<26}{run(scan, articles, sample) * 1000:>10.3f}{run(indexed, index, sample) * 1000:>10.3f}")
+
+    start = time.perf_counter()
+    scan_all(articles)
+    scanned = time.perf_counter() - start
+    start = time.perf_counter()
+    index.authors(), index.comments()
+    indexed = time.perf_counter() - start
+    print(f"{'all authors and comments':<26}{scanned * 1000:>10.3f}{indexed * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
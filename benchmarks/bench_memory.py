@@ -0,0 +1,93 @@
+"""
+    Benchmark of the memory taken by the data model - bytes retained per article and per comment (including their
+    strings and dates, measured with tracemalloc), the size of the objects themselves, and the cost of pickling a page
+    of articles, which is what the 'process' backend does for every page it sends back. Articles and comments are parsed
+    both with and without an AuthorRegistry sharing the author objects, as a Feed does.
+
+    python benchmarks/bench_memory.py --articles 5000
+"""
+
+import argparse
+import gc
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import StubBlog  # noqa: E402
+from blogger_scrapper import parser  # noqa: E402
+from blogger_scrapper.blog import AuthorRegistry  # noqa: E402
+
+
+def object_size(obj):
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def retained(function):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = function()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argument_parser.add_argument("--articles", type=int, default=5000)
+    argument_parser.add_argument("--rounds", type=int, default=5)
+    args = argument_parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    blog = StubBlog(posts=args.articles, comments_every=1, comments_per_post=1, content_size=200)
+    blog.base_url = "http://127.0.0.1"
+    pages = [blog.posts_feed(blog.base_url, {'start-index': [str(start)], 'max-results': ['500']}).encode("UTF-8")
+             for start in range(1, args.articles + 1, 500)]
+    comment_pages = [blog.comments_feed(blog.base_url, {'start-index': [str(start)], 'max-results': ['500']})
+                     .encode("UTF-8") for start in range(1, args.articles + 1, 500)]
+
+    articles, articles_bytes = retained(lambda: [article for page in pages
+                                                 for article in parser.iter_articles(page, "atom")])
+    comments, comments_bytes = retained(lambda: [comment for page in comment_pages
+                                                 for comment in parser.iter_comments(page)])
+    authors = AuthorRegistry()
+    _interned, interned_bytes = retained(lambda: [item for page, comment_page in zip(pages, comment_pages)
+                                                  for item in [*parser.iter_articles(page, "atom", authors),
+                                                               *parser.iter_comments(comment_page, authors=authors)]])
+
+    print(f"{len(articles)} articles, {len(comments)} comments, {len(authors)} authors")
+    print(f"{'':<10}{'retained B/obj':>16}{'object B':>10}{'author B':>10}")
+    print(f"{'article':<10}{articles_bytes / len(articles):>16.0f}{object_size(articles[0]):>10}"
+          f"{object_size(articles[0].author):>10}")
+    print(f"{'comment':<10}{comments_bytes / len(comments):>16.0f}{object_size(comments[0]):>10}"
+          f"{object_size(comments[0].author):>10}")
+    print(f"\nretained by articles and comments: {(articles_bytes + comments_bytes) / 2 ** 20:.1f}MiB, "
+          f"{interned_bytes / 2 ** 20:.1f}MiB with interned authors")
+
+    page = articles[:500]
+    for comment, article in zip(comments, page):
+        article.comments = [comment]
+    best_dump, best_load = None, None
+    for _ in range(args.rounds):
+        start = time.perf_counter()
+        data = pickle.dumps(page, protocol=pickle.HIGHEST_PROTOCOL)
+        dumped = time.perf_counter()
+        pickle.loads(data)
+        loaded = time.perf_counter()
+        best_dump = dumped - start if best_dump is None else min(best_dump, dumped - start)
+        best_load = loaded - dumped if best_load is None else min(best_load, loaded - dumped)
+    print(f"\npickled page of {len(page)} articles: {len(data) / 1024:.0f}KB, dump {best_dump * 1000:.1f}ms, "
+          f"load {best_load * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
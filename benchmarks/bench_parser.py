@@ -0,0 +1,84 @@
+"""
+    Benchmark of parsing 500-entry feed pages with BeautifulSoup (the previous approach) versus the lxml iterparse
+    parser of the package - parse time and peak memory allocated while parsing. Memory is measured with tracemalloc,
+    which only sees the Python allocations, not the ones libxml2 makes for the elements it's holding.
+
+    python benchmarks/bench_parser.py --entries 500 --rounds 5
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+import tracemalloc
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+from stub_server import StubBlog  # noqa: E402
+from blogger_scrapper import parser  # noqa: E402
+from blogger_scrapper.blog import BlogAtomArticle, BlogRSSArticle, BlogComment  # noqa: E402
+
+
+def soup_atom(data):
+    soup = BeautifulSoup(data.decode("UTF-8"), features="lxml")
+    return [BlogAtomArticle(article_tag=entry) for entry in soup.find_all("entry")]
+
+
+def soup_rss(data):
+    soup = BeautifulSoup(data.decode("UTF-8"), features="lxml")
+    return [BlogRSSArticle(article_tag=item) for item in soup.find_all("item")]
+
+
+def soup_comments(data):
+    soup = BeautifulSoup(data.decode("UTF-8"), features="lxml")
+    return [BlogComment(comment_tag=entry, article_backref=1) for entry in soup.find_all("entry")]
+
+
+def measure(function, data, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = function(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    result = function(data)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(result), best, peak
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argument_parser.add_argument("--entries", type=int, default=500)
+    argument_parser.add_argument("--rounds", type=int, default=5)
+    args = argument_parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    blog = StubBlog(posts=args.entries, comments_every=1, comments_per_post=1)
+    blog.base_url = "http://127.0.0.1"
+    query = {'max-results': [str(args.entries)]}
+    # The comments feed links are dropped, so that the BeautifulSoup articles don't go to the network for comments
+    atom = re.sub("<link rel='replies' type='application/atom\\+xml'[^>]*/>", "",
+                  blog.posts_feed(blog.base_url, query)).encode("UTF-8")
+    rss = blog.posts_feed(blog.base_url, {**query, 'alt': ['rss']}).encode("UTF-8")
+    comments = blog.comments_feed(blog.base_url, query).encode("UTF-8")
+
+    cases = [
+        ("atom posts", atom, soup_atom, lambda data: list(parser.iter_articles(data, "atom"))),
+        ("rss posts", rss, soup_rss, lambda data: list(parser.iter_articles(data, "rss"))),
+        ("comments", comments, soup_comments, lambda data: list(parser.iter_comments(data, article_backref=1)))
+    ]
+    print(f"{'page':<12}{'size':>10}{'parser':>14}{'entries':>9}{'ms':>10}{'peak MiB':>10}")
+    for name, data, old, new in cases:
+        for label, function in (("beautifulsoup", old), ("iterparse", new)):
+            entries, best, peak = measure(function, data, args.rounds)
+            print(f"{name:<12}{len(data) // 1024:>8}KB{label:>14}{entries:>9}{best * 1000:>10.1f}"
+                  f"{peak / 2 ** 20:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+    Benchmark of the retries of failed feed pages against a stub Blogger server answering a share of the posts feed
+    pages with 500 errors (and some pages for good) - scrapping time, articles collected and failed pages, then the
+    cost of fetching only the failed pages again once the server recovered.
+
+    python benchmarks/bench_retry.py --posts 1500 --error-rate 0.2 --failing-pages 26 51 --workers 10
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import StubBlog, StubServer  # noqa: E402
+from blogger_scrapper.blog import Blogsite  # noqa: E402
+from blogger_scrapper.retry import RetryPolicy  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--posts", type=int, default=1500)
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds slept by the stub before every response")
+    parser.add_argument("--error-rate", type=float, default=0.2, help="Share of the feed pages answered with 500")
+    parser.add_argument("--failing-pages", type=int, nargs="*", default=[26, 51],
+                        help="'start-index' of the feed pages failing for good")
+    parser.add_argument("--max-attempts", type=int, default=4)
+    parser.add_argument("--backoff", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, default=10)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    with StubServer(StubBlog(posts=args.posts, comments_every=1, comments_per_post=2), latency=args.latency,
+                    error_rate=args.error_rate, failing_pages=args.failing_pages) as stub:
+        policy = RetryPolicy(max_attempts=args.max_attempts, backoff=args.backoff)
+        feed = Blogsite(stub.url, max_workers=args.workers, retry_policy=policy).blog_feed
+        print(f"{args.posts} posts in {len(feed.pages)} pages, {args.error_rate:.0%} of the page requests failing, "
+              f"{len(args.failing_pages)} pages failing for good, {policy}")
+        print(f"{'run':<12}{'seconds':>9}{'requests':>10}{'errors':>8}{'articles':>10}{'failed pages':>14}")
+
+        start, requests, failed = time.perf_counter(), stub.requests, stub.failed
+        articles = feed.fetch_all(allow_partial=True)
+        print(f"{'fetch_all':<12}{time.perf_counter() - start:>9.2f}{stub.requests - requests:>10}"
+              f"{stub.failed - failed:>8}{len(articles):>10}{len(feed.failed_pages):>14}")
+
+        stub._server.error_rate = 0.0
+        stub._server.failing_pages = set()
+        start, requests, failed = time.perf_counter(), stub.requests, stub.failed
+        articles = feed.retry_failed_pages(allow_partial=True)
+        print(f"{'retry':<12}{time.perf_counter() - start:>9.2f}{stub.requests - requests:>10}"
+              f"{stub.failed - failed:>8}{len(articles):>10}{len(feed.failed_pages):>14}")
+        print(f"{'total':<12}{'':>9}{'':>10}{'':>8}{len(feed.index):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+    Benchmark of queries on the SQL export - the default schema (every value stored as text, no indexes) versus the
+    typed and indexed one: date range, per-author and per-article comments queries; keyword search with a LIKE
+    scan versus the FTS5 full-text index; and the rows rewritten when an unchanged feed is exported again.
+
+    python benchmarks/bench_sql.py --articles 20000 --queries 200
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import warnings
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_export import generate  # noqa: E402
+from stub_server import StubBlog  # noqa: E402
+from blogger_scrapper import parser  # noqa: E402
+from blogger_scrapper.export import SqlExport  # noqa: E402
+
+
+def date_range_query(typed, article):
+    start = article.published_date
+    end = start + timedelta(days=7)
+    if typed:
+        return "SELECT article_id, title FROM articles WHERE published_date BETWEEN ? AND ?", (start.timestamp(),
+                                                                                              end.timestamp())
+    return "SELECT article_id, title FROM articles WHERE published_date BETWEEN ? AND ?", (f"{start}", f"{end}")
+
+
+def author_query(typed, article):
+    author_id = article.author.author_id
+    return ("SELECT article_id, title FROM articles WHERE author = ?",
+            (author_id if typed else f"{author_id}",))
+
+
+def article_comments_query(typed, article):
+    article_id = article.article_id
+    return ("SELECT comments.comment_id, comments.content FROM articles_comments JOIN comments ON "
+            "comments.comment_id = articles_comments.comment_id WHERE articles_comments.article_id = ?",
+            (article_id if typed else f"{article_id}",))
+
+
+def run(database, typed, function, articles, queries):
+    conn = sqlite3.connect(database)
+    random.seed(1)
+    sample = random.sample(articles, queries)
+    rows = 0
+    start = time.perf_counter()
+    for article in sample:
+        query, parameters = function(typed, article)
+        rows += len(conn.execute(query, parameters).fetchall())
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return rows, elapsed / queries
+
+
+def reexport_changes(database, feed_type, typed, posts=60):
+    # Every run parses the feed again, as a new scrape of the same unchanged site would
+    blog = StubBlog(posts=posts, comments_every=0)
+    blog.base_url = "http://127.0.0.1"
+    query = {'start-index': ['1'], 'max-results': [str(posts)], 'alt': [feed_type]}
+    changes = []
+    for _run in range(2):
+        articles = list(parser.iter_articles(blog.posts_feed(blog.base_url, query).encode("UTF-8"), feed_type))
+        export = SqlExport(articles, list({article.author for article in articles}), [], database=database,
+                           typed=typed)
+        export.do_export()
+        changes.append(export.changes['articles'])
+    return changes
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argument_parser.add_argument("--articles", type=int, default=20000)
+    argument_parser.add_argument("--authors", type=int, default=500)
+    argument_parser.add_argument("--queries", type=int, default=200)
+    args = argument_parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    articles, authors, comments = generate(args.articles, args.authors)
+    directory = tempfile.mkdtemp()
+    databases = {}
+    print(f"{args.articles} articles, {len(comments)} comments, {len(authors)} authors")
+    print(f"{'schema':<10}{'export s':>10}{'MB':>8}")
+    for label, typed in (("text", False), ("typed", True)):
+        databases[label] = os.path.join(directory, f"{label}.db")
+        start = time.perf_counter()
+        SqlExport(articles, authors, comments, database=databases[label], typed=typed, full_text=typed).do_export()
+        print(f"{label:<10}{time.perf_counter() - start:>10.2f}{os.path.getsize(databases[label]) / 2 ** 20:>8.1f}")
+
+    print(f"\n{'query':<18}{'schema':<10}{'rows':>8}{'ms/query':>10}")
+    for name, function in (("date range", date_range_query), ("per author", author_query),
+                           ("article comments", article_comments_query)):
+        for label, typed in (("text", False), ("typed", True)):
+            rows, per_query = run(databases[label], typed, function, articles, args.queries)
+            print(f"{name:<18}{label:<10}{rows:>8}{per_query * 1000:>10.3f}")
+
+    print(f"\n{'keyword search':<28}{'rows':>8}{'ms/query':>10}")
+    search_export = SqlExport(articles, authors, comments, database=databases["typed"], full_text=True)
+    random.seed(1)
+    numbers = random.sample(range(args.articles), args.queries)
+    conn = sqlite3.connect(databases["typed"])
+    for label in ("LIKE scan", "full-text index"):
+        rows = 0
+        start = time.perf_counter()
+        for number in numbers:
+            if label == "LIKE scan":
+                rows += len(conn.execute("SELECT article_id, title FROM articles WHERE title LIKE ? OR content LIKE ? "
+                                         "LIMIT 20", (f"%number {number}", f"%number {number}")).fetchall())
+            else:
+                rows += len(search_export.search(f'"number {number}"'))
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28}{rows:>8}{elapsed / args.queries * 1000:>10.3f}")
+    conn.close()
+
+    print(f"\n{'re-export':<18}{'schema':<10}{'1st run':>8}{'2nd run':>9}")
+    for feed_type in ("atom", "rss"):
+        for label, typed in (("text", False), ("typed", True)):
+            first, second = reexport_changes(os.path.join(directory, f"reexport-{feed_type}-{label}.db"), feed_type,
+                                             typed)
+            print(f"{feed_type:<18}{label:<10}{first:>8}{second:>9}")
+
+
+if __name__ == "__main__":
+    main()
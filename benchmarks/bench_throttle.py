@@ -0,0 +1,58 @@
+"""
+    Benchmark of the HostThrottle against a stub Blogger server that throttles the requests over its rate and
+    concurrency limits (429/503 responses with a 'Retry-After' header) - scrapping time, throttled responses and how
+    much of the content is collected, with and without the throttle on the session.
+
+    python benchmarks/bench_throttle.py --posts 500 --rate-limit 100 --concurrency-limit 6 --workers 10
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import StubBlog, StubServer  # noqa: E402
+from blogger_scrapper.blog import Blogsite  # noqa: E402
+from blogger_scrapper.session import HttpSession  # noqa: E402
+from blogger_scrapper.throttle import HostThrottle  # noqa: E402
+
+
+def run(args, throttle):
+    with StubServer(StubBlog(posts=args.posts, comments_every=1, comments_per_post=2), latency=args.latency,
+                    rate_limit=args.rate_limit, concurrency_limit=args.concurrency_limit) as stub:
+        session = HttpSession(pool_size=args.workers, throttle=throttle)
+        feed = Blogsite(stub.url, session=session, max_workers=args.workers).blog_feed
+        start = time.perf_counter()
+        articles = feed.fetch_all()
+        elapsed = time.perf_counter() - start
+        comments = sum(len(article.comments) for article in articles)
+        return elapsed, stub.requests, stub.throttled, len(articles), comments, session.stats().get('throttle')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds slept by the stub before every response")
+    parser.add_argument("--rate-limit", type=int, default=100, help="Requests per second allowed by the stub")
+    parser.add_argument("--concurrency-limit", type=int, default=6, help="Requests at once allowed by the stub")
+    parser.add_argument("--workers", type=int, default=10)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    print(f"{args.posts} posts with {args.posts * 2} comments, stub limits: {args.rate_limit} requests/s, "
+          f"{args.concurrency_limit} at once")
+    print(f"{'session':<12}{'seconds':>9}{'requests':>10}{'throttled':>11}{'articles':>10}{'comments':>10}")
+    for label, throttle in (("plain", None), ("throttled", HostThrottle(max_concurrency=args.workers))):
+        elapsed, requests, throttled, articles, comments, stats = run(args, throttle)
+        print(f"{label:<12}{elapsed:>9.2f}{requests:>10}{throttled:>11}{articles:>10}{comments:>10}")
+        if stats:
+            for host, host_stats in stats.items():
+                print(f"{'':<12}final rate {host_stats['rate']}/s, concurrency {host_stats['concurrency']}, "
+                      f"{host_stats['backoffs']} backoffs")
+
+
+if __name__ == "__main__":
+    main()
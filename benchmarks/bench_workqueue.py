@@ -0,0 +1,76 @@
+"""
+    Benchmark of the work queue against a stub Blogger server - the pages of the posts and comments feeds enqueued,
+    fetched by independent worker processes (one of them killed halfway, its leases expiring) and merged, compared
+    with a single process fetching the feed with its comments in bulk.
+
+    python benchmarks/bench_workqueue.py --posts 2000 --workers 1 2 4 --error-rate 0.1
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import StubBlog, StubServer  # noqa: E402
+from blogger_scrapper.blog import Blogsite  # noqa: E402
+from blogger_scrapper.retry import RetryPolicy  # noqa: E402
+from blogger_scrapper.workqueue import WorkQueue, run_worker  # noqa: E402
+
+
+def _worker(path, max_jobs=None):
+    warnings.simplefilter("ignore")
+    return run_worker(WorkQueue(path), retry_policy=RetryPolicy(backoff=0.05), lease_seconds=2.0, max_jobs=max_jobs)
+
+
+def _summary(articles, authors, comments):
+    return (len(articles), len(authors), len(comments),
+            sorted((article.article_id, len(article.comments)) for article in articles))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds slept by the stub before every response")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="Share of the feed pages answered with 500")
+    parser.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    with StubServer(StubBlog(posts=args.posts, comments_every=2, comments_per_post=3), latency=args.latency,
+                    error_rate=args.error_rate) as stub:
+        feed = Blogsite(stub.url, max_workers=1, retry_policy=RetryPolicy(backoff=0.05)).blog_feed
+        start = time.perf_counter()
+        articles = feed.fetch_all(comments_mode="bulk")
+        expected = _summary(articles, feed.get_all_authors(articles), feed.index.comments())
+        print(f"{args.posts} posts, {expected[2]} comments, {args.error_rate:.0%} of the page requests failing")
+        print(f"{'run':<24}{'seconds':>9}{'jobs':>7}{'articles':>10}{'authors':>9}{'comments':>10}{'same':>6}")
+        print(f"{'fetch_all (1 worker)':<24}{time.perf_counter() - start:>9.2f}{'':>7}{expected[0]:>10}"
+              f"{expected[1]:>9}{expected[2]:>10}")
+
+        for workers in args.workers:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "queue.db")
+                queue = WorkQueue(path)
+                start = time.perf_counter()
+                jobs = queue.enqueue_feed(Blogsite(stub.url).blog_feed)
+                # A worker dying with leased jobs, which are handed to the others once their lease expires
+                crashed = multiprocessing.Process(target=_worker, args=(path,))
+                crashed.start()
+                time.sleep(0.3)
+                crashed.kill()
+                crashed.join()
+                with multiprocessing.Pool(workers) as pool:
+                    pool.map(_worker, [path] * workers)
+                result = _summary(*queue.merge(feed.url))
+                print(f"{f'work queue ({workers} workers)':<24}{time.perf_counter() - start:>9.2f}{jobs:>7}"
+                      f"{result[0]:>10}{result[1]:>9}{result[2]:>10}{str(result == expected):>6}")
+                queue.close()
+
+
+if __name__ == "__main__":
+    main()
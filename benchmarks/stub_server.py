@@ -0,0 +1,378 @@
+"""
+    Local stub of a Blogger site, serving the site page, the Atom/RSS posts feeds and the comments feeds of a generated
+    blog. Used by the benchmarks so that they don't depend on (or hammer) a real Blogger site.
+"""
+
+import hashlib
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from xml.sax.saxutils import escape, quoteattr
+
+BLOG_ID = 1234567890
+_NAMESPACES = ("xmlns='http://www.w3.org/2005/Atom' xmlns:openSearch='http://a9.com/-/spec/opensearchrss/1.0/' "
+               "xmlns:blogger='http://schemas.google.com/blogger/2008' xmlns:gd='http://schemas.google.com/g/2005' "
+               "xmlns:thr='http://purl.org/syndication/thread/1.0'")
+_RSS_NAMESPACES = ("xmlns:atom='http://www.w3.org/2005/Atom' "
+                   "xmlns:openSearch='http://a9.com/-/spec/opensearchrss/1.0/' "
+                   "xmlns:blogger='http://schemas.google.com/blogger/2008' xmlns:gd='http://schemas.google.com/g/2005' "
+                   "xmlns:thr='http://purl.org/syndication/thread/1.0'")
+
+
+class StubBlog:
+
+    def __init__(self, posts=500, comments_every=4, comments_per_post=3, authors=20, content_size=2000):
+        """ Generated content of the stub blog; every `comments_every`-th post has `comments_per_post` comments, the
+        rest have none.
+        """
+        self.base_url = None
+        start = datetime(2015, 1, 1, 12, 0, tzinfo=timezone(timedelta(hours=3)))
+        self.posts = []
+        self.comments = {}
+        comment_id = 9000000000
+        for number in range(posts):
+            post_id = 1000000000 + number
+            published = start + timedelta(hours=6 * number)
+            self.posts.append({
+                'id': post_id,
+                'title': f"Post number {number}",
+                'content': f"<p>{'Lorem ipsum dolor sit amet. ' * (content_size // 28)}</p>",
+                'published': published,
+                'updated': published + timedelta(minutes=5),
+                'author': number % authors
+            })
+            post_comments = []
+            if comments_every and number % comments_every == 0:
+                for c in range(comments_per_post):
+                    comment_id += 1
+                    post_comments.append({
+                        'id': comment_id,
+                        'content': f"Comment {c} on post {number}",
+                        'published': published + timedelta(hours=1, minutes=c),
+                        'updated': published + timedelta(hours=1, minutes=c),
+                        'author': (number + c + 1) % authors
+                    })
+            self.comments[post_id] = post_comments
+        # Newest posts come first in the Blogger feeds
+        self.posts.reverse()
+
+    def _author(self, author_number, namespace=""):
+        return (f"<{namespace}author><name>Author {author_number}</name>"
+                f"<uri>https://www.blogger.com/profile/{5550000 + author_number}</uri>"
+                f"<email>noreply@blogger.com</email>"
+                f"<gd:image rel='http://schemas.google.com/g/2005#thumbnail' width='16' height='16' "
+                f"src='https://img1.blogblog.com/img/b16-rounded.gif'/></{namespace}author>")
+
+    def site_page(self):
+        return (f"<!DOCTYPE html><html><head><meta content='text/html; charset=UTF-8' http-equiv='Content-Type'/>"
+                f"<meta content='blogger' name='generator'/>"
+                f"<link rel='alternate' type='application/atom+xml' title='Stub - Atom' "
+                f"href='{self.base_url}/feeds/posts/default'/>"
+                f"<link rel='alternate' type='application/rss+xml' title='Stub - RSS' "
+                f"href='{self.base_url}/feeds/posts/default?alt=rss'/>"
+                f"</head><body><h1>Stub blog</h1></body></html>")
+
+    def _feed_header(self, total, start_index, items_per_page, self_url):
+        return (f"<?xml version='1.0' encoding='UTF-8'?><feed {_NAMESPACES}>"
+                f"<id>tag:blogger.com,1999:blog-{BLOG_ID}</id><updated>2022-05-08T12:00:00.000+03:00</updated>"
+                f"<title type='text'>Stub blog</title>"
+                f"<link rel='self' type='application/atom+xml' href={quoteattr(self_url)}/>"
+                f"<link rel='alternate' type='text/html' href='{self.base_url}/'/>"
+                f"{self._author(0)}<generator version='7.00' uri='http://www.blogger.com'>Blogger</generator>"
+                f"<openSearch:totalResults>{total}</openSearch:totalResults>"
+                f"<openSearch:startIndex>{start_index}</openSearch:startIndex>"
+                f"<openSearch:itemsPerPage>{items_per_page}</openSearch:itemsPerPage>")
+
+    def _post_entry(self, post):
+        post_id = post['id']
+        comments = len(self.comments[post_id])
+        return (f"<entry><id>tag:blogger.com,1999:blog-{BLOG_ID}.post-{post_id}</id>"
+                f"<published>{post['published'].isoformat(timespec='milliseconds')}</published>"
+                f"<updated>{post['updated'].isoformat(timespec='milliseconds')}</updated>"
+                f"<title type='text'>{escape(post['title'])}</title>"
+                f"<content type='html'>{escape(post['content'])}</content>"
+                f"<link rel='replies' type='application/atom+xml' "
+                f"href='{self.base_url}/feeds/{post_id}/comments/default' title='Post Comments'/>"
+                f"<link rel='replies' type='text/html' href='{self.base_url}/p/{post_id}.html#comment-form' "
+                f"title='{comments} Comments'/>"
+                f"<link rel='edit' type='application/atom+xml' "
+                f"href='https://www.blogger.com/feeds/{BLOG_ID}/posts/default/{post_id}'/>"
+                f"<link rel='self' type='application/atom+xml' "
+                f"href='https://www.blogger.com/feeds/{BLOG_ID}/posts/default/{post_id}'/>"
+                f"<link rel='alternate' type='text/html' href='{self.base_url}/p/{post_id}.html' "
+                f"title={quoteattr(post['title'])}/>"
+                f"{self._author(post['author'])}<thr:total>{comments}</thr:total></entry>")
+
+    def _rss_item(self, post):
+        post_id = post['id']
+        return (f"<item><guid isPermaLink='false'>tag:blogger.com,1999:blog-{BLOG_ID}.post-{post_id}</guid>"
+                f"<pubDate>{format_datetime(post['published'].astimezone(timezone.utc))}</pubDate>"
+                f"<atom:updated>{post['updated'].isoformat(timespec='milliseconds')}</atom:updated>"
+                f"<title>{escape(post['title'])}</title><description>{escape(post['content'])}</description>"
+                f"<link>{self.base_url}/p/{post_id}.html</link>"
+                f"<author>noreply@blogger.com (Author{post['author']})</author>"
+                f"<thr:total>{len(self.comments[post_id])}</thr:total></item>")
+
+    def _comment_entry(self, post_id, comment):
+        return (f"<entry><id>tag:blogger.com,1999:blog-{BLOG_ID}.post-{comment['id']}</id>"
+                f"<published>{comment['published'].isoformat(timespec='milliseconds')}</published>"
+                f"<updated>{comment['updated'].isoformat(timespec='milliseconds')}</updated>"
+                f"<title type='text'>{escape(comment['content'])}</title>"
+                f"<content type='html'>{escape(comment['content'])}</content>"
+                f"<link rel='alternate' type='text/html' "
+                f"href='{self.base_url}/p/{post_id}.html?showComment={comment['id']}#c{comment['id']}'/>"
+                f"{self._author(comment['author'])}"
+                f"<thr:in-reply-to href='{self.base_url}/p/{post_id}.html' "
+                f"ref='tag:blogger.com,1999:blog-{BLOG_ID}.post-{post_id}' "
+                f"source='https://www.blogger.com/feeds/{BLOG_ID}/posts/default/{post_id}' type='text/html'/>"
+                f"</entry>")
+
+    @staticmethod
+    def _paging(query, total):
+        start_index = int(query.get('start-index', ['1'])[0])
+        max_results = min(int(query.get('max-results', ['25'])[0]), 500)
+        return start_index, max_results
+
+    def posts_feed(self, url, query):
+        posts = self.posts
+        if 'updated-min' in query:
+            updated_min = datetime.fromisoformat(query['updated-min'][0])
+            posts = [post for post in posts if post['updated'] >= updated_min]
+        start_index, max_results = self._paging(query, len(posts))
+        page = posts[start_index - 1:start_index - 1 + max_results]
+        if query.get('alt', [''])[0] == 'rss':
+            return (f"<?xml version='1.0' encoding='UTF-8'?><rss {_RSS_NAMESPACES} version='2.0'><channel>"
+                    f"<atom:id>tag:blogger.com,1999:blog-{BLOG_ID}</atom:id><title>Stub blog</title>"
+                    f"<description></description><link>{self.base_url}/</link>"
+                    f"<openSearch:totalResults>{len(posts)}</openSearch:totalResults>"
+                    f"<openSearch:startIndex>{start_index}</openSearch:startIndex>"
+                    f"<openSearch:itemsPerPage>{max_results}</openSearch:itemsPerPage>"
+                    f"{''.join(self._rss_item(post) for post in page)}</channel></rss>")
+        return (self._feed_header(len(posts), start_index, max_results, url) +
+                ''.join(self._post_entry(post) for post in page) + "</feed>")
+
+    def comments_feed(self, url, query, post_id=None):
+        if post_id is None:
+            comments = [(p['id'], comment) for p in self.posts for comment in reversed(self.comments[p['id']])]
+        else:
+            comments = [(post_id, comment) for comment in reversed(self.comments.get(post_id, []))]
+        if 'updated-min' in query:
+            updated_min = datetime.fromisoformat(query['updated-min'][0])
+            comments = [(pid, comment) for pid, comment in comments if comment['updated'] >= updated_min]
+        start_index, max_results = self._paging(query, len(comments))
+        page = comments[start_index - 1:start_index - 1 + max_results]
+        return (self._feed_header(len(comments), start_index, max_results, url) +
+                ''.join(self._comment_entry(pid, comment) for pid, comment in page) + "</feed>")
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _throttle(self):
+        """ Answers with a 429 (over the rate limit) or a 503 (over the concurrency limit) response if the request is
+        throttled; returns whether it was.
+        """
+        server = self.server
+        now = time.monotonic()
+        with server.counter_lock:
+            while server.recent and server.recent[0] <= now - 1:
+                server.recent.popleft()
+            if server.rate_limit is not None and len(server.recent) >= server.rate_limit:
+                status = 429
+            elif server.concurrency_limit is not None and server.in_flight > server.concurrency_limit:
+                status = 503
+            else:
+                server.recent.append(now)
+                return False
+            server.throttled += 1
+        self.send_response(status)
+        self.send_header("Retry-After", str(server.retry_after))
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return True
+
+    def _stall(self):
+        """ Holds the response back for `stall` seconds if the request is one of the posts feed pages whose
+        'start-index' is in `stalled_pages`, emulating a hung response.
+        """
+        server = self.server
+        split = urlsplit(self.path)
+        if split.path.strip("/") == "feeds/posts/default" and \
+                parse_qs(split.query).get("start-index", ["1"])[0] in server.stalled_pages:
+            time.sleep(server.stall)
+
+    def _fail(self):
+        """ Answers with a 500 response if the request is one of the posts feed pages failing at random (`error_rate`)
+        or for good (`failing_pages`, by 'start-index'), or one of the failing pages of the comments feeds of the
+        articles (`failing_comment_pages`); returns whether it did.
+        """
+        server = self.server
+        split = urlsplit(self.path)
+        parts = split.path.strip("/").split("/")
+        start_index = parse_qs(split.query).get("start-index", ["1"])[0]
+        with server.counter_lock:
+            if len(parts) == 4 and parts[0] == "feeds" and parts[2:] == ["comments", "default"]:
+                if start_index not in server.failing_comment_pages:
+                    return False
+            elif parts != ["feeds", "posts", "default"]:
+                return False
+            elif start_index not in server.failing_pages and server.random.random() >= server.error_rate:
+                return False
+            server.failed += 1
+        self.send_response(500)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return True
+
+    def do_GET(self):
+        server = self.server
+        with server.counter_lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        try:
+            if server.latency:
+                time.sleep(server.latency)
+            self._stall()
+            if not self._throttle() and not self._fail():
+                self._respond()
+        finally:
+            with server.counter_lock:
+                server.in_flight -= 1
+
+    def _respond(self):
+        server = self.server
+        split = urlsplit(self.path)
+        query = parse_qs(split.query)
+        url = f"{server.blog.base_url}{self.path}"
+        parts = split.path.strip("/").split("/")
+        if split.path in ("", "/"):
+            body, content_type = server.blog.site_page(), "text/html; charset=UTF-8"
+        elif parts == ["feeds", "posts", "default"]:
+            body, content_type = server.blog.posts_feed(url, query), "application/atom+xml; charset=UTF-8"
+        elif parts == ["feeds", "comments", "default"]:
+            body, content_type = server.blog.comments_feed(url, query), "application/atom+xml; charset=UTF-8"
+        elif len(parts) == 4 and parts[0] == "feeds" and parts[2:] == ["comments", "default"]:
+            body = server.blog.comments_feed(url, query, post_id=int(parts[1]))
+            content_type = "application/atom+xml; charset=UTF-8"
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        data = body.encode("UTF-8")
+        if parts == ["feeds", "posts", "default"] and query.get("start-index", ["1"])[0] in server.malformed_pages:
+            data = data[:len(data) // 2]
+        etag = f'W/"{hashlib.sha1(data).hexdigest()}"'
+        last_modified = max(post['updated'] for post in server.blog.posts).astimezone(timezone.utc)
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if self.headers.get("If-None-Match") == etag or (
+                "If-None-Match" not in self.headers and if_modified_since and
+                parsedate_to_datetime(if_modified_since) >= last_modified.replace(microsecond=0)):
+            server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", format_datetime(last_modified, usegmt=True))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubServer:
+
+    def __init__(self, blog=None, latency=0.0, port=0, rate_limit=None, concurrency_limit=None, retry_after=1,
+                 error_rate=0.0, failing_pages=(), seed=0, stalled_pages=(), stall=60.0, malformed_pages=(),
+                 failing_comment_pages=()):
+        """ Threaded HTTP server serving the provided `blog`; `latency` seconds are slept before every response to
+        emulate the round-trip to a real Blogger site. Throttling is emulated by answering the requests over
+        `rate_limit` requests per second with 429 and the ones over `concurrency_limit` requests at once with 503, both
+        with a 'Retry-After' header of `retry_after` seconds. Server errors are emulated by answering a share
+        `error_rate` of the posts feed page requests with 500, along with every request of the pages whose 'start-index'
+        is in `failing_pages`. Hung responses are emulated by holding the pages whose 'start-index' is in
+        `stalled_pages` back for `stall` seconds. Truncated responses are emulated by cutting the pages whose
+        'start-index' is in `malformed_pages` in half, still answered with 200. The pages of the comments feeds of the
+        articles whose 'start-index' is in `failing_comment_pages` are answered with 500.
+        """
+        self.blog = blog if blog is not None else StubBlog()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.blog = self.blog
+        self._server.latency = latency
+        self._server.requests = 0
+        self._server.not_modified = 0
+        self._server.rate_limit = rate_limit
+        self._server.concurrency_limit = concurrency_limit
+        self._server.retry_after = retry_after
+        self._server.recent = deque()
+        self._server.in_flight = 0
+        self._server.peak_in_flight = 0
+        self._server.throttled = 0
+        self._server.error_rate = error_rate
+        self._server.failing_pages = {str(start_index) for start_index in failing_pages}
+        self._server.random = random.Random(seed)
+        self._server.failed = 0
+        self._server.stalled_pages = {str(start_index) for start_index in stalled_pages}
+        self._server.stall = stall
+        self._server.malformed_pages = {str(start_index) for start_index in malformed_pages}
+        self._server.failing_comment_pages = {str(start_index) for start_index in failing_comment_pages}
+        self._server.counter_lock = threading.Lock()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self.blog.base_url = self.url
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def requests(self):
+        return self._server.requests
+
+    @property
+    def not_modified(self):
+        return self._server.not_modified
+
+    @property
+    def throttled(self):
+        return self._server.throttled
+
+    @property
+    def peak_in_flight(self):
+        return self._server.peak_in_flight
+
+    @property
+    def failed(self):
+        return self._server.failed
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a generated Blogger stub site")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    with StubServer(StubBlog(posts=args.posts), latency=args.latency, port=args.port) as stub:
+        print(f"Serving stub blog at {stub.url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -3,19 +3,40 @@
 """
 
 from blogger_scrapper.scrapper import Scrapper
-from blogger_scrapper.blog import Blogsite, BlogArticle, BlogAuthor, BlogComment
+from blogger_scrapper.batch import BatchScrapper
+from blogger_scrapper.blog import Blogsite, BlogArticle, BlogAuthor, BlogComment, AuthorRegistry
 from blogger_scrapper.mapping import BlogArticleMapping, BlogAuthorMapping, BlogCommentMapping
 from blogger_scrapper.export import SqlExport, FileExport
+from blogger_scrapper.session import HttpSession
+from blogger_scrapper.cache import HttpCache
+from blogger_scrapper.throttle import HostThrottle
+from blogger_scrapper.retry import RetryPolicy, FetchError
+from blogger_scrapper.index import ArticleIndex
+from blogger_scrapper.state import ScrapeState
+from blogger_scrapper.checkpoint import FeedCheckpoint
+from blogger_scrapper.workqueue import WorkQueue, run_worker
 
 __all__ = (
     "Scrapper",
+    "BatchScrapper",
     "Blogsite",
     "BlogAuthor",
     "BlogArticle",
     "BlogComment",
+    "AuthorRegistry",
     "BlogArticleMapping",
     "BlogAuthorMapping",
     "BlogCommentMapping",
     "SqlExport",
-    "FileExport"
+    "FileExport",
+    "HttpSession",
+    "HttpCache",
+    "HostThrottle",
+    "RetryPolicy",
+    "FetchError",
+    "ArticleIndex",
+    "ScrapeState",
+    "FeedCheckpoint",
+    "WorkQueue",
+    "run_worker"
 )
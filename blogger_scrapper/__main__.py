@@ -0,0 +1,84 @@
+"""
+    Command line entry point, scraping one or many Blogger sites at once through a shared pool of workers.
+
+    python -m blogger_scrapper foobar.blogspot.com barfoo.blogspot.com --export json
+    python -m blogger_scrapper --sites-file sites.txt --workers 32 --sites 8 --per-host 4 --rate 50
+"""
+
+import argparse
+import sys
+import warnings
+
+from blogger_scrapper.batch import BatchScrapper
+from blogger_scrapper.blog import COMMENTS_MODES
+from blogger_scrapper.cache import HttpCache
+
+
+def _read_sites(args):
+    """ Hidden (private) function collecting the site URLs of the command line and of the sites file, one URL per line,
+    skipping blank lines and '#' comments.
+
+    :param args: Parsed command line arguments.
+    :type args: argparse.Namespace
+    :return: List of the site URLs.
+    :rtype: list[str]
+    """
+    sites = list(args.sites)
+    if args.sites_file:
+        with open(args.sites_file, "r", encoding="UTF-8") as f:
+            sites.extend(line.strip() for line in f if line.strip() and not line.lstrip().startswith("#"))
+    return sites
+
+
+def _print_progress(progress):
+    statuses = [site_progress['status'] for site_progress in progress.values()]
+    fetched_pages = sum(site_progress['fetched_pages'] for site_progress in progress.values())
+    print(f"{statuses.count('done')}/{len(statuses)} sites done, {statuses.count('failed')} failed, "
+          f"{statuses.count('discovering') + statuses.count('scraping')} in progress - {fetched_pages} pages fetched",
+          file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m blogger_scrapper", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("sites", nargs="*", help="URLs of the Blogger sites to scrape")
+    parser.add_argument("--sites-file", help="File with the URLs of the sites to scrape, one per line")
+    parser.add_argument("--feed", choices=("atom", "rss"), default="atom")
+    parser.add_argument("--export", choices=("json", "xml", "sql", "ndjson"), default="json")
+    parser.add_argument("--comments-mode", choices=COMMENTS_MODES, default="article")
+    parser.add_argument("--workers", type=int, default=32, help="Requests at once, to all sites together")
+    parser.add_argument("--sites", dest="max_sites", type=int, default=8, help="Sites scraped at the same time")
+    parser.add_argument("--per-host", type=int, default=4, help="Requests at once per host")
+    parser.add_argument("--rate", type=float, default=None, help="Requests per second, to all sites together")
+    parser.add_argument("--deadline", type=float, default=None, help="Seconds the scrape of every site may take")
+    parser.add_argument("--cache", default=None, help="Directory of an on-disk HTTP cache")
+    parser.add_argument("--incremental", action="store_true", help="Only collect what changed since the last run")
+    parser.add_argument("--resumable", action="store_true", help="Checkpoint the pages to resume failed scrapes")
+    parser.add_argument("--progress-interval", type=float, default=5.0)
+    parser.add_argument("--quiet", action="store_true", help="Don't print the progress and the warnings")
+    args = parser.parse_args(argv)
+
+    sites = _read_sites(args)
+    if not sites:
+        parser.error("no site URL has been provided")
+    if args.quiet:
+        warnings.simplefilter("ignore")
+
+    batch = BatchScrapper(sites, feed=args.feed, export_type=args.export, comments_mode=args.comments_mode,
+                          max_workers=args.workers, max_sites=args.max_sites, per_host=args.per_host,
+                          global_rate=args.rate,
+                          cache=HttpCache(args.cache) if args.cache else None, deadline=args.deadline,
+                          incremental=args.incremental, resumable=args.resumable)
+    progress = batch.run(on_progress=None if args.quiet else _print_progress,
+                         progress_interval=args.progress_interval)
+    for site, site_progress in progress.items():
+        if site_progress['status'] == "failed":
+            print(f"{site}: failed - {site_progress['error']}")
+        elif site_progress['report'] and not site_progress['report']['completed']:
+            print(f"{site}: cut by the deadline - {site_progress['report']}")
+        else:
+            print(f"{site}: done - {site_progress['fetched_pages']} pages in {site_progress['seconds']} seconds")
+    return 1 if any(site_progress['status'] == "failed" for site_progress in progress.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
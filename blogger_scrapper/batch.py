@@ -0,0 +1,207 @@
+import threading
+import time
+from concurrent import futures
+from concurrent.futures import ThreadPoolExecutor
+
+from blogger_scrapper.blog import COMMENTS_MODES
+from blogger_scrapper.executor import create_executor
+from blogger_scrapper.export import site_export_name
+from blogger_scrapper.scrapper import Scrapper
+from blogger_scrapper.session import HttpSession
+from blogger_scrapper.throttle import HostThrottle
+
+BATCH_STATUSES = ("pending", "discovering", "scraping", "done", "failed")
+
+
+class BatchScrapper:
+
+    def __init__(self, sites, feed="atom", export_type="json", comments_mode="article", max_workers=32, max_sites=8,
+                 per_host=4, global_rate=None, session=None, cache=None, retry_policy=None, deadline=None,
+                 incremental=False, resumable=False):
+        """ Constructor for the BatchScrapper object, scraping many sites at once. The requests of all sites - the
+        discovery of the feeds, the pages of the feeds and the comments - go through a single bounded pool of
+        `max_workers` workers and a single HTTP session, instead of every site having its own; up to `max_sites` sites
+        are scraped at the same time, each one exported to its own file named after its host.
+
+        The session created by the batch paces the requests with a HostThrottle capping every host at `per_host`
+        requests in flight (and adapting to its throttling), with all hosts together capped at `max_workers` requests
+        in flight and `global_rate` requests per second.
+
+        :param sites: URLs of the Blogger sites to scrape.
+        :type sites: Iterable[str]
+        :param feed: Choice of which feed to attempt for the scrapping of every site - atom or rss
+        :type feed: str
+        :param export_type: Format of the exports - 'json', 'xml', 'sql' or 'ndjson'.
+        :type export_type: str
+        :param comments_mode: How the comments are collected - 'article', 'bulk' or 'lazy'; see the Scrapper class.
+        :type comments_mode: str
+        :param max_workers: Number of workers of the shared pool, ie. the maximum number of requests at once.
+        :type max_workers: int
+        :param max_sites: Number of sites scraped at the same time.
+        :type max_sites: int
+        :param per_host: Maximum number of requests in flight per host; also bounds the number of pages every site
+                    keeps queued in the shared pool.
+        :type per_host: int
+        :param global_rate: Optional maximum number of requests per second to all hosts together.
+        :type global_rate: float
+        :param session: Optional HTTP session to be shared by all sites instead of the one created by the batch; its
+                    own throttle applies instead of the `per_host` and `global_rate` limits.
+        :type session: HttpSession
+        :param cache: Optional on-disk HTTP cache for the session created by the batch.
+        :type cache: HttpCache
+        :param retry_policy: Optional policy deciding which failed pages are attempted again and when.
+        :type retry_policy: RetryPolicy
+        :param deadline: Optional number of seconds the scrape of every site is allowed to run for.
+        :type deadline: float
+        :param incremental: Whether the sites are scraped incrementally; see the Scrapper class.
+        :type incremental: bool
+        :param resumable: Whether the scrapes of the sites can be resumed; see the Scrapper class.
+        :type resumable: bool
+        """
+        self.sites = list(dict.fromkeys(sites))
+        if not self.sites:
+            raise ValueError("No site URL has been provided")
+        if comments_mode not in COMMENTS_MODES:
+            raise ValueError(f"Unknown comments_mode provided - '{comments_mode}'; available modes are 'article', "
+                             f"'bulk', 'lazy'")
+        if max_workers < 1 or max_sites < 1 or per_host < 1:
+            raise ValueError(f"Provided 'max_workers', 'max_sites' and 'per_host' parameters must be positive integers")
+        if session is not None and cache is not None:
+            raise ValueError(f"Provided 'cache' parameter can't be used along with a 'session', set the cache on the "
+                             f"session instead")
+
+        self.feed = feed
+        self.export_type = export_type
+        self.comments_mode = comments_mode
+        self.max_workers = max_workers
+        self.max_sites = max_sites
+        self.per_host = per_host
+        self.global_rate = global_rate
+        self.retry_policy = retry_policy
+        self.deadline = deadline
+        self.incremental = incremental
+        self.resumable = resumable
+        self._owns_session = session is None
+        if session is None:
+            throttle = HostThrottle(concurrency=min(4, per_host), max_concurrency=per_host,
+                                    global_rate=global_rate, global_concurrency=max_workers)
+            # A pool per site being scraped, plus some room for the hosts its feeds redirect to
+            session = HttpSession(pool_size=per_host, num_pools=2 * max_sites, cache=cache, throttle=throttle)
+        self.session = session
+        self._lock = threading.Lock()
+        self._progress = {site: {'status': "pending", 'pages': None, 'fetched_pages': 0, 'seconds': None,
+                                 'report': None, 'error': None} for site in self.sites}
+        self._scrappers = {}  # type: dict[str, Scrapper]
+
+    @staticmethod
+    def export_name(site):
+        """ Method to return the name put in front of the export file of the `site` - its host (and port), with the
+        characters that don't belong in a file name replaced.
+
+        :param site: URL of the site.
+        :type site: str
+        :return: Name of the exports of the site.
+        :rtype: str
+        """
+        return site_export_name(site)
+
+    def run(self, on_progress=None, progress_interval=5.0):
+        """ Method to scrape and export all sites, returning once every one of them is done or failed. A site failing
+        doesn't stop the others; its error is kept in its progress.
+
+        :param on_progress: Optional callable called with the progress of all sites (see the 'progress' method) every
+                    `progress_interval` seconds while the batch runs, and once it's done.
+        :type on_progress: Callable[[dict], None]
+        :param progress_interval: Number of seconds between two calls of `on_progress`.
+        :type progress_interval: float
+        :return: The final progress of all sites.
+        :rtype: dict
+        """
+        executor = create_executor("thread", self.max_workers)
+        try:
+            # Threads of the sites only coordinate (and export), every request goes through the shared pool
+            with ThreadPoolExecutor(max_workers=self.max_sites) as sites_pool:
+                pending = {sites_pool.submit(self._scrap_site, site, executor) for site in self.sites}
+                while pending:
+                    _done, pending = futures.wait(pending, timeout=progress_interval if on_progress else None)
+                    if on_progress is not None and pending:
+                        on_progress(self.progress())
+        finally:
+            executor.shutdown(wait=True)
+            if self._owns_session:
+                self.session.close()
+        progress = self.progress()
+        if on_progress is not None:
+            on_progress(progress)
+        return progress
+
+    def _scrap_site(self, site, executor):
+        """ Hidden (private) method to scrape and export a single site, updating its progress along the way.
+
+        :param site: URL of the site.
+        :type site: str
+        :param executor: The shared pool to fetch the site with.
+        :type executor: concurrent.futures.Executor
+        """
+        started = time.monotonic()
+        self._update(site, status="discovering")
+        try:
+            # Discovery of the feeds is a couple of requests, made from the shared pool like all others
+            scrapper = executor.submit(
+                Scrapper, site, feed=self.feed, export_type=self.export_type, session=self.session,
+                max_workers=self.per_host, comments_mode=self.comments_mode, incremental=self.incremental,
+                retry_policy=self.retry_policy, deadline=self.deadline, resumable=self.resumable, executor=executor,
+                export_name=self.export_name(site)
+            ).result()
+            with self._lock:
+                self._scrappers[site] = scrapper
+            self._update(site, status="scraping", pages=len(scrapper.feed.pages))
+            report = scrapper.scrap()
+        except Exception as e:
+            self._update(site, status="failed", error=f"{type(e).__name__}: {e}",
+                         seconds=round(time.monotonic() - started, 3))
+            return
+        finally:
+            with self._lock:
+                scrapper = self._scrappers.pop(site, None)
+            if scrapper is not None:
+                self._update(site, fetched_pages=scrapper.feed.fetched_pages)
+        self._update(site, status="done", report=report, seconds=round(time.monotonic() - started, 3))
+
+    def _update(self, site, **kwargs):
+        with self._lock:
+            self._progress[site].update(kwargs)
+
+    def progress(self):
+        """ Method to return the progress of every site of the batch.
+
+        :return: Dictionary keyed by site URL, with the 'status' of the site (one of 'pending', 'discovering',
+                'scraping', 'done' or 'failed'), the number of 'pages' of its feed and of 'fetched_pages', the number of
+                'seconds' its scrape took, the 'report' of the scrape (see Scrapper.scrap) and the 'error' it failed
+                with.
+        :rtype: dict
+        """
+        with self._lock:
+            progress = {site: dict(site_progress) for site, site_progress in self._progress.items()}
+            for site, scrapper in self._scrappers.items():
+                progress[site]['fetched_pages'] = scrapper.feed.fetched_pages
+        return progress
+
+    def summary(self):
+        """ Method to return the number of sites in every status, along with the number of pages fetched so far.
+
+        :return: Dictionary with the number of sites per status and the total number of 'fetched_pages'.
+        :rtype: dict
+        """
+        progress = self.progress()
+        summary = {status: 0 for status in BATCH_STATUSES}
+        for site_progress in progress.values():
+            summary[site_progress['status']] += 1
+        summary['fetched_pages'] = sum(site_progress['fetched_pages'] for site_progress in progress.values())
+        return summary
+
+    def __str__(self):
+        return f"<BatchScrapper sites={len(self.sites)}, max_workers={self.max_workers}, per_host={self.per_host}>"
+
+    def __repr__(self):
+        return f"BatchScrapper({len(self.sites)} sites, max_workers={self.max_workers})"
@@ -1,20 +1,212 @@
+import heapq
+import threading
 import warnings
-from concurrent.futures.process import ProcessPoolExecutor
+from collections import deque
+from collections.abc import MutableSequence
+from concurrent import futures
+from concurrent.futures import ThreadPoolExecutor
 from ctypes import Union
 from datetime import datetime
-from multiprocessing import Manager
-from time import sleep
+from itertools import islice
+from time import monotonic, sleep
+from urllib.parse import quote
 from bs4.element import Tag
-import urllib3
-from urllib3.exceptions import NewConnectionError
+from urllib3.exceptions import HTTPError
 from bs4 import BeautifulSoup
+from lxml import etree
 import re
 import codecs
 
+from blogger_scrapper import parser
+from blogger_scrapper.executor import BACKENDS, create_executor
+from blogger_scrapper.index import ArticleIndex
+from blogger_scrapper.retry import FetchError, RetryPolicy
+from blogger_scrapper.session import HttpSession
+
+COMMENTS_MODES = ("article", "bulk", "lazy")
+
+
+def _time_left(deadline):
+    """ Hidden (private) function returning the number of seconds left until the `deadline`.
+
+    :param deadline: Optional deadline, as per time.monotonic().
+    :type deadline: float
+    :return: Number of seconds left, never negative; None if there is no deadline.
+    :rtype: float
+    """
+    return None if deadline is None else max(deadline - monotonic(), 0.0)
+
+
+_default_session = None
+_default_session_lock = threading.Lock()
+
+
+def _shared_session():
+    """ Hidden (private) function returning the HTTP session shared by the objects initialized without one, so that
+    they reuse its connections instead of each one opening its own.
+
+    :return: The shared session.
+    :rtype: HttpSession
+    """
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = HttpSession()
+        return _default_session
+
+
+def _plan_feed_pages(url, feed_info, page_type, encoding, session):
+    """ Hidden (private) function generating the FeedPage objects covering all entries of a feed, based on the paging
+    information of its first page.
+
+    :param url: URL of the feed, without any paging parameters.
+    :type url: str
+    :param feed_info: Paging information of the feed, as returned by parser.parse_feed_info.
+    :type feed_info: dict
+    :param page_type: Type of the pages.
+    :type page_type: str
+    :param encoding: Encoding of the site.
+    :type encoding: str
+    :param session: HTTP session of the pages.
+    :type session: HttpSession
+    :return: Dictionary of the FeedPage objects, keyed by their page number.
+    :rtype: dict[int, FeedPage]
+    """
+    _start_index = feed_info['start_index']
+    _total_results = feed_info['total_results']
+    _items_per_page = feed_info['items_per_page']
+    if _start_index is None or _total_results is None or not _items_per_page:
+        raise ValueError(f"Missing paging information for feed at '{url}'")
+
+    pages = {}
+    _separator = "&" if "?" in url else "?"
+    _page_number = 0
+    # Start index of the feed is 1-based
+    while _start_index <= _total_results:
+        _page_number += 1
+        if _start_index + _items_per_page <= _total_results:
+            _expected_articles = _items_per_page
+        else:
+            _expected_articles = _total_results - _start_index + 1
+        _page_url = f"{url}{_separator}start-index={_start_index}&max-results={_items_per_page}"
+        pages[_page_number] = FeedPage(page_number=_page_number, page_type=page_type, url=_page_url,
+                                       encoding=encoding, articles_num=_expected_articles, session=session)
+        _start_index = _start_index + _items_per_page
+    return pages
+
+
+def _fetch_comments_feed_page(session, page, retry_policy, article_backref=None, authors=None):
+    """ Hidden (private) function fetching the comments of a page of a comments feed, either the blog-wide one or the
+    one of a single article.
+
+    :param session: HTTP session to fetch the page with.
+    :type session: HttpSession
+    :param page: The comments feed page to collect.
+    :type page: FeedPage
+    :param retry_policy: Policy telling which HTTP statuses are worth another attempt.
+    :type retry_policy: RetryPolicy
+    :param article_backref: Optional ID of the article the comments feed belongs to.
+    :type article_backref: int
+    :param authors: Optional registry of the authors of the feed.
+    :type authors: AuthorRegistry
+    :return: List of the comments on the page.
+    :rtype: list[BlogComment]
+    :raises FetchError: If the page couldn't be fetched or parsed.
+    """
+    try:
+        content = session.get(page.url)
+    except HTTPError as e:
+        raise FetchError(f"Failed to fetch all comments for comments page number '{page.number}' - {e}")
+    if content.status != 200:
+        raise FetchError(f"Caught {content.status} error while attempting to retrieve comments page number "
+                         f"'{page.number}'", status=content.status, retryable=retry_policy.is_retryable(content.status))
+    try:
+        return list(parser.iter_comments(content.data, article_backref=article_backref, authors=authors))
+    except etree.XMLSyntaxError as e:
+        # A truncated or garbled page goes through the retries like any other failed one
+        raise FetchError(f"Failed to parse comments page number '{page.number}' - {e}")
+
+
+def _collect_article_comments(session, article_id, comments_link, page_size=500, max_comments=None, workers=4,
+                              authors=None, retry_policy=None, encoding="UTF-8"):
+    """ Hidden (private) function collecting the comments of an article from its comments feed. If the comments don't
+    fit on the first page of the feed, the remaining pages are fetched concurrently, up to the `max_comments` cap. Every
+    page is collected on its own: a page that fails is left out with a warning, the others are kept.
+
+    :param session: HTTP session to fetch the pages with.
+    :type session: HttpSession
+    :param article_id: ID of the article.
+    :type article_id: int
+    :param comments_link: Link to the comments feed of the article.
+    :type comments_link: str
+    :param page_size: Number of comments requested per page; the site may return fewer.
+    :type page_size: int
+    :param max_comments: Optional maximum number of comments to collect.
+    :type max_comments: int
+    :param workers: Maximum number of pages fetched at the same time.
+    :type workers: int
+    :param authors: Optional registry of the authors of the feed.
+    :type authors: AuthorRegistry
+    :param retry_policy: Optional policy telling which HTTP statuses are worth another attempt.
+    :type retry_policy: RetryPolicy
+    :param encoding: Encoding of the site.
+    :type encoding: str
+    :return: List of the comments of the article.
+    :rtype: list[BlogComment]
+    """
+    retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+    _page_size = page_size if max_comments is None else min(page_size, max_comments)
+    _separator = "&" if "?" in comments_link else "?"
+    try:
+        content = session.get(f"{comments_link}{_separator}max-results={_page_size}")
+    except HTTPError:
+        warnings.warn(f"Failed to fetch the comments for article '{article_id}'")
+        return []
+    if content.status != 200:
+        warnings.warn(f"Caught {content.status} error while attempting to retrieve the comments for article "
+                      f"'{article_id}'")
+        return []
+    try:
+        comments = list(parser.iter_comments(content.data, article_backref=article_id, authors=authors))
+    except etree.XMLSyntaxError:
+        warnings.warn(f"Failed to parse the comments for article '{article_id}'")
+        return []
+
+    try:
+        comment_pages = list(_plan_feed_pages(comments_link, parser.parse_feed_info(content.data), "comments",
+                                              encoding, session).values())[1:]
+    except (ValueError, etree.XMLSyntaxError):
+        comment_pages = []
+    if max_comments is not None:
+        # Skip the pages that would only hold comments above the cap
+        _remaining = max_comments - len(comments)
+        _needed_pages = []
+        for page in comment_pages:
+            if _remaining <= 0:
+                break
+            _needed_pages.append(page)
+            _remaining -= page.expected_number_of_articles
+        comment_pages = _needed_pages
+    if comment_pages:
+        with ThreadPoolExecutor(max_workers=min(workers, len(comment_pages))) as executor:
+            page_futures = [executor.submit(_fetch_comments_feed_page, session, page, retry_policy, article_id,
+                                            authors) for page in comment_pages]
+        failed_pages = []
+        for page, future in zip(comment_pages, page_futures):
+            try:
+                comments.extend(future.result())
+            except FetchError:
+                failed_pages.append(page.number)
+        if failed_pages:
+            warnings.warn(f"Couldn't collect the comments pages {failed_pages} of article '{article_id}', "
+                          f"{len(comments)} comments collected")
+    return comments[:max_comments] if max_comments is not None else comments
+
 
 class Blogsite:
 
-    def __init__(self, site, feed="atom"):
+    def __init__(self, site, feed="atom", session=None, backend="thread", max_workers=10, updated_min=None,
+                 retry_policy=None, executor=None):
         """ Constructor for the Blogsite object to be used as a high-level interface for working with the site's
         content. This constructor initializes the Feed class which provides access to the blog articles.
 
@@ -22,6 +214,19 @@ class Blogsite:
         :type site: str
         :param feed: Type of the feed, defaulting to 'atom'.
         :type feed: str
+        :param session: Optional HTTP session to be used for all requests to the site; it's passed down to the Feed
+                    object. If none is provided, a new one is created.
+        :type session: HttpSession
+        :param backend: Execution backend used by the Feed object to fetch the pages - 'thread' or 'process'.
+        :type backend: str
+        :param max_workers: Number of pages fetched at the same time by the Feed object.
+        :type max_workers: int
+        :param updated_min: Optional date; if provided, the Feed object only covers the articles updated since then.
+        :type updated_min: Union[datetime, str]
+        :param retry_policy: Optional policy for the Feed object to attempt the failed pages again with.
+        :type retry_policy: RetryPolicy
+        :param executor: Optional executor shared with other sites, for the Feed object to fetch its pages with.
+        :type executor: concurrent.futures.Executor
         """
         self.canonical_url = None
         self._encoding = None
@@ -31,10 +236,10 @@ class Blogsite:
         if not isinstance(site, str):
             raise ValueError(f"Provided site argument '{site}' is not a string")
 
-        _http = urllib3.PoolManager()
+        self.session = session if session is not None else HttpSession()
         try:
-            _conn = _http.request("GET", site)
-        except NewConnectionError:
+            _conn = self.session.get(site)
+        except HTTPError:
             raise ConnectionError(f"Failed to connect to Blogger site at '{site}'")
 
         if _conn.status != 200:
@@ -105,15 +310,14 @@ class Blogsite:
             raise AttributeError(f"Unable to find neither an Atom feed, nor an RSS feed for '{site}'")
         elif feed == "atom" and self.atom_link is None:
             warnings.warn(f"Couldn't find the preferred feed 'Atom', falling back to 'RSS'")
-            self.blog_feed = Feed(self.rss_link, "rss", site_encoding=self._encoding)
+            feed = "rss"
         elif feed == "rss" and self.rss_link is None:
             warnings.warn(f"Couldn't find the preferred feed 'RSS', falling back to 'Atom'")
-            self.blog_feed = Feed(self.atom_link, "atom", site_encoding=self._encoding)
-        else:
-            if feed == "atom":
-                self.blog_feed = Feed(self.atom_link, "atom", site_encoding=self._encoding)
-            else:
-                self.blog_feed = Feed(self.rss_link, "rss", site_encoding=self._encoding)
+            feed = "atom"
+        _feed_link = self.atom_link if feed == "atom" else self.rss_link
+        self.blog_feed = Feed(_feed_link, feed, site_encoding=self._encoding, session=self.session, backend=backend,
+                              max_workers=max_workers, updated_min=updated_min, retry_policy=retry_policy,
+                              executor=executor)
 
     def __str__(self):
         return f"<Blogsite url='{self.canonical_url}'>"
@@ -124,7 +328,9 @@ class Blogsite:
 
 class Feed:
 
-    def __init__(self, url, feed_type, site_encoding="UTF-8"):
+    def __init__(self, url, feed_type, site_encoding="UTF-8", session=None, backend="thread", max_workers=10,
+                 comments_page_size=500, max_comments_per_article=None, comment_workers=4, updated_min=None,
+                 retry_policy=None, executor=None):
         """ Constructor for the Feed object used to work with the Blogger site.
 
         :param url: URL to the feed.
@@ -133,149 +339,822 @@ class Feed:
         :type feed_type: str
         :param site_encoding: Optional encoding type to use when scrapping the articles and comments.
         :type site_encoding: str
+        :param session: Optional HTTP session to be used for all requests, shared with the FeedPage and
+                    BlogAtomArticle objects created by the feed. If none is provided, a new one is created.
+        :type session: HttpSession
+        :param backend: Default execution backend used by the 'fetch_all' method - 'thread' or 'process'.
+        :type backend: str
+        :param max_workers: Default number of pages fetched at the same time by the 'fetch_all' method.
+        :type max_workers: int
+        :param comments_page_size: Number of comments requested per page of an article's comments feed; the site may
+                    return fewer.
+        :type comments_page_size: int
+        :param max_comments_per_article: Optional cap on the number of comments collected per article; if none is
+                    provided, all comments are collected.
+        :type max_comments_per_article: int
+        :param comment_workers: Number of pages of a single article's comments feed fetched at the same time, when the
+                    comments don't fit on one page.
+        :type comment_workers: int
+        :param updated_min: Optional date; if provided, the pages of the feed (and the blog-wide comments feed) only
+                    cover the entries created or updated since then, via the 'updated-min' parameter of the feed.
+        :type updated_min: Union[datetime, str]
+        :param retry_policy: Optional policy deciding which failed pages are attempted again and when; if none is
+                    provided, the failed pages are attempted up to 3 times with an exponential backoff.
+        :type retry_policy: RetryPolicy
+        :param executor: Optional executor shared with other feeds, used by all methods fetching pages instead of
+                    creating their own - their `backend` and `max_workers` then only bound the number of pages the feed
+                    keeps in flight. The feed never shuts it down.
+        :type executor: concurrent.futures.Executor
         """
         if feed_type.lower() != "rss" and feed_type.lower() != "atom":
             raise ValueError(f"Provided '{feed_type}' is neither an Atom feed, nor an RSS feed")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend provided - '{backend}'; available backends are 'thread', 'process'")
 
         self.url = url
         self.feed_type = feed_type
         self.site_encoding = site_encoding
+        self.session = session if session is not None else HttpSession()
+        self.backend = backend
+        self.max_workers = max_workers
+        self.comments_page_size = comments_page_size
+        self.max_comments_per_article = max_comments_per_article
+        self.comment_workers = comment_workers
+        self.updated_min = updated_min
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.executor = executor
         self.total_results = 0
         self.pages = {}
-        self._lock = Manager().Lock()
+        # Blog-wide comments feed, only available for Atom feeds
+        self.comments_url = self.url.replace("/feeds/posts/", "/feeds/comments/", 1) if feed_type == "atom" else None
+        self._lock = threading.Lock()
         self._all_fetched_articles = []
-        _http = urllib3.PoolManager()
+        self._comment_fetches = {'performed': 0, 'skipped': 0}
+        # Canonical author objects of everything parsed from the feed
+        self.authors = AuthorRegistry()
+        # Index of the articles returned by the last 'fetch_all' call
+        self.index = ArticleIndex()
+        # Comments of the blog-wide comments feed whose article wasn't among the fetched articles
+        self.orphan_comments = []
+        # Pages of the last 'fetch_all' call that failed all their attempts, or weren't fetched before its deadline
+        self.failed_pages = []  # type: list[FeedPage]
+        self.cut_pages = []  # type: list[FeedPage]
+        # Pages of the blog-wide comments feed and articles whose comments weren't fetched before the deadline
+        self.cut_comment_pages = []  # type: list[FeedPage]
+        self.cut_comments = []  # type: list[BlogAtomArticle]
+        # Number of pages received by the last 'fetch_all' (or 'iter_articles') call, to follow its progress
+        self.fetched_pages = 0
+        _feed_url = self._query_url(self.url)
         try:
-            _conn = _http.request("GET", self.url)
-        except NewConnectionError:
+            _conn = self.session.get(_feed_url)
+        except HTTPError:
             raise ConnectionError(f"Failed to load '{self.feed_type}' at '{self.url}'")
 
-        _feed_data = BeautifulSoup(_conn.data.decode(self.site_encoding), features="lxml")
         try:
-            _start_index = int(_feed_data.find('opensearch:startindex').text)
-            self.total_results = int(_feed_data.find('opensearch:totalresults').text)
-            _items_per_page = int(_feed_data.find('opensearch:itemsperpage').text)
-            _page_number = 0
-            while _start_index + _items_per_page < self.total_results + _items_per_page:
-                _page_number += 1
-                if _start_index + _items_per_page < self.total_results:
-                    _expected_articles = _items_per_page
-                else:
-                    _expected_articles = self.total_results - _start_index
-                if self.feed_type == "rss":
-                    _page_url = f"{self.url}&start-index={_start_index}&max-results={_items_per_page}"
-                    page = FeedPage(page_number=_page_number, page_type=self.feed_type,
-                                    url=_page_url, encoding=self.site_encoding,
-                                    articles_num=_expected_articles)
-                    self.pages[_page_number] = page
-                elif self.feed_type == "atom":
-                    _page_url = f"{self.url}?start-index={_start_index}&max-results={_items_per_page}"
-                    page = FeedPage(page_number=_page_number, page_type=self.feed_type,
-                                    url=_page_url, encoding=self.site_encoding,
-                                    articles_num=_expected_articles)
-                    self.pages[_page_number] = page
-                _start_index = _start_index + _items_per_page
-        except ValueError:
+            _feed_info = parser.parse_feed_info(_conn.data)
+            self.total_results = _feed_info['total_results']
+            self.pages = self._plan_pages(_feed_url, _feed_info, self.feed_type)
+        except (ValueError, etree.XMLSyntaxError):
+            self.total_results = self.total_results or 0
             warnings.warn(f"Failed to obtain Feed information for feed at '{self.url}'")
 
-    def fetch_first(self, page_number=1):
+    def _query_url(self, url):
+        """ Hidden (private) method adding the 'updated-min' restriction of the feed, if any, to the provided `url`.
+
+        :param url: URL of the feed.
+        :type url: str
+        :return: URL of the feed, restricted to the entries updated since `self.updated_min`.
+        :rtype: str
+        """
+        if self.updated_min is None:
+            return url
+        if isinstance(self.updated_min, datetime):
+            _updated_min = self.updated_min.isoformat()
+        else:
+            _updated_min = self.updated_min
+        _separator = "&" if "?" in url else "?"
+        return f"{url}{_separator}updated-min={quote(_updated_min)}&orderby=updated"
+
+    def _plan_pages(self, url, feed_info, page_type):
+        """ Hidden (private) method used to generate the FeedPage objects covering all entries of a feed, based on the
+        paging information of its first page.
+
+        :param url: URL of the feed, without any paging parameters.
+        :type url: str
+        :param feed_info: Paging information of the feed, as returned by parser.parse_feed_info.
+        :type feed_info: dict
+        :param page_type: Type of the pages.
+        :type page_type: str
+        :return: Dictionary of the FeedPage objects, keyed by their page number.
+        :rtype: dict[int, FeedPage]
+        """
+        return _plan_feed_pages(url, feed_info, page_type, self.site_encoding, self.session)
+
+    def fetch_first(self, page_number=1, comments_mode="article"):
         """ Method fetches the first article for the provided `page_number` parameter.
 
         :param page_number: Optional page number to retrieve the first article from.
         :type page_number: int
+        :param comments_mode: Whether the comments of the article are fetched right away ('article' or 'bulk') or left
+                    to be loaded on first access ('lazy'). Atom feeds only.
+        :type comments_mode: str
         :return: BlogArticle object, either BlogRSSArticle or BlogAtomArticle
         :rtype: Union[BlogRSSArticle, BlogAtomArticle]
         """
+        if comments_mode not in COMMENTS_MODES:
+            raise ValueError(f"Unknown comments_mode provided - '{comments_mode}'; available modes are 'article', "
+                             f"'bulk', 'lazy'")
+
         page = self.pages.get(page_number)
         if page:
-            http = urllib3.PoolManager()
             try:
-                content = http.request("GET", page.url)
-            except NewConnectionError:
-                raise RuntimeError(f"Failed to fetch all articles for page number '{page_number}'")
-            soup = BeautifulSoup(content.data.decode(self.site_encoding), features="lxml")
-            if self.feed_type == "rss":
-                first_article = soup.find("item")
-                blog_article = BlogRSSArticle(article_tag=first_article)
-            else:
-                first_article = soup.find("entry")
-                blog_article = BlogAtomArticle(article_tag=first_article, encoding=self.site_encoding)
+                content = self.session.get(page.url)
+            except HTTPError as e:
+                raise FetchError(f"Failed to fetch all articles for page number '{page_number}' - {e}")
+            try:
+                blog_article = next(parser.iter_articles(content.data, self.feed_type, self.authors), None)
+            except etree.XMLSyntaxError as e:
+                raise FetchError(f"Failed to parse the articles of page number '{page_number}' - {e}")
+            if blog_article is not None and self.feed_type == "atom":
+                if comments_mode == "lazy":
+                    blog_article.comments = LazyComments(self, blog_article)
+                else:
+                    blog_article.comments = self._fetch_comments(blog_article)
             return blog_article
         else:
             warnings.warn(f"Couldn't find page number '{page_number}' in the feed pages")
             return None
 
-    def fetch_all(self, page_number=None):
+    def fetch_all(self, page_number=None, backend=None, max_workers=None, comments_mode="article",
+                  allow_partial=False, deadline=None, checkpoint=None):
         """ Method fetches all articles from all FeedPage objects saved in the self.pages attribute. If the optional
         parameter `page_number` has been provided, the method will instead fetch all articles only for that specified
-        page.
+        page. The returned articles are indexed in the `index` attribute of the feed as their pages arrive.
+
+        Pages failing to be fetched are attempted again as per the retry policy of the feed, put back in the queue
+        instead of holding a worker while they wait. Pages failing all their attempts are kept in the `failed_pages`
+        attribute, to be fetched again later on via the 'retry_failed_pages' method.
+
+        Once the optional `deadline` passes, the pages in flight are abandoned and the articles of the completed pages
+        are returned; the pages left out are kept in the `cut_pages` attribute (and the pages of the blog-wide comments
+        feed in the 'bulk' comments mode in the `cut_comment_pages` attribute), without raising.
+
+        With a `checkpoint`, every page is saved to it as soon as it has been fetched, and the pages already in it are
+        read back instead of being fetched again - a call that died halfway is resumed by simply calling the method
+        again. The checkpoint of the feed is cleared once all pages have been fetched.
 
         :param page_number: Optional page number to retrieve the first article from.
         :type page_number: int
+        :param backend: Optional execution backend to fetch the pages with - 'thread' or 'process';
+                    defaults to the backend the feed has been initialized with.
+        :type backend: str
+        :param max_workers: Optional number of pages to fetch at the same time; defaults to the number the feed has
+                    been initialized with.
+        :type max_workers: int
+        :param comments_mode: How the comments of the articles are collected (Atom feeds only):
+                    'article' - the comments feed of every article is fetched along with the article;
+                    'bulk' - the blog-wide comments feed is paged through concurrently once all articles are fetched
+                    and each comment is attached to its article, which takes far fewer requests for large blogs;
+                    'lazy' - comments are not fetched, every article gets a LazyComments handle that loads them on
+                    first access instead, or in batch via the 'load_comments' method.
+        :type comments_mode: str
+        :param allow_partial: Whether to return the articles of the pages fetched successfully when some pages failed,
+                    instead of raising a RuntimeError.
+        :type allow_partial: bool
+        :param deadline: Optional time by which to return, as per time.monotonic().
+        :type deadline: float
+        :param checkpoint: Optional store of the completed pages, to resume the fetching from; only available when
+                    fetching all pages.
+        :type checkpoint: FeedCheckpoint
         :return: List of BlogArticle objects, either BlogRSSArticle or BlogAtomArticle
         :rtype: list[BlogRSSArticle or BlogAtomArticle]
         """
-        all_articles = []
+        if comments_mode not in COMMENTS_MODES:
+            raise ValueError(f"Unknown comments_mode provided - '{comments_mode}'; available modes are 'article', "
+                             f"'bulk', 'lazy'")
+        if page_number is not None and checkpoint is not None:
+            raise ValueError(f"Provided 'checkpoint' parameter can only be used when fetching all pages")
+
         if page_number is None:
-            with ProcessPoolExecutor(max_workers=10) as executor:
-                for page, articles in zip(self.pages.values(), executor.map(self._fetch_articles, self.pages.values())):
-                    if len(articles) != page.expected_number_of_articles:
-                        warnings.warn(f"Couldn't successfully obtain the expected number of articles for page number "
-                                      f"{page.number}")
-                    self._save_articles(articles)
+            pages = list(self.pages.values())
         else:
             page = self.pages.get(page_number)
             if page is None:
                 warnings.warn(f"Couldn't find page number '{page_number}' in the feed pages")
                 return None
-            returned_articles = self._fetch_articles(page)
-            if len(returned_articles) != page.expected_number_of_articles:
-                warnings.warn(f"Couldn't successfully obtain the expected number of articles for page number "
-                              f"{page.number}")
-            self._save_articles(self._fetch_articles(page))
+            pages = [page]
+        self.index = ArticleIndex()
+        self.failed_pages = []
+        self.cut_pages = []
+        self.cut_comment_pages = []
+        self.fetched_pages = 0
+        return self._collect_pages(pages, backend, max_workers, comments_mode, allow_partial, deadline, checkpoint)
+
+    def retry_failed_pages(self, backend=None, max_workers=None, comments_mode="article", allow_partial=False,
+                           deadline=None, checkpoint=None):
+        """ Method to fetch again the pages that failed all their attempts in the last 'fetch_all' (or
+        'iter_articles') call, kept in the `failed_pages` attribute, along with the pages cut by its deadline, kept in
+        the `cut_pages` attribute. The articles are added to the index of the feed,
+        along with the ones fetched before; in the 'bulk' comments mode, they get their comments from the comments
+        collected back then, without fetching the blog-wide comments feed again.
+
+        :param backend: Optional execution backend to fetch the pages with; see 'fetch_all'.
+        :type backend: str
+        :param max_workers: Optional number of pages to fetch at the same time; see 'fetch_all'.
+        :type max_workers: int
+        :param comments_mode: How the comments of the articles are collected; see 'fetch_all'.
+        :type comments_mode: str
+        :param allow_partial: Whether to return the articles of the pages fetched successfully when some pages failed
+                    again, instead of raising a RuntimeError.
+        :type allow_partial: bool
+        :param deadline: Optional time by which to return, as per time.monotonic(); see 'fetch_all'.
+        :type deadline: float
+        :param checkpoint: Optional store of the completed pages; see 'fetch_all'.
+        :type checkpoint: FeedCheckpoint
+        :return: List of the articles of the pages that were fetched successfully.
+        :rtype: list[BlogRSSArticle or BlogAtomArticle]
+        """
+        if comments_mode not in COMMENTS_MODES:
+            raise ValueError(f"Unknown comments_mode provided - '{comments_mode}'; available modes are 'article', "
+                             f"'bulk', 'lazy'")
+
+        pages = sorted(self.failed_pages + self.cut_pages, key=lambda page: page.number)
+        self.failed_pages = []
+        self.cut_pages = []
+        return self._collect_pages(pages, backend, max_workers, comments_mode, allow_partial, deadline, checkpoint,
+                                   retrying=True)
+
+    def _collect_pages(self, pages, backend, max_workers, comments_mode, allow_partial, deadline=None,
+                       checkpoint=None, retrying=False):
+        """ Hidden (private) method fetching the articles of the provided `pages`, for the 'fetch_all' and
+        'retry_failed_pages' methods.
+
+        :param pages: The pages to fetch.
+        :type pages: list[FeedPage]
+        :param backend: Optional execution backend to fetch the pages with.
+        :type backend: str
+        :param max_workers: Optional number of pages to fetch at the same time.
+        :type max_workers: int
+        :param comments_mode: How the comments of the articles are collected.
+        :type comments_mode: str
+        :param allow_partial: Whether to return the articles fetched successfully when some pages failed.
+        :type allow_partial: bool
+        :param deadline: Optional time by which to return, as per time.monotonic().
+        :type deadline: float
+        :param checkpoint: Optional store of the completed pages.
+        :type checkpoint: FeedCheckpoint
+        :param retrying: Whether the pages are fetched again after failing, in which case the comments of the 'bulk'
+                    mode are taken from the comments that couldn't be attached the first time.
+        :type retrying: bool
+        :return: List of the fetched articles.
+        :rtype: list[BlogRSSArticle or BlogAtomArticle]
+        """
+        backend = backend if backend is not None else self.backend
+        max_workers = max_workers if max_workers is not None else self.max_workers
+        resumed_pages = deque()
+        if checkpoint is not None:
+            _feed_key = self._query_url(self.url)
+            _completed = checkpoint.begin(_feed_key, comments_mode, self.total_results, len(self.pages))
+            resumed_pages.extend(page for page in pages if page.number in _completed)
+            pages = [page for page in pages if page.number not in _completed]
+        for page, articles in self._iter_pages(backend, max_workers, comments_mode, ordered=True, pages=pages,
+                                               deadline=deadline):
+            # Pages read back from the checkpoint are put back in their place among the fetched ones
+            while resumed_pages and resumed_pages[0].number < page.number:
+                self._save_articles(self._resumed_page(checkpoint, _feed_key, resumed_pages.popleft()))
+            if checkpoint is not None:
+                checkpoint.save_page(_feed_key, page, articles)
+            self._save_articles(articles)
+        while resumed_pages:
+            self._save_articles(self._resumed_page(checkpoint, _feed_key, resumed_pages.popleft()))
         all_articles = self._all_fetched_articles.copy()
         self._all_fetched_articles = []
+        if comments_mode == "bulk" and self.feed_type == "atom":
+            if retrying:
+                comments = self.orphan_comments
+            else:
+                comments = self.fetch_all_comments(backend=backend, max_workers=max_workers, deadline=deadline)
+            self.orphan_comments = self._attach_comments(all_articles, comments)
+            for article in all_articles:
+                self._index_comments(article.comments)
+        if checkpoint is not None and not self.failed_pages and not self.cut_pages:
+            checkpoint.clear(_feed_key)
+        if self.failed_pages and not allow_partial:
+            raise RuntimeError(f"Failed to fetch all articles for page numbers "
+                               f"{', '.join(str(page.number) for page in self.failed_pages)}")
         return all_articles
 
-    def _fetch_articles(self, page):
+    def _resumed_page(self, checkpoint, feed_key, page):
+        """ Hidden (private) method to read the articles of a completed page back from the `checkpoint`.
+
+        :param checkpoint: The store of the completed pages.
+        :type checkpoint: FeedCheckpoint
+        :param feed_key: URL of the feed the pages are saved under.
+        :type feed_key: str
+        :param page: The completed page.
+        :type page: FeedPage
+        :return: List of the articles of the page.
+        :rtype: list[Union[BlogRSSArticle, BlogAtomArticle]]
+        """
+        return self._received_page(page, checkpoint.load_page(feed_key, page.number))
+
+    def iter_articles(self, backend=None, max_workers=None, comments_mode="article", max_in_flight=None,
+                      ordered=False, allow_partial=False, deadline=None):
+        """ Generator yielding the articles of all FeedPage objects saved in the self.pages attribute as soon as their
+        page is fetched, instead of collecting all of them first like the 'fetch_all' method. At most `max_in_flight`
+        pages are being fetched (or waiting to be consumed) at any time, so memory stays bounded by the number of
+        pages in flight rather than the size of the blog. Closing the generator early cancels the pages not yet
+        started. Failed pages and the `deadline` are handled like in the 'fetch_all' method.
+
+        :param backend: Optional execution backend to fetch the pages with - 'thread' or 'process';
+                    defaults to the backend the feed has been initialized with.
+        :type backend: str
+        :param max_workers: Optional number of pages to fetch at the same time; defaults to the number the feed has
+                    been initialized with.
+        :type max_workers: int
+        :param comments_mode: How the comments of the articles are collected - 'article' or 'lazy', see 'fetch_all';
+                    'bulk' is not available, as the blog-wide comments feed can only be attached once all articles
+                    are fetched.
+        :type comments_mode: str
+        :param max_in_flight: Optional maximum number of pages submitted but not yet consumed; defaults to twice the
+                    number of workers.
+        :type max_in_flight: int
+        :param ordered: Whether the pages are yielded in the order of the feed (newest articles first) instead of the
+                    order they complete in.
+        :type ordered: bool
+        :param allow_partial: Whether to simply end once all pages are done when some of them failed, instead of
+                    raising a RuntimeError.
+        :type allow_partial: bool
+        :param deadline: Optional time after which no more articles are yielded, as per time.monotonic().
+        :type deadline: float
+        :return: Generator of BlogArticle objects, either BlogRSSArticle or BlogAtomArticle
+        :rtype: Iterator[Union[BlogRSSArticle, BlogAtomArticle]]
+        """
+        if comments_mode not in ("article", "lazy"):
+            raise ValueError(f"Unknown comments_mode provided - '{comments_mode}'; available modes for streaming are "
+                             f"'article', 'lazy'")
+
+        backend = backend if backend is not None else self.backend
+        max_workers = max_workers if max_workers is not None else self.max_workers
+        self.failed_pages = []
+        self.cut_pages = []
+        self.fetched_pages = 0
+        for _page, articles in self._iter_pages(backend, max_workers, comments_mode, max_in_flight, ordered,
+                                                deadline=deadline):
+            yield from articles
+        if self.failed_pages and not allow_partial:
+            raise RuntimeError(f"Failed to fetch all articles for page numbers "
+                               f"{', '.join(str(page.number) for page in self.failed_pages)}")
+
+    def _iter_pages(self, backend, max_workers, comments_mode, max_in_flight=None, ordered=True, pages=None,
+                    deadline=None):
+        """ Hidden (private) generator fetching all FeedPage objects saved in the self.pages attribute through an
+        executor, keeping at most `max_in_flight` pages submitted at a time, and yielding each page along with its
+        articles. A failed page is put back in the queue until the retry policy of the feed allows its next attempt;
+        the ones failing all their attempts are added to `self.failed_pages` and not yielded. Once the `deadline`
+        passes, the pages not completed yet are added to `self.cut_pages` and the executor is shut down without waiting
+        for the ones in flight.
+
+        :param backend: Execution backend to fetch the pages with.
+        :type backend: str
+        :param max_workers: Number of pages to fetch at the same time.
+        :type max_workers: int
+        :param comments_mode: How the comments of the articles are collected.
+        :type comments_mode: str
+        :param max_in_flight: Optional maximum number of pages submitted but not yet yielded; defaults to twice the
+                    number of workers.
+        :type max_in_flight: int
+        :param ordered: Whether the pages are yielded in the order of the feed instead of the order they complete in.
+        :type ordered: bool
+        :param pages: Optional pages to fetch instead of all pages of the feed.
+        :type pages: list[FeedPage]
+        :param deadline: Optional time after which no more pages are waited for, as per time.monotonic().
+        :type deadline: float
+        :return: Generator of tuples of the page and the list of its articles.
+        :rtype: Iterator[tuple[FeedPage, list[Union[BlogRSSArticle, BlogAtomArticle]]]]
+        """
+        max_in_flight = max_in_flight if max_in_flight is not None else 2 * max_workers
+        if not isinstance(max_in_flight, int) or max_in_flight < 1:
+            raise ValueError(f"Provided 'max_in_flight' parameter must be a positive integer")
+
+        pending_pages = iter(self.pages.values() if pages is None else pages)
+        in_flight = {}  # type: dict[futures.Future, tuple[FeedPage, int]]
+        # Heap of the failed pages waiting for their next attempt, by the time it's due
+        retries = []  # type: list[tuple[float, int, FeedPage, int]]
+        # Pages not yielded yet in the order of the feed, and the results waiting for the pages before them (ordered)
+        order = deque()  # type: deque[FeedPage]
+        results = {}  # type: dict[int, list[Union[BlogRSSArticle, BlogAtomArticle]]]
+        cut = False
+        executor = self._open_executor(backend, max_workers)
+        try:
+            while True:
+                now = monotonic()
+                if deadline is not None and now >= deadline:
+                    cut = True
+                    break
+                while retries and retries[0][0] <= now:
+                    _due, _number, page, attempt = heapq.heappop(retries)
+                    in_flight[executor.submit(self._fetch_articles, page, comments_mode)] = (page, attempt)
+                for page in islice(pending_pages, max(max_in_flight - len(in_flight) - len(retries) - len(results), 0)):
+                    if ordered:
+                        order.append(page)
+                    in_flight[executor.submit(self._fetch_articles, page, comments_mode)] = (page, 1)
+                if not in_flight and not retries:
+                    break
+
+                _timeout = max(retries[0][0] - now, 0) if retries else None
+                if deadline is not None:
+                    _timeout = min(_timeout, deadline - now) if _timeout is not None else deadline - now
+                if in_flight:
+                    done, _not_done = futures.wait(in_flight, timeout=_timeout, return_when=futures.FIRST_COMPLETED)
+                else:
+                    # Only pages waiting for their next attempt, no worker is held meanwhile
+                    sleep(_timeout)
+                    done = ()
+                for future in done:
+                    page, attempt = in_flight.pop(future)
+                    try:
+                        articles = self._received_page(page, future.result())
+                    except FetchError as e:
+                        if self.retry_policy.should_retry(e, attempt):
+                            _delay = self.retry_policy.delay(attempt)
+                            warnings.warn(f"{e}, retrying in {_delay:.1f} seconds - Attempt "
+                                          f"{attempt}/{self.retry_policy.max_attempts}")
+                            heapq.heappush(retries, (monotonic() + _delay, page.number, page, attempt + 1))
+                            continue
+                        warnings.warn(f"{e}, giving up on the page after {attempt} attempts")
+                        self.failed_pages.append(page)
+                        articles = None
+                    if ordered:
+                        results[page.number] = articles
+                    elif articles is not None:
+                        yield page, articles
+                while order and order[0].number in results:
+                    page = order.popleft()
+                    articles = results.pop(page.number)
+                    if articles is not None:
+                        yield page, articles
+            if cut:
+                self.cut_pages = sorted([page for page, _attempt in in_flight.values()] +
+                                        [retry[2] for retry in retries] + list(pending_pages),
+                                        key=lambda page: page.number)
+                warnings.warn(f"Deadline passed with {len(self.cut_pages)} pages left to fetch")
+                # Completed pages held back by the cut pages before them are still returned
+                for page in order:
+                    articles = results.pop(page.number, None)
+                    if articles is not None:
+                        yield page, articles
+        finally:
+            # Abandoned pages are not waited for; their requests finish in the background, bounded by the timeouts
+            # of the session
+            self._close_executor(executor, in_flight, wait=not cut)
+
+    def _open_executor(self, backend, max_workers):
+        """ Hidden (private) method returning the executor to fetch pages with - the shared executor of the feed, if it
+        has one, or a new one otherwise.
+
+        :param backend: Execution backend of a new executor.
+        :type backend: str
+        :param max_workers: Number of workers of a new executor.
+        :type max_workers: int
+        :return: The executor.
+        :rtype: concurrent.futures.Executor
+        """
+        return self.executor if self.executor is not None else create_executor(backend, max_workers)
+
+    def _close_executor(self, executor, pending, wait=True):
+        """ Hidden (private) method to release the `executor` returned by the '_open_executor' method, cancelling the
+        `pending` futures not started yet. An executor of its own is shut down, while the shared one of the feed is left
+        running for the other feeds.
+
+        :param executor: The executor to release.
+        :type executor: concurrent.futures.Executor
+        :param pending: Futures submitted by the feed that may not be done yet.
+        :type pending: Iterable[concurrent.futures.Future]
+        :param wait: Whether to wait for the futures that already started.
+        :type wait: bool
+        """
+        if executor is not self.executor:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            return
+        pending = list(pending)
+        for future in pending:
+            future.cancel()
+        if wait:
+            futures.wait(pending)
+
+    def _received_page(self, page, articles_list):
+        """ Hidden (private) method checking the articles fetched for the `page`, binding their lazily loaded comments
+        back to this feed and swapping their authors for the canonical ones of the feed's registry.
+
+        :param page: The page the articles have been fetched for.
+        :type page: FeedPage
+        :param articles_list: The fetched articles.
+        :type articles_list: list[BlogRSSArticle, BlogAtomArticle]
+        :return: The same list of articles.
+        :rtype: list[BlogRSSArticle, BlogAtomArticle]
+        """
+        if len(articles_list) != page.expected_number_of_articles:
+            warnings.warn(f"Couldn't successfully obtain the expected number of articles for page number "
+                          f"{page.number}")
+        self.fetched_pages += 1
+        for article in articles_list:
+            # Articles coming back from the workers of the 'process' backend carry copies of the authors
+            article.author = self.authors.intern(article.author)
+            if isinstance(article.comments, LazyComments):
+                # Handles coming back from the workers of the 'process' backend lose their feed
+                article.comments.bind(self)
+            else:
+                self._intern_authors(article.comments)
+        return articles_list
+
+    def _intern_authors(self, comments_list):
+        """ Hidden (private) method swapping the authors of the comments in the `comments_list` for the canonical ones
+        of the feed's registry.
+
+        :param comments_list: The comments.
+        :type comments_list: list[BlogComment]
+        :return: The same list of comments.
+        :rtype: list[BlogComment]
+        """
+        for comment in comments_list:
+            comment.author = self.authors.intern(comment.author)
+        return comments_list
+
+    def fetch_all_comments(self, backend=None, max_workers=None, page_size=500, deadline=None):
+        """ Method fetches all comments of the blog from its blog-wide comments feed, paging through it concurrently.
+        Only available for Atom feeds. If the feed has an `updated_min` date, only the comments since then are fetched.
+
+        :param backend: Optional execution backend to fetch the pages with - 'thread' or 'process';
+                    defaults to the backend the feed has been initialized with.
+        :type backend: str
+        :param max_workers: Optional number of pages to fetch at the same time; defaults to the number the feed has
+                    been initialized with.
+        :type max_workers: int
+        :param page_size: Number of comments requested per page; the site may return fewer.
+        :type page_size: int
+        :param deadline: Optional time by which to return, as per time.monotonic(); the comments of the pages not
+                    fetched by then are left out and the pages kept in the `cut_comment_pages` attribute.
+        :type deadline: float
+        :return: List of all comments of the blog.
+        :rtype: list[BlogComment]
+        """
+        comment_pages = self.comment_pages(page_size)
+        if not comment_pages:
+            return []
+
+        all_comments = []
+        backend = backend if backend is not None else self.backend
+        max_workers = max_workers if max_workers is not None else self.max_workers
+        page_comments = {}
+        pending_pages = list(comment_pages.values())
+        attempt = 1
+        self.cut_comment_pages = []
+        in_flight = {}
+        executor = self._open_executor(backend, max_workers)
+        try:
+            # Failed pages are attempted again in rounds, all of them after the backoff of the round
+            while pending_pages:
+                in_flight = {executor.submit(self._try_fetch_comments_page, page): page for page in pending_pages}
+                done, not_done = futures.wait(in_flight, timeout=_time_left(deadline))
+                failed_pages = []
+                for future in done:
+                    page, result = in_flight[future], future.result()
+                    if not isinstance(result, FetchError):
+                        page_comments[page.number] = result
+                    elif self.retry_policy.should_retry(result, attempt):
+                        failed_pages.append(page)
+                    else:
+                        warnings.warn(f"{result}, giving up on the page after {attempt} attempts")
+                if not_done:
+                    self.cut_comment_pages = [in_flight[future] for future in not_done]
+                    break
+                if failed_pages:
+                    _delay = self.retry_policy.delay(attempt)
+                    if deadline is not None and monotonic() + _delay >= deadline:
+                        self.cut_comment_pages = failed_pages
+                        break
+                    warnings.warn(f"Failed to fetch {len(failed_pages)} comments pages, retrying in {_delay:.1f} "
+                                  f"seconds - Attempt {attempt}/{self.retry_policy.max_attempts}")
+                    sleep(_delay)
+                pending_pages = sorted(failed_pages, key=lambda page: page.number)
+                attempt += 1
+        finally:
+            self._close_executor(executor, in_flight, wait=not self.cut_comment_pages)
+        if self.cut_comment_pages:
+            self.cut_comment_pages.sort(key=lambda page: page.number)
+            warnings.warn(f"Deadline passed with {len(self.cut_comment_pages)} comments pages left to fetch")
+        for page in comment_pages.values():
+            comments = page_comments.get(page.number)
+            if comments is None:
+                continue
+            if len(comments) != page.expected_number_of_articles:
+                warnings.warn(f"Couldn't successfully obtain the expected number of comments for comments page "
+                              f"number {page.number}")
+            all_comments.extend(self._intern_authors(comments))
+        return all_comments
+
+    def comment_pages(self, page_size=500):
+        """ Method to return the pages of the blog-wide comments feed, planned from its first page. Only available for
+        Atom feeds. If the feed has an `updated_min` date, the pages only cover the comments since then.
+
+        :param page_size: Number of comments requested per page; the site may return fewer.
+        :type page_size: int
+        :return: Dictionary of the FeedPage objects of the comments feed, keyed by their page number; empty if the
+                comments feed isn't available.
+        :rtype: dict[int, FeedPage]
+        """
+        if self.feed_type != "atom":
+            warnings.warn(f"Feed type is 'RSS', cannot retrieve comments info")
+            return {}
+
+        _comments_feed_url = self._query_url(self.comments_url)
+        _separator = "&" if "?" in _comments_feed_url else "?"
+        try:
+            _conn = self.session.get(f"{_comments_feed_url}{_separator}max-results={page_size}")
+        except HTTPError:
+            raise ConnectionError(f"Failed to load the comments feed at '{self.comments_url}'")
+        if _conn.status != 200:
+            raise ConnectionError(f"Loading the comments feed at '{self.comments_url}' returned unexpected HTTP code "
+                                  f"- {_conn.status}")
+        try:
+            return self._plan_pages(_comments_feed_url, parser.parse_feed_info(_conn.data), "comments")
+        except (ValueError, etree.XMLSyntaxError):
+            warnings.warn(f"Failed to obtain Feed information for the comments feed at '{self.comments_url}'")
+            return {}
+
+    def _try_fetch_comments_page(self, page):
+        """ Hidden (private) method fetching the comments of a page of the blog-wide comments feed, returning the
+        error instead of raising it, so that the other pages of the batch are still collected.
+
+        :param page: The comments feed page to collect.
+        :type page: FeedPage
+        :return: List of the comments on the page, or the error the fetch failed with.
+        :rtype: Union[list[BlogComment], FetchError]
+        """
+        try:
+            return self._fetch_comments_page(page)
+        except FetchError as e:
+            return e
+
+    def _fetch_comments_page(self, page, article_backref=None):
+        """ Hidden (private) method used to fetch the comments of the provided page of a comments feed, either the
+        blog-wide one or the one of a single article.
+
+        :param page: The comments feed page to collect.
+        :type page: FeedPage
+        :param article_backref: Optional ID of the article the comments feed belongs to.
+        :type article_backref: int
+        :return: List of the comments on the page.
+        :rtype: list[BlogComment]
+        """
+        return _fetch_comments_feed_page(self.session, page, self.retry_policy, article_backref, self.authors)
+
+    @staticmethod
+    def _attach_comments(articles_list, comments_list):
+        """ Hidden (private) method to add the comments collected via the blog-wide comments feed to the articles
+        they've been posted to, matched via their `article_backref`. Comments of articles not in the `articles_list`
+        are returned instead.
+
+        :param articles_list: Articles to attach the comments to.
+        :type articles_list: list[BlogAtomArticle]
+        :param comments_list: Comments to attach.
+        :type comments_list: list[BlogComment]
+        :return: List of the comments that couldn't be attached to any of the articles.
+        :rtype: list[BlogComment]
+        """
+        articles_by_id = {article.article_id: article for article in articles_list}
+        orphan_comments = []
+        for comment in comments_list:
+            article = articles_by_id.get(comment.article_backref)
+            if article is not None:
+                article.comments.append(comment)
+            else:
+                orphan_comments.append(comment)
+        return orphan_comments
+
+    def _fetch_articles(self, page, comments_mode="article"):
         """ Hidden (private) method used to fetch articles for the provided `page` parameter.
 
         :param page: The page object from which to collect data.
         :type page: FeedPage
+        :param comments_mode: Whether the comments of each article are fetched along with it ('article'), left to be
+                    loaded later ('lazy') or not fetched at all ('bulk').
+        :type comments_mode: str
         :return: List of all articles.
         :rtype: list[BlogRSSArticle, BlogAtomArticle]
+        :raises FetchError: If the page couldn't be fetched or parsed.
         """
-        http = urllib3.PoolManager()
-        while True:
-            try:
-                attempt = 1
-                content = http.request("GET", page.url)
-                if content.status != 200 and attempt <= 3:
-                    warnings.warn(f"Caught {content.status} error while attempting to retrieve content for page "
-                                  f"'{page.number}', sleeping for 5 seconds and retrying - Attempt {attempt}/3")
-                    sleep(5)
-                else:
-                    break
-            except NewConnectionError:
-                raise RuntimeError(f"Failed to fetch all articles for page number '{page.number}'")
-        soup = BeautifulSoup(content.data.decode(self.site_encoding), features="lxml")
+        try:
+            content = self.session.get(page.url)
+        except HTTPError as e:
+            # Connection errors and timeouts alike, once the session has gone through its own retries
+            raise FetchError(f"Failed to fetch the articles for page number '{page.number}' - {e}")
+        if content.status != 200:
+            raise FetchError(f"Caught {content.status} error while attempting to retrieve content for page "
+                             f"'{page.number}'", status=content.status,
+                             retryable=self.retry_policy.is_retryable(content.status))
+        try:
+            parsed_articles = list(parser.iter_articles(content.data, self.feed_type, self.authors))
+        except etree.XMLSyntaxError as e:
+            # A truncated or garbled page goes through the retries like any other failed one
+            raise FetchError(f"Failed to parse the articles for page number '{page.number}' - {e}")
         articles_list = []
-        if self.feed_type == "rss":
-            all_articles = soup.find_all("item")
-            for article in all_articles:
-                _rtcl = BlogRSSArticle(article_tag=article)
-                articles_list.append(_rtcl)
-        else:
-            all_articles = soup.find_all("entry")
-            for article in all_articles:
-                _rtcl = BlogAtomArticle(article_tag=article, encoding=self.site_encoding)
-                articles_list.append(_rtcl)
+        for article in parsed_articles:
+            if self.feed_type == "atom" and comments_mode == "article":
+                article.comments = self._fetch_comments(article)
+            elif self.feed_type == "atom" and comments_mode == "lazy":
+                article.comments = LazyComments(self, article)
+            articles_list.append(article)
         return articles_list
 
+    def _fetch_comments(self, article):
+        """ Hidden (private) method used to fetch the comments of the provided `article` from its comments feed. If the
+        comments don't fit on the first page of the feed, the remaining pages are fetched concurrently, up to the
+        `max_comments_per_article` cap of the feed.
+
+        :param article: The article to collect the comments for.
+        :type article: BlogAtomArticle
+        :return: List of all comments of the article.
+        :rtype: list[BlogComment]
+        """
+        if not article.comments_link:
+            return []
+        if article.total_comments == 0:
+            # The feed advertises no comments for the article, no need for the request
+            self._count_comment_fetch('skipped')
+            return []
+        self._count_comment_fetch('performed')
+        return _collect_article_comments(self.session, article.article_id, article.comments_link,
+                                         self.comments_page_size, self.max_comments_per_article, self.comment_workers,
+                                         self.authors, self.retry_policy, self.site_encoding)
+
+    def load_comments(self, articles_list, backend=None, max_workers=None, deadline=None):
+        """ Method to load the comments of all articles in the `articles_list` whose comments haven't been loaded yet
+        (fetched with the 'lazy' comments mode), fetching the comments feeds of the articles concurrently.
+        The articles whose comments aren't loaded by the optional `deadline` are kept in the `cut_comments` attribute;
+        their comments would still be fetched on first access.
+
+        :param articles_list: Articles to load the comments for.
+        :type articles_list: list[BlogAtomArticle]
+        :param backend: Optional execution backend to fetch the comments with - 'thread' or 'process';
+                    defaults to the backend the feed has been initialized with.
+        :type backend: str
+        :param max_workers: Optional number of comments feeds to fetch at the same time; defaults to the number the
+                    feed has been initialized with.
+        :type max_workers: int
+        :param deadline: Optional time by which to return, as per time.monotonic().
+        :type deadline: float
+        :return: Nothing
+        :rtype: None
+        """
+        self.cut_comments = []
+        _pending = [article for article in articles_list
+                    if isinstance(article.comments, LazyComments) and not article.comments.loaded]
+        if not _pending:
+            return
+        backend = backend if backend is not None else self.backend
+        max_workers = max_workers if max_workers is not None else self.max_workers
+        in_flight = {}
+        executor = self._open_executor(backend, max_workers)
+        try:
+            in_flight = {executor.submit(self._fetch_comments, article): article for article in _pending}
+            done, not_done = futures.wait(in_flight, timeout=_time_left(deadline))
+            for future in done:
+                comments = future.result()
+                in_flight[future].comments.set(self._intern_authors(comments))
+                self._index_comments(comments)
+            self.cut_comments = [article for article in _pending if not article.comments.loaded]
+        finally:
+            self._close_executor(executor, in_flight, wait=not self.cut_comments)
+        if self.cut_comments:
+            warnings.warn(f"Deadline passed with the comments of {len(self.cut_comments)} articles left to load")
+        return
+
+    def _count_comment_fetch(self, outcome):
+        """ Hidden (private) method to increase the `outcome` counter of the comment fetches in a thread-safe manner.
+
+        :param outcome: Either 'performed' or 'skipped'.
+        :type outcome: str
+        """
+        with self._lock:
+            self._comment_fetches[outcome] += 1
+
+    def comment_fetch_stats(self):
+        """ Method to return how many per-article comment feed requests have been performed and how many have been
+        skipped because the article advertised no comments. Counters only cover the fetching done in the current
+        process, fetches made by the workers of the 'process' backend are not included.
+
+        :return: Dictionary with the number of 'performed' and 'skipped' comment fetches.
+        :rtype: dict
+        """
+        with self._lock:
+            return self._comment_fetches.copy()
+
     def _save_articles(self, next_batch):
-        """ Hidden (private) method that utilizes multiprocessing.Manager.Lock() for when this class' 'fetch_all' method
-        is invoked; just making sure that all executor works in the 'fetch_all' method will be manipulating the
-        temporary `self._all_fetched_articles` list in a safe manner.
+        """ Hidden (private) method that utilizes threading.Lock() for when this class' 'fetch_all' method is invoked;
+        just making sure that all executor works in the 'fetch_all' method will be manipulating the temporary
+        `self._all_fetched_articles` list in a safe manner.
 
         :param next_batch: List of the BlogArticle objects to save.
         :type next_batch: list[BlogRSSArticles, BlogAtomArticle]
@@ -284,29 +1163,52 @@ class Feed:
         """
         with self._lock:
             self._all_fetched_articles.extend(next_batch)
+            self.index.add_articles(next_batch)
         return
 
-    def get_all_authors(self, articles_list):
+    def _index_comments(self, comments_list):
+        """ Hidden (private) method adding comments loaded after their articles have been fetched to the index of the
+        feed, in a thread-safe manner.
+
+        :param comments_list: The comments.
+        :type comments_list: list[BlogComment]
+        :return: Nothing
+        :rtype: None
+        """
+        with self._lock:
+            self.index.add_comments(comments_list)
+        return
+
+    def get_all_authors(self, articles_list=None):
         """ Method to obtain all unique authors from the provided `articles_list`, this includes all authors of comments
-        for the articles.
+        for the articles. Authors parsed by this feed are shared objects (see AuthorRegistry), so each one is only
+        hashed the first time it's met. If no `articles_list` is provided, the authors of the articles returned by the
+        last 'fetch_all' call are taken from the index of the feed, without scanning the articles.
 
-        :param articles_list:
+        :param articles_list: Optional list of articles.
         :type articles_list: list[BlogRSSArticle, BlogAtomArticle]
         :return: List of all authors.
         :rtype: list[BlogAuthor]
         """
+        if articles_list is None:
+            return self.index.authors()
         authors_set = set()
+        _seen = set()
         for article in articles_list:
-            authors_set.add(article.author)
-            if len(article.comments) > 0:
-                for comm in article.comments:
-                    authors_set.add(comm.author)
+            for author in (article.author, *(comm.author for comm in article.comments)):
+                # Identity check first, authors not coming from the registry (eg. a previous scrape) still get
+                # deduplicated by their hash
+                if id(author) not in _seen:
+                    _seen.add(id(author))
+                    authors_set.add(author)
         return list(authors_set)
 
-    def get_all_comments(self, articles_list):
-        """ Method to obtain all comments from the provided `articles_list`.
+    def get_all_comments(self, articles_list=None):
+        """ Method to obtain all comments from the provided `articles_list`. If no `articles_list` is provided, the
+        comments of the articles returned by the last 'fetch_all' call are taken from the index of the feed, without
+        scanning the articles.
 
-        :param articles_list:
+        :param articles_list: Optional list of articles.
         :type articles_list: list[BlogRSSArticle, BlogAtomArticle]
         :return: List of all comments.
         :rtype: list[BlogComment]
@@ -314,6 +1216,8 @@ class Feed:
         if self.feed_type == "rss":
             warnings.warn(f"Feed type is 'RSS', cannot retrieve comments info")
             return []
+        elif articles_list is None:
+            return self.index.comments()
         else:
             comments_set = set()
             for article in articles_list:
@@ -322,6 +1226,24 @@ class Feed:
                         comments_set.add(art_comm)
             return list(comments_set)
 
+    def __getstate__(self):
+        # Locks can't be pickled, needed for when the feed is sent to the workers of the 'process' backend; the authors
+        # registry and the index are left out too, they would be sent along with every page and the workers don't use
+        # them - the authors are interned again anyway
+        state = self.__dict__.copy()
+        del state['_lock']
+        del state['authors']
+        del state['index']
+        # Executors can't be pickled either, and the workers don't fetch pages through the shared one anyway
+        state['executor'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self.authors = AuthorRegistry()
+        self.index = ArticleIndex()
+
     def __str__(self):
         return (f"<Feed url='{self.url}', feed_type='{self.feed_type}', total_articles={self.total_results}, "
                 f"total_pages={len(self.pages)}>")
@@ -332,12 +1254,13 @@ class Feed:
 
 class FeedPage:
 
-    def __init__(self, page_number, url, page_type, encoding, articles_num):
+    def __init__(self, page_number, url, page_type, encoding, articles_num, session=None):
         self.number = page_number
         self.url = url
         self.page_type = page_type
         self.encoding = encoding
         self.expected_number_of_articles = articles_num
+        self.session = session if session is not None else HttpSession()
 
     def get_next_page(self):
         """ Method to try and get the URL for the next iteration of the feed. Only applicable for 'Atom' feeds.
@@ -346,16 +1269,14 @@ class FeedPage:
         :rtype: str
         """
         next_page_url = None
-        http = urllib3.PoolManager()
         try:
-            content = http.request("GET", self.url)
-        except NewConnectionError:
+            content = self.session.get(self.url)
+        except HTTPError:
             return next_page_url
-        soup = BeautifulSoup(content.data.decode(self.encoding), features="lxml")
-        _links = soup.find_all('link')
-        for link in _links:
-            if link.has_attr('rel') and 'next' in link.get('rel'):
-                next_page_url = link.get('href')
+        try:
+            next_page_url = parser.parse_feed_info(content.data)['links'].get('next')
+        except etree.XMLSyntaxError:
+            pass
         return next_page_url
 
     def get_previous_page(self):
@@ -365,16 +1286,14 @@ class FeedPage:
         :rtype: str
         """
         previous_page_url = None
-        http = urllib3.PoolManager()
         try:
-            content = http.request("GET", self.url)
-        except NewConnectionError:
+            content = self.session.get(self.url)
+        except HTTPError:
             return previous_page_url
-        soup = BeautifulSoup(content.data.decode(self.encoding), features="lxml")
-        _links = soup.find_all('link')
-        for link in _links:
-            if link.has_attr('rel') and 'previous' in link.get('rel'):
-                previous_page_url = link.get('href')
+        try:
+            previous_page_url = parser.parse_feed_info(content.data)['links'].get('previous')
+        except etree.XMLSyntaxError:
+            pass
         return previous_page_url
 
     def __str__(self):
@@ -384,7 +1303,98 @@ class FeedPage:
         return f"FeedPage({self.number}, '{self.url}', '{self.page_type}', '{self.encoding}')"
 
 
+class LazyComments(MutableSequence):
+
+    def __init__(self, feed, article):
+        """ List-like handle standing in for the comments of an article fetched with the 'lazy' comments mode; the
+        comments are fetched from the article's comments feed the first time the handle is accessed in any way, or
+        beforehand in batch via the Feed's 'load_comments' method.
+
+        :param feed: Feed the article comes from, used to fetch the comments.
+        :type feed: Feed
+        :param article: Article the comments belong to.
+        :type article: BlogAtomArticle
+        """
+        self._feed = feed
+        self._article = article
+        self._comments = None  # type: list[BlogComment]
+
+    @property
+    def loaded(self):
+        return self._comments is not None
+
+    def load(self):
+        """ Method to fetch the comments, if not already done.
+
+        :return: List of the comments.
+        :rtype: list[BlogComment]
+        """
+        if self._comments is None:
+            if self._feed is None:
+                raise RuntimeError(f"Comments of article '{self._article.article_id}' can't be loaded, the handle is "
+                                   f"not bound to a Feed")
+            self._comments = self._feed._fetch_comments(self._article)
+            self._feed._index_comments(self._comments)
+        return self._comments
+
+    def set(self, comments):
+        """ Method to provide the comments directly, marking the handle as loaded.
+
+        :param comments: List of the comments.
+        :type comments: list[BlogComment]
+        """
+        self._comments = list(comments)
+
+    def bind(self, feed):
+        """ Method to set the feed used to fetch the comments; needed after the handle has been pickled.
+
+        :param feed: The feed to fetch the comments with.
+        :type feed: Feed
+        """
+        self._feed = feed
+
+    def __getitem__(self, index):
+        return self.load()[index]
+
+    def __setitem__(self, index, value):
+        self.load()[index] = value
+
+    def __delitem__(self, index):
+        del self.load()[index]
+
+    def __len__(self):
+        return len(self.load())
+
+    def insert(self, index, value):
+        self.load().insert(index, value)
+
+    def __eq__(self, other):
+        if isinstance(other, (LazyComments, list)):
+            return list(self) == list(other)
+        return False
+
+    def __getstate__(self):
+        # The feed holds the HTTP session and locks, the handle has to be bound again once unpickled
+        state = self.__dict__.copy()
+        state['_feed'] = None
+        return state
+
+    def __str__(self):
+        if self.loaded:
+            return str(self._comments)
+        return f"<LazyComments article_id='{self._article.article_id}', loaded=False>"
+
+    def __repr__(self):
+        if self.loaded:
+            return repr(self._comments)
+        return f"LazyComments('{self._article.article_id}')"
+
+
 class BlogArticle:
+    # Large blogs mean hundreds of thousands of data objects; without a per-instance __dict__ they're much smaller and
+    # cheaper to pickle for the 'process' backend
+    __slots__ = ("article_id", "title", "content", "author", "published_date", "last_edited_date", "blog_link",
+                 "feed_link", "comments")
 
     def __init__(self, article_id, title, content, author, published_date, last_edited_date=None,
                  blog_link=None, feed_link=None, comments_list=None):
@@ -439,12 +1449,11 @@ class BlogArticle:
                 # ISO format is the usual Atom date format
                 self.published_date = datetime.fromisoformat(published_date)
             except ValueError:
-                pass
-            try:
-                # Thu, 06 May 2021 14:51:00 +0000 is an example RSS article Published date format
-                self.published_date = datetime.strptime(published_date, '%a, %d %b %Y %H:%M:%S %z')
-            except ValueError:
-                self.published_date = datetime.now()
+                try:
+                    # Thu, 06 May 2021 14:51:00 +0000 is an example RSS article Published date format
+                    self.published_date = datetime.strptime(published_date, '%a, %d %b %Y %H:%M:%S %z')
+                except ValueError:
+                    self.published_date = datetime.now()
         elif isinstance(published_date, datetime):
             self.published_date = published_date  # type: datetime
         else:
@@ -456,12 +1465,11 @@ class BlogArticle:
                     # ISO format is the usual Atom date format
                     self.last_edited_date = datetime.fromisoformat(last_edited_date)
                 except ValueError:
-                    pass
-                try:
-                    # Thu, 06 May 2021 14:51:00 +0000 is an example RSS article Published date format
-                    self.last_edited_date = datetime.strptime(last_edited_date, '%a, %d %b %Y %H:%M:%S %z')
-                except ValueError:
-                    self.last_edited_date = datetime.now()
+                    try:
+                        # Thu, 06 May 2021 14:51:00 +0000 is an example RSS article Published date format
+                        self.last_edited_date = datetime.strptime(last_edited_date, '%a, %d %b %Y %H:%M:%S %z')
+                    except ValueError:
+                        self.last_edited_date = datetime.now()
             elif isinstance(last_edited_date, datetime):
                 self.last_edited_date = last_edited_date  # type: datetime
             else:
@@ -503,6 +1511,7 @@ class BlogArticle:
 
 
 class BlogAuthor:
+    __slots__ = ("name", "uri", "author_id", "email", "image_src")
 
     def __init__(self, name=None, uri=None, author_id=None, email=None, image_src=None, author_tag=None):
         """ Constructor for the BlogAuthor object. Can either be initialized via the BeautifulSoup Tag object, passed
@@ -573,7 +1582,78 @@ class BlogAuthor:
             return False
 
 
+class AuthorRegistry:
+
+    def __init__(self):
+        """ Registry of the authors met while parsing a feed, handing out a single canonical BlogAuthor object per
+        person - keyed by the Blogger ID of the author, or by its name and URI when it has none (-1). A prolific
+        commenter is then one object shared by all their comments instead of one copy per comment, and collecting the
+        unique authors of the articles only has to compare objects by identity.
+
+        """
+        self._authors = {}  # type: dict[Union[int, tuple[str, str]], BlogAuthor]
+
+    @staticmethod
+    def key(author_id, name, uri):
+        """ Method to return the key an author is registered under.
+
+        :param author_id: Blogger ID of the author, -1 if unknown.
+        :type author_id: int
+        :param name: Display name of the author.
+        :type name: str
+        :param uri: URI of the author's profile.
+        :type uri: str
+        :return: The ID of the author, or the name and URI when the ID is unknown.
+        :rtype: Union[int, tuple[str, str]]
+        """
+        return author_id if author_id != -1 else (name, uri)
+
+    def find(self, author_id, name, uri):
+        """ Method to look up an already registered author, so that the caller doesn't have to build a new object.
+
+        :param author_id: Blogger ID of the author, -1 if unknown.
+        :type author_id: int
+        :param name: Display name of the author.
+        :type name: str
+        :param uri: URI of the author's profile.
+        :type uri: str
+        :return: The canonical author object, None if the author hasn't been registered yet.
+        :rtype: BlogAuthor
+        """
+        return self._authors.get(self.key(author_id, name, uri))
+
+    def intern(self, author):
+        """ Method to register the `author`, if not already done, and return the canonical object for it. The first
+        object registered for a person is kept.
+
+        :param author: The author to register.
+        :type author: BlogAuthor
+        :return: The canonical author object.
+        :rtype: BlogAuthor
+        """
+        # dict.setdefault is atomic, so the workers of the 'thread' backend can share the registry without a lock
+        return self._authors.setdefault(self.key(author.author_id, author.name, author.uri), author)
+
+    def __len__(self):
+        return len(self._authors)
+
+    def __iter__(self):
+        return iter(list(self._authors.values()))
+
+    def __contains__(self, author):
+        if isinstance(author, BlogAuthor):
+            return self.key(author.author_id, author.name, author.uri) in self._authors
+        return False
+
+    def __str__(self):
+        return f"<AuthorRegistry authors={len(self._authors)}>"
+
+    def __repr__(self):
+        return "AuthorRegistry()"
+
+
 class BlogComment:
+    __slots__ = ("comment_id", "content", "published_date", "last_updated_date", "author", "article_backref")
 
     def __init__(self, comment_id=None, content=None, published_date=None, last_updated_date=None, author=None,
                  article_backref=None, comment_tag=None):
@@ -655,6 +1735,7 @@ class BlogComment:
 
 
 class BlogRSSArticle(BlogArticle):
+    __slots__ = ()
 
     def __init__(self, article_id=None, title=None, content=None, author=None, published_date=None,
                  last_edited_date=None, blog_link=None, article_tag=None):
@@ -721,9 +1802,11 @@ class BlogRSSArticle(BlogArticle):
 
 
 class BlogAtomArticle(BlogArticle):
+    __slots__ = ("comments_link", "total_comments")
 
     def __init__(self, article_id=None, title=None, content=None, author=None, published_date=None, article_tag=None,
-                 last_edited_date=None, blog_link=None, feed_link=None, comments=None, encoding="UTF-8"):
+                 last_edited_date=None, blog_link=None, feed_link=None, comments=None, encoding="UTF-8", session=None,
+                 comments_link=None, total_comments=None):
         """ Child object of the BlogArticle class, specifically aimed at articles retrieved via the Atom stream.
 
         :param article_id: Unique Blogger-generated ID for the article.
@@ -753,9 +1836,18 @@ class BlogAtomArticle(BlogArticle):
         :type blog_link: str
         :param feed_link: Link to the article in the feed. Atom-only. Optional parameter.
         :type feed_link: str
-        :param encoding: Preferred encoding for when collecting and initializing the comments objects, defaulting to
-                        "UTF-8".
+        :param encoding: Kept for compatibility; the comments feed is parsed from its raw bytes, whose XML declaration
+                        tells their encoding.
         :type encoding: str
+        :param session: HTTP session used to collect the comments of the article, when it's initialized from an
+                        `article_tag`; if none is provided, a session shared by all such articles is used. All pages of
+                        the comments feed are read, with a warning if fewer comments than advertised could be read.
+        :type session: HttpSession
+        :param comments_link: Link to the comments feed of the article. Optional parameter.
+        :type comments_link: str
+        :param total_comments: Number of comments the feed advertises for the article (<thr:total>), None if unknown.
+                        Optional parameter.
+        :type total_comments: int
         """
         if article_tag is None and (article_id is None or title is None or content is None or published_date is None
                                     or author is None):
@@ -764,6 +1856,8 @@ class BlogAtomArticle(BlogArticle):
         if article_tag is None:
             super().__init__(article_id, title, content, author, published_date, last_edited_date=last_edited_date,
                              blog_link=blog_link, feed_link=feed_link, comments_list=comments)
+            self.comments_link = comments_link  # type: str
+            self.total_comments = total_comments  # type: int
         else:
             if not isinstance(article_tag, Tag):
                 raise ValueError(f"Provided 'article_tag' is not an instance of the BeautifulSoup's Tag class")
@@ -779,6 +1873,8 @@ class BlogAtomArticle(BlogArticle):
             last_updated_date = datetime.fromisoformat(_article.find('updated').text)
             _author = _article.find('author')
             author = BlogAuthor(author_tag=_author)
+            if _article.find('thr:total'):
+                total_comments = int(_article.find('thr:total').text)
             _links = _article.find_all('link')
             comments = []
             _feed_url = None
@@ -786,20 +1882,23 @@ class BlogAtomArticle(BlogArticle):
             for link in _links:
                 if link.get('rel')[0] == 'replies' and link.get('type') == "application/atom+xml":
                     _comments_url = link.get('href')
-                    _http = urllib3.PoolManager()
-                    _conn = _http.request("GET", _comments_url)
-                    _comments_soup = BeautifulSoup(_conn.data.decode(encoding), features="lxml")
-                    _comments_retrieved = _comments_soup.find_all('entry')
-                    if len(_comments_retrieved) > 0:
-                        for comment in _comments_retrieved:
-                            article_comment = BlogComment(comment_tag=comment, article_backref=article_id)
-                            comments.append(article_comment)
+                    comments_link = _comments_url
+                    if total_comments == 0:
+                        # No point in requesting the comments feed if the article has no comments
+                        continue
+                    comments = _collect_article_comments(session if session is not None else _shared_session(),
+                                                         article_id, _comments_url, encoding=encoding)
+                    if total_comments is not None and len(comments) < total_comments:
+                        warnings.warn(f"Only {len(comments)} of the {total_comments} comments advertised for article "
+                                      f"'{article_id}' could be read")
                 elif link.get('rel')[0] == 'self' and link.get('type') == "application/atom+xml":
                     _feed_url = link.get('href')
                 elif link.get('rel')[0] == 'alternate' and link.get('type') == "text/html":
                     _blog_url = link.get('href')
             super().__init__(article_id, title, content, author, published_date, last_edited_date=last_updated_date,
                              blog_link=_blog_url, feed_link=_feed_url, comments_list=comments)
+            self.comments_link = comments_link  # type: str
+            self.total_comments = total_comments  # type: int
 
     def __str__(self):
         return (f"<BlogAtomArticle id='{self.article_id}', title='{self.title}', author='{self.author.name}', "
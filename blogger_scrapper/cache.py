@@ -0,0 +1,225 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import urllib3
+
+_VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+
+
+class HttpCache:
+
+    def __init__(self, directory="output/.cache", max_size=256 * 2 ** 20, max_age=0):
+        """ Constructor for the HttpCache object - an on-disk cache of the responses of the Blogger site, keyed by URL,
+        meant to be used by an HttpSession. Cached responses are revalidated with the site through conditional requests
+        ('If-None-Match'/'If-Modified-Since'), so that an unchanged page costs a bodiless 304 response instead of being
+        downloaded again. Once the cache grows over `max_size`, the least recently used responses are evicted.
+
+        :param directory: Directory to keep the cache in, created if it doesn't exist.
+        :type directory: str
+        :param max_size: Maximum total size (in bytes) of the cached response bodies.
+        :type max_size: int
+        :param max_age: Number of seconds a cached response is served without revalidating it with the site; with the
+                    default of 0 every cached response is revalidated.
+        :type max_age: float
+        """
+        if max_size < 1:
+            raise ValueError(f"Provided 'max_size' parameter must be a positive integer")
+        if max_age < 0:
+            raise ValueError(f"Provided 'max_age' parameter must not be negative")
+
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        """ Hidden (private) method to open (and create, if needed) the database holding the cached responses.
+
+        :return: Connection to the cache database.
+        :rtype: sqlite3.Connection
+        """
+        if self._connection is None:
+            Path.mkdir(self.directory, parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.directory / "responses.db", timeout=30, check_same_thread=False,
+                                               isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, status INTEGER, "
+                                     "headers TEXT, body BLOB, size INTEGER, stored REAL, accessed REAL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        return self._connection
+
+    def lookup(self, url):
+        """ Method to return the cached response for the `url`, marking it as recently used.
+
+        :param url: URL of the request.
+        :type url: str
+        :return: Tuple of the status, headers, body and storing time of the response, None if it's not cached.
+        :rtype: tuple
+        """
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute("SELECT status, headers, body, stored FROM responses WHERE url = ?",
+                                     (url,)).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE responses SET accessed = ? WHERE url = ?", (time.time(), url))
+        status, headers, body, stored = row
+        return status, urllib3.HTTPHeaderDict(json.loads(headers)), body, stored
+
+    def store(self, url, response):
+        """ Method to cache the `response` of the `url`, evicting the least recently used responses if the cache grows
+        over its maximum size. Only successful responses carrying a validator ('ETag' or 'Last-Modified') are cached,
+        as nothing else can be revalidated.
+
+        :param url: URL of the request.
+        :type url: str
+        :param response: The response to cache, with its body already read.
+        :type response: urllib3.response.HTTPResponse
+        """
+        if response.status != 200 or not any(header in response.headers for header in _VALIDATOR_HEADERS):
+            return
+        body = response.data
+        if len(body) > self.max_size:
+            return
+        headers = json.dumps(dict(response.headers.items()))
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               (url, response.status, headers, body, len(body), now, now))
+            self._evict(connection)
+
+    def refresh(self, url):
+        """ Method to mark the cached response of the `url` as fresh again, after the site confirmed it didn't change.
+
+        :param url: URL of the request.
+        :type url: str
+        """
+        with self._lock:
+            self._connect().execute("UPDATE responses SET stored = ? WHERE url = ?", (time.time(), url))
+
+    def _evict(self, connection):
+        """ Hidden (private) method to delete the least recently used responses until the cache fits its maximum size.
+
+        :param connection: Connection to the cache database.
+        :type connection: sqlite3.Connection
+        """
+        total_size = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total_size <= self.max_size:
+            return
+        evicted = []
+        for url, size in connection.execute("SELECT url, size FROM responses ORDER BY accessed"):
+            if total_size <= self.max_size:
+                break
+            evicted.append((url,))
+            total_size -= size
+        connection.executemany("DELETE FROM responses WHERE url = ?", evicted)
+
+    def get(self, http, url, headers=None, **kwargs):
+        """ Method to perform a GET request through the cache - a cached response younger than `max_age` is served
+        straight away, an older one is revalidated with a conditional request and served if the site answers with 304.
+        Anything else goes to the site and the response is cached for the next time.
+
+        :param http: The pool manager to perform the requests with.
+        :type http: urllib3.PoolManager
+        :param url: URL to send the request to.
+        :type url: str
+        :param headers: Optional headers of the request.
+        :type headers: dict
+        :return: The response object, either fresh from the site or rebuilt from the cache.
+        :rtype: urllib3.response.HTTPResponse
+        """
+        cached = self.lookup(url)
+        if cached is not None:
+            status, cached_headers, body, stored = cached
+            if self.max_age and time.time() - stored < self.max_age:
+                self._count_hit(len(body))
+                return self._cached_response(status, cached_headers, body)
+            headers = dict(headers) if headers else {}
+            if 'ETag' in cached_headers:
+                headers['If-None-Match'] = cached_headers['ETag']
+            if 'Last-Modified' in cached_headers:
+                headers['If-Modified-Since'] = cached_headers['Last-Modified']
+
+        response = http.request("GET", url, headers=headers, **kwargs)
+        if cached is not None and response.status == 304:
+            self.refresh(url)
+            with self._lock:
+                self.revalidations += 1
+            self._count_hit(len(body))
+            return self._cached_response(status, cached_headers, body)
+
+        with self._lock:
+            self.misses += 1
+        self.store(url, response)
+        return response
+
+    def _count_hit(self, size):
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += size
+
+    @staticmethod
+    def _cached_response(status, headers, body):
+        return urllib3.HTTPResponse(body=body, headers=headers, status=status, preload_content=True)
+
+    def stats(self):
+        """ Method to return the counters of the cache. Counters only cover the requests made in the current process,
+        requests made from copies of the cache sent to other processes are not included.
+
+        :return: Dictionary with the number of hits (of which revalidated with a 304 response), misses, the bytes that
+                didn't have to be downloaded thanks to the cache and the number and size of the cached responses.
+        :rtype: dict
+        """
+        with self._lock:
+            entries, size = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) "
+                                                    "FROM responses").fetchone()
+            return {
+                'hits': self.hits,
+                'revalidations': self.revalidations,
+                'misses': self.misses,
+                'bytes_saved': self.bytes_saved,
+                'entries': entries,
+                'size': size
+            }
+
+    def clear(self):
+        """ Method to delete all cached responses.
+
+        """
+        with self._lock:
+            self._connect().execute("DELETE FROM responses")
+
+    def close(self):
+        """ Method to close the cache database; the cache can still be used afterwards, it's simply re-opened.
+
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __getstate__(self):
+        # The database connection can't be sent to another process, the copy opens its own
+        return {
+            'directory': self.directory,
+            'max_size': self.max_size,
+            'max_age': self.max_age
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __str__(self):
+        return f"<HttpCache directory={self.directory}, hits={self.hits}, misses={self.misses}>"
+
+    def __repr__(self):
+        return f"HttpCache(directory='{self.directory}', max_size={self.max_size})"
@@ -0,0 +1,157 @@
+import pickle
+import sqlite3
+import threading
+import warnings
+from datetime import datetime
+from pathlib import Path
+
+
+class FeedCheckpoint:
+
+    def __init__(self, directory="output/.checkpoint"):
+        """ Constructor for the FeedCheckpoint object - an on-disk store of the pages of a feed completed by a
+        'fetch_all' call, so that a call dying halfway (a crash, a killed process) doesn't lose them. Every page is
+        written as soon as it has been fetched; the next call with the same checkpoint only fetches the pages that
+        aren't in it yet. The checkpoint of a feed is cleared once all of its pages have been fetched.
+
+        :param directory: Directory to keep the checkpoint database in, created if it doesn't exist.
+        :type directory: str
+        """
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        """ Hidden (private) method to open (and create, if needed) the database holding the checkpoints.
+
+        :return: Connection to the checkpoint database.
+        :rtype: sqlite3.Connection
+        """
+        if self._connection is None:
+            Path.mkdir(self.directory, parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.directory / "checkpoint.db", timeout=30, check_same_thread=False,
+                                               isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS runs (feed TEXT PRIMARY KEY, comments_mode TEXT, "
+                                     "total_results INTEGER, pages INTEGER, started TEXT)")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS pages (feed TEXT, number INTEGER, url TEXT, "
+                                     "articles BLOB, PRIMARY KEY (feed, number))")
+        return self._connection
+
+    def begin(self, feed, comments_mode, total_results, pages):
+        """ Method to start (or resume) the checkpoint of the `feed`. The pages of a previous run are only kept if the
+        feed still has the same number of entries and pages, and was fetched with the same comments mode; otherwise
+        the entries of the feed have shifted between its pages (or the pages hold different content) and the feed has
+        to be fetched from scratch.
+
+        :param feed: URL of the feed, including its query parameters.
+        :type feed: str
+        :param comments_mode: Comments mode the pages are fetched with.
+        :type comments_mode: str
+        :param total_results: Number of entries of the feed.
+        :type total_results: int
+        :param pages: Number of pages of the feed.
+        :type pages: int
+        :return: Numbers of the pages already completed.
+        :rtype: set[int]
+        """
+        with self._lock:
+            connection = self._connect()
+            run = connection.execute("SELECT comments_mode, total_results, pages FROM runs WHERE feed = ?",
+                                     (feed,)).fetchone()
+            if run is not None and run == (comments_mode, total_results, pages):
+                return {number for number, in connection.execute("SELECT number FROM pages WHERE feed = ?",
+                                                                 (feed,))}
+            if run is not None:
+                warnings.warn(f"Feed at '{feed}' changed since its checkpoint has been saved, fetching all its pages "
+                              f"again")
+            connection.execute("BEGIN")
+            connection.execute("DELETE FROM pages WHERE feed = ?", (feed,))
+            connection.execute("INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?)",
+                               (feed, comments_mode, total_results, pages, datetime.now().isoformat()))
+            connection.execute("COMMIT")
+            return set()
+
+    def save_page(self, feed, page, articles_list):
+        """ Method to save the articles of a completed page of the `feed`.
+
+        :param feed: URL of the feed, including its query parameters.
+        :type feed: str
+        :param page: The completed page.
+        :type page: FeedPage
+        :param articles_list: Articles of the page.
+        :type articles_list: list[BlogRSSArticle, BlogAtomArticle]
+        """
+        data = pickle.dumps(list(articles_list), protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._connect().execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)",
+                                    (feed, page.number, page.url, data))
+
+    def load_page(self, feed, number):
+        """ Method to return the articles saved for the page `number` of the `feed`.
+
+        :param feed: URL of the feed, including its query parameters.
+        :type feed: str
+        :param number: Number of the page.
+        :type number: int
+        :return: Articles of the page, None if the page isn't in the checkpoint.
+        :rtype: list[BlogRSSArticle, BlogAtomArticle]
+        """
+        with self._lock:
+            row = self._connect().execute("SELECT articles FROM pages WHERE feed = ? AND number = ?",
+                                          (feed, number)).fetchone()
+        return pickle.loads(row[0]) if row is not None else None
+
+    def clear(self, feed=None):
+        """ Method to delete the checkpoint of the `feed`, or of all feeds if none is provided.
+
+        :param feed: Optional URL of the feed, including its query parameters.
+        :type feed: str
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN")
+            if feed is None:
+                connection.execute("DELETE FROM pages")
+                connection.execute("DELETE FROM runs")
+            else:
+                connection.execute("DELETE FROM pages WHERE feed = ?", (feed,))
+                connection.execute("DELETE FROM runs WHERE feed = ?", (feed,))
+            connection.execute("COMMIT")
+
+    def stats(self):
+        """ Method to return the number of pages saved for every feed.
+
+        :return: Dictionary keyed by the URL of the feed, with the number of 'pages' of the feed, the number of pages
+                'completed' and when the run 'started'.
+        :rtype: dict
+        """
+        with self._lock:
+            rows = self._connect().execute("SELECT runs.feed, runs.pages, runs.started, COUNT(pages.number) "
+                                           "FROM runs LEFT JOIN pages ON pages.feed = runs.feed "
+                                           "GROUP BY runs.feed").fetchall()
+        return {feed: {'pages': pages, 'completed': completed, 'started': started}
+                for feed, pages, started, completed in rows}
+
+    def close(self):
+        """ Method to close the checkpoint database; the checkpoint can still be used afterwards, it's simply
+        re-opened.
+
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __getstate__(self):
+        # The database connection can't be sent to another process, the copy opens its own
+        return {'directory': self.directory}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __str__(self):
+        return f"<FeedCheckpoint directory={self.directory}>"
+
+    def __repr__(self):
+        return f"FeedCheckpoint(directory='{self.directory}')"
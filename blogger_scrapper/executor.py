@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+BACKENDS = ("thread", "process")
+
+
+def create_executor(backend="thread", max_workers=10):
+    """ Function to create the executor used for fetching the feed pages concurrently.
+
+    'thread' - pool of threads, the default, best suited for the network-bound fetching of pages;
+    'process' - pool of processes; every call and its result have to be pickled between the processes.
+
+    :param backend: Name of the execution backend, one of 'thread' or 'process'.
+    :type backend: str
+    :param max_workers: Maximum number of calls running at the same time.
+    :type max_workers: int
+    :return: The executor object, to be used as a context manager.
+    :rtype: concurrent.futures.Executor
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend provided - '{backend}'; available backends are 'thread', 'process'")
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise ValueError(f"Provided 'max_workers' parameter must be a positive integer")
+
+    if backend == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    else:
+        return ProcessPoolExecutor(max_workers=max_workers)
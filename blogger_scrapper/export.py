@@ -1,15 +1,96 @@
 import os
+import re
 import warnings
+from collections.abc import Sequence
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from dicttoxml import dicttoxml
+from lxml import etree
 import sqlite3
 import json
+import urllib3
 
 from blogger_scrapper.mapping import BlogArticleMapping, BlogAuthorMapping, BlogCommentMapping
 from blogger_scrapper.blog import BlogArticle, BlogAuthor, BlogComment
 
 
+def _integer(value):
+    """ Hidden (private) function converting an ID to an integer, if it's numeric (IDs of RSS articles are strings).
+
+    :param value: The ID.
+    :type value: Union[int, str]
+    :return: The ID as an integer, unchanged if it's not numeric.
+    :rtype: Union[int, str]
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _timestamp(date):
+    """ Hidden (private) function converting a date to epoch seconds; dates without timezone information are taken as
+    local time.
+
+    :param date: The date.
+    :type date: datetime
+    :return: Number of seconds since the epoch.
+    :rtype: float
+    """
+    return date.timestamp() if isinstance(date, datetime) else date
+
+
+def _export_file_name(export_type, extension, name=None):
+    """ Hidden (private) function returning the timestamped file name of an export.
+
+    :param export_type: Type of the export, eg. 'json'.
+    :type export_type: str
+    :param extension: Extension of the file.
+    :type extension: str
+    :param name: Optional name put in front of the file name, so that exports made at the same time (eg. of several
+                sites) don't overwrite each other.
+    :type name: str
+    :return: Name of the export file.
+    :rtype: str
+    """
+    prefix = f"{name}-" if name else ""
+    return f"{prefix}{export_type}_export-{datetime.now().strftime('%d%m%Y-%H%M%S')}.{extension}"
+
+
+def site_export_name(site):
+    """ Function returning the name put in front of the export files of the `site` - its host (and port), with the
+    characters that don't belong in a file name replaced.
+
+    :param site: URL of the site, or of one of its feeds.
+    :type site: str
+    :return: Name of the exports of the site.
+    :rtype: str
+    """
+    netloc = urllib3.util.parse_url(site).netloc or site
+    return re.sub(r"[^\w.-]+", "_", netloc)
+
+
+@contextmanager
+def _partial_file(path):
+    """ Hidden (private) context manager handing out a temporary '.part' path to write the export file at `path` to.
+    The file is only moved to its `path` once the block succeeded, so that an export failing halfway (eg. a feed page
+    failing for good while the articles are streamed) doesn't leave a truncated export behind.
+
+    :param path: Path of the export file.
+    :type path: str
+    :return: Temporary path to write the file to.
+    :rtype: str
+    """
+    partial_path = f"{path}.part"
+    try:
+        yield partial_path
+    except BaseException:
+        Path(partial_path).unlink(missing_ok=True)
+        raise
+    os.replace(partial_path, path)
+
+
 class SqlExport:
     articles_table_name = 'articles'
     authors_table_name = 'authors'
@@ -20,13 +101,66 @@ class SqlExport:
                  all_comments_list,
                  articles_mapping=BlogArticleMapping(),
                  authors_mapping=BlogAuthorMapping(),
-                 comments_mapping=BlogCommentMapping()):
+                 comments_mapping=BlogCommentMapping(),
+                 database=None,
+                 batch_size=1000,
+                 typed=False,
+                 full_text=False,
+                 name=None):
+        """ Constructor for the SqlExport object. By default every export creates a new timestamped database in the
+        output/ directory. If a `database` path is provided instead, the export goes into that database, created on
+        the first export and updated in place by the following ones - its tables have primary keys (articles on their
+        ID, comments on theirs, authors on their ID, name and URI, since authors without a Blogger profile all share
+        the ID -1) and rows are upserted, so that re-exporting a blog only writes the rows that actually changed.
+
+        :param all_articles_list: Articles to export; can also be any iterable (eg. the Feed.iter_articles generator),
+                    in which case the articles are inserted in chunks of `batch_size` as they arrive.
+        :type all_articles_list: Iterable[BlogArticle]
+        :param all_authors_list: Authors to export; if None, the authors of the articles and their comments are
+                    inserted along with the articles.
+        :type all_authors_list: list[BlogAuthor]
+        :param all_comments_list: Comments to export; if None, the comments of the articles are inserted along with the
+                    articles.
+        :type all_comments_list: list[BlogComment]
+        :param articles_mapping: Column names of the articles table.
+        :type articles_mapping: BlogArticleMapping
+        :param authors_mapping: Column names of the authors table.
+        :type authors_mapping: BlogAuthorMapping
+        :param comments_mapping: Column names of the comments table.
+        :type comments_mapping: BlogCommentMapping
+        :param database: Optional path of a persistent database to export into.
+        :type database: str
+        :param batch_size: Number of rows (or articles, when streaming them) inserted per statement; with a persistent
+                    `database` or streamed articles, every batch is committed in its own transaction.
+        :type batch_size: int
+        :param typed: Whether to use typed columns - integer IDs and dates as (UTC) epoch seconds, instead of their text
+                    representation - and to index the author and published date columns and the articles-comments link
+                    table, so that date range, per-author and per-article queries don't scan whole tables. Has to stay
+                    the same for all exports into a persistent `database`.
+        :type typed: bool
+        :param full_text: Whether to keep an SQLite FTS5 full-text index of the title and content of the articles and
+                    the content of the comments, kept up to date by triggers in the same transaction as the inserts;
+                    see the 'search' method.
+        :type full_text: bool
+        :param name: Optional name put in front of the name of the timestamped database, when no `database` is provided.
+        :type name: str
+        """
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError(f"Provided 'batch_size' parameter must be a positive integer")
+
         self.all_articles = all_articles_list  # type: list[BlogArticle]
         self.all_authors = all_authors_list  # type: list[BlogAuthor]
         self.all_comments = all_comments_list  # type: list[BlogComment]
         self.articles_map = articles_mapping
         self.authors_map = authors_mapping
         self.comments_map = comments_mapping
+        self.database = database
+        self.batch_size = batch_size
+        self.typed = typed
+        self.full_text = full_text
+        self.name = name
+        self.database_path = database
+        self.changes = {}
 
     def name_articles_table(self, name):
         """ Method provides a way to set a custom name for the 'articles' table. Provided `name` parameter must NOT be
@@ -69,118 +203,481 @@ class SqlExport:
 
     def do_export(self):
         """ The export method for the SqlExport class - generates the output file, related tables and inserts all the
-        collected data.
+        collected data. The number of rows written to each table is saved in the `changes` attribute afterwards.
 
         """
-        output_dir = Path('output')
-        if not Path.exists(output_dir) or not Path.is_dir(output_dir):
-            output_dir = Path(f"output-tmp-{datetime.now().strftime('%d%m%Y-%H%M%S%f')}")
-            warnings.warn(f"Default output/ directory doesn't exist or is not a directory, creating a temporary new "
-                          f"directory called {output_dir.name}")
-            Path.mkdir(output_dir, exist_ok=True)
-        conn = sqlite3.connect(f"{output_dir}/sql_export-{datetime.now().strftime('%d%m%Y-%H%M%S')}.db")
-        articles_table_create_query = (f"CREATE TABLE {self.articles_table_name} ("
-                                       f"{self.articles_map.get_mapping('article_id')} VARCHAR(255),"
-                                       f"{self.articles_map.get_mapping('title')} VARCHAR(255) NOT NULL,"
+        if self.database is None:
+            output_dir = Path('output')
+            if not Path.exists(output_dir) or not Path.is_dir(output_dir):
+                output_dir = Path(f"output-tmp-{datetime.now().strftime('%d%m%Y-%H%M%S%f')}")
+                warnings.warn(f"Default output/ directory doesn't exist or is not a directory, creating a temporary "
+                              f"new directory called {output_dir.name}")
+                Path.mkdir(output_dir, exist_ok=True)
+            self.database_path = f"{output_dir}/{_export_file_name('sql', 'db', self.name)}"
+            with _partial_file(self.database_path) as partial_path:
+                self._export_to(sqlite3.connect(partial_path))
+        else:
+            Path.mkdir(Path(self.database).parent, parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.database)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._export_to(conn)
+
+    def _export_to(self, conn):
+        """ Hidden (private) method creating the tables of the export in the database of the `conn` connection and
+        inserting all the collected data, closing the connection afterwards.
+
+        :param conn: Connection to the database.
+        :type conn: sqlite3.Connection
+        """
+        try:
+            self._create_tables(conn)
+            if self.full_text:
+                self._create_full_text_index(conn)
+            queries = self._insert_queries()
+            if isinstance(self.all_articles, Sequence) and self.all_authors is not None and \
+                    self.all_comments is not None:
+                articles_comments_table_name = f"{self.articles_table_name}_{self.comments_table_name}"
+                self.changes = {
+                    self.articles_table_name: self._insert_rows(conn, queries[self.articles_table_name],
+                                                                map(self._article_row, self.all_articles)),
+                    self.authors_table_name: self._insert_rows(conn, queries[self.authors_table_name],
+                                                               map(self._author_row, self.all_authors)),
+                    self.comments_table_name: self._insert_rows(conn, queries[self.comments_table_name],
+                                                                map(self._comment_row, self.all_comments)),
+                    articles_comments_table_name: self._insert_rows(conn, queries[articles_comments_table_name],
+                                                                    self._article_comment_rows(self.all_articles))
+                }
+            else:
+                self.changes = self._insert_stream(conn, queries)
+            if self.typed:
+                self._create_indexes(conn)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _article_columns(self):
+        return [self.articles_map.get_mapping(attribute) for attribute in
+                ('article_id', 'title', 'content', 'author', 'published_date', 'last_edited_date', 'blog_link',
+                 'feed_link')]
+
+    def _author_columns(self):
+        return [self.authors_map.get_mapping(attribute) for attribute in
+                ('author_id', 'name', 'uri', 'email', 'image_src')]
+
+    def _comment_columns(self):
+        return [self.comments_map.get_mapping(attribute) for attribute in
+                ('comment_id', 'content', 'published_date', 'last_updated_date', 'author')]
+
+    def _create_tables(self, conn):
+        """ Hidden (private) method to create the tables of the export; with a persistent database, they're only created
+        if they don't exist yet, and declare primary keys.
+
+        :param conn: Connection to the database.
+        :type conn: sqlite3.Connection
+        """
+        id_type = "INTEGER" if self.typed else "VARCHAR(255)"
+        text_type = "TEXT" if self.typed else "VARCHAR(255)"
+        date_type = "REAL" if self.typed else "DATETIME"
+        persistent = self.database is not None
+        if_not_exists = "IF NOT EXISTS " if persistent else ""
+        articles_key = (f", PRIMARY KEY ({self.articles_map.get_mapping('article_id')})" if persistent else "")
+        authors_key = (f", PRIMARY KEY ({self.authors_map.get_mapping('author_id')}, "
+                       f"{self.authors_map.get_mapping('name')}, {self.authors_map.get_mapping('uri')})"
+                       if persistent else "")
+        comments_key = (f", PRIMARY KEY ({self.comments_map.get_mapping('comment_id')})" if persistent else "")
+        articles_comments_key = (f", PRIMARY KEY ({self.articles_map.get_mapping('article_id')}, "
+                                 f"{self.comments_map.get_mapping('comment_id')})" if persistent else "")
+        articles_table_create_query = (f"CREATE TABLE {if_not_exists}{self.articles_table_name} ("
+                                       f"{self.articles_map.get_mapping('article_id')} {id_type},"
+                                       f"{self.articles_map.get_mapping('title')} {text_type} NOT NULL,"
                                        f"{self.articles_map.get_mapping('content')} TEXT NOT NULL,"
-                                       f"{self.articles_map.get_mapping('author')} VARCHAR(255) NOT NULL,"
-                                       f"{self.articles_map.get_mapping('published_date')} DATETIME NOT NULL,"
-                                       f"{self.articles_map.get_mapping('last_edited_date')} DATETIME NOT NULL,"
-                                       f"{self.articles_map.get_mapping('blog_link')} VARCHAR(255),"
-                                       f"{self.articles_map.get_mapping('feed_link')} VARCHAR(255)"
-                                       f");")
-        authors_table_create_query = (f"CREATE TABLE {self.authors_table_name} ("
-                                      f"{self.authors_map.get_mapping('author_id')} VARCHAR(255),"
-                                      f"{self.authors_map.get_mapping('name')} VARCHAR(255) NOT NULL,"
-                                      f"{self.authors_map.get_mapping('uri')} VARCHAR(255),"
-                                      f"{self.authors_map.get_mapping('email')} VARCHAR(255),"
-                                      f"{self.authors_map.get_mapping('image_src')} VARCHAR(255)"
-                                      f");")
-        comments_table_create_query = (f"CREATE TABLE {self.comments_table_name} ("
-                                       f"{self.comments_map.get_mapping('comment_id')} VARCHAR(255),"
+                                       f"{self.articles_map.get_mapping('author')} {id_type} NOT NULL,"
+                                       f"{self.articles_map.get_mapping('published_date')} {date_type} NOT NULL,"
+                                       f"{self.articles_map.get_mapping('last_edited_date')} {date_type} NOT NULL,"
+                                       f"{self.articles_map.get_mapping('blog_link')} {text_type},"
+                                       f"{self.articles_map.get_mapping('feed_link')} {text_type}"
+                                       f"{articles_key});")
+        authors_table_create_query = (f"CREATE TABLE {if_not_exists}{self.authors_table_name} ("
+                                      f"{self.authors_map.get_mapping('author_id')} {id_type},"
+                                      f"{self.authors_map.get_mapping('name')} {text_type} NOT NULL,"
+                                      f"{self.authors_map.get_mapping('uri')} {text_type},"
+                                      f"{self.authors_map.get_mapping('email')} {text_type},"
+                                      f"{self.authors_map.get_mapping('image_src')} {text_type}"
+                                      f"{authors_key});")
+        comments_table_create_query = (f"CREATE TABLE {if_not_exists}{self.comments_table_name} ("
+                                       f"{self.comments_map.get_mapping('comment_id')} {id_type},"
                                        f"{self.comments_map.get_mapping('content')} TEXT NOT NULL,"
-                                       f"{self.comments_map.get_mapping('published_date')} DATETIME NOT NULL,"
-                                       f"{self.comments_map.get_mapping('last_updated_date')} DATETIME NOT NULL,"
+                                       f"{self.comments_map.get_mapping('published_date')} {date_type} NOT NULL,"
+                                       f"{self.comments_map.get_mapping('last_updated_date')} {date_type} NOT NULL,"
                                        f"{self.comments_map.get_mapping('author')} integer NOT NULL"
-                                       f");")
-        articles_comments_table_create_query = (f"CREATE TABLE {self.articles_table_name}_{self.comments_table_name} ("
+                                       f"{comments_key});")
+        articles_comments_table_create_query = (f"CREATE TABLE {if_not_exists}"
+                                                f"{self.articles_table_name}_{self.comments_table_name} ("
                                                 f"{self.articles_map.get_mapping('article_id')} integer NOT NULL,"
                                                 f"{self.comments_map.get_mapping('comment_id')} integer NOT NULL"
-                                                f");")
+                                                f"{articles_comments_key});")
         cursor = conn.cursor()
         cursor.execute(articles_table_create_query)
         cursor.execute(authors_table_create_query)
         cursor.execute(comments_table_create_query)
         cursor.execute(articles_comments_table_create_query)
+        conn.commit()
 
-        # Generate articles insert query
-        articles_for_insertion = []
-        for article in self.all_articles:
-            article_data = (
-                f"{article.article_id}",
-                f"{article.title}",
-                f"{article.content}",
-                f"{article.author.author_id}",
-                f"{article.published_date}",
-                f"{article.last_edited_date}",
-                f"{article.blog_link}",
-                f"{article.feed_link}"
-            )
-            articles_for_insertion.append(article_data)
-        cursor.executemany(f"INSERT INTO {self.articles_table_name} VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                           articles_for_insertion)
-
-        # Generate authors insert query:
-        authors_for_insertion = []
-        for author in self.all_authors:
-            author_data = (
-                f"{author.author_id}",
-                f"{author.name}",
-                f"{author.uri}",
-                f"{author.email}",
-                f"{author.image_src}"
+    def _create_indexes(self, conn):
+        """ Hidden (private) method to index the author and published date columns of the articles and comments, and
+        both sides of the articles-comments link table. Indexes are created once the rows are inserted, which is faster
+        than keeping them up to date along the way.
+
+        :param conn: Connection to the database.
+        :type conn: sqlite3.Connection
+        """
+        articles_comments_table_name = f"{self.articles_table_name}_{self.comments_table_name}"
+        indexes = [
+            (self.articles_table_name, self.articles_map.get_mapping('author')),
+            (self.articles_table_name, self.articles_map.get_mapping('published_date')),
+            (self.comments_table_name, self.comments_map.get_mapping('author')),
+            (self.comments_table_name, self.comments_map.get_mapping('published_date')),
+            (articles_comments_table_name, self.articles_map.get_mapping('article_id')),
+            (articles_comments_table_name, self.comments_map.get_mapping('comment_id'))
+        ]
+        for table_name, column in indexes:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {table_name}_{column}_index ON {table_name} ({column})")
+
+    def _full_text_tables(self):
+        """ Hidden (private) method returning the tables indexed for full-text search, along with their full-text
+        index table and indexed columns.
+
+        :return: List of tuples of the table name, the full-text table name and the indexed columns.
+        :rtype: list[tuple[str, str, list[str]]]
+        """
+        return [
+            (self.articles_table_name, f"{self.articles_table_name}_fts",
+             [self.articles_map.get_mapping('title'), self.articles_map.get_mapping('content')]),
+            (self.comments_table_name, f"{self.comments_table_name}_fts", [self.comments_map.get_mapping('content')])
+        ]
+
+    def _create_full_text_index(self, conn):
+        """ Hidden (private) method to create the FTS5 full-text index tables of the articles and comments. The index
+        tables don't hold a copy of the text, they read it from the indexed tables ('external content' tables), and
+        triggers on the indexed tables keep them up to date - only rows actually inserted, updated or deleted are
+        re-indexed, in the same transaction. If the index is added to a persistent database already holding rows, it's
+        built from them.
+
+        :param conn: Connection to the database.
+        :type conn: sqlite3.Connection
+        """
+        for table_name, fts_table_name, columns in self._full_text_tables():
+            exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                  (fts_table_name,)).fetchone()
+            if exists:
+                continue
+            new_values = ", ".join(f"new.{column}" for column in columns)
+            old_values = ", ".join(f"old.{column}" for column in columns)
+            delete = (f"INSERT INTO {fts_table_name} ({fts_table_name}, rowid, {', '.join(columns)}) "
+                      f"VALUES ('delete', old.rowid, {old_values});")
+            insert = f"INSERT INTO {fts_table_name} (rowid, {', '.join(columns)}) VALUES (new.rowid, {new_values});"
+            try:
+                conn.execute(f"CREATE VIRTUAL TABLE {fts_table_name} USING fts5({', '.join(columns)}, "
+                             f"content='{table_name}', content_rowid='rowid')")
+            except sqlite3.OperationalError as e:
+                raise RuntimeError(f"Failed to create the full-text index, the SQLite library in use might not support "
+                                   f"FTS5 - {e}")
+            conn.execute(f"CREATE TRIGGER {fts_table_name}_insert AFTER INSERT ON {table_name} BEGIN {insert} END")
+            conn.execute(f"CREATE TRIGGER {fts_table_name}_delete AFTER DELETE ON {table_name} BEGIN {delete} END")
+            conn.execute(f"CREATE TRIGGER {fts_table_name}_update AFTER UPDATE ON {table_name} BEGIN {delete} {insert} "
+                         f"END")
+            conn.execute(f"INSERT INTO {fts_table_name} ({fts_table_name}) VALUES ('rebuild')")
+        conn.commit()
+
+    def search(self, query, target="articles", limit=20):
+        """ Method to search the full-text index of the export, the database has to be exported with the `full_text`
+        option first. Results are ordered by relevance (bm25), with a snippet of the matching text. The `query` uses
+        the FTS5 query syntax - words are all required by default, "double quotes" match a phrase, OR / NOT combine
+        terms, a trailing * matches a prefix, and a column can be targeted with eg. 'title: foobar'.
+
+        :param query: FTS5 query to search for.
+        :type query: str
+        :param target: What to search - 'articles' or 'comments'.
+        :type target: str
+        :param limit: Maximum number of results.
+        :type limit: int
+        :return: List of dictionaries with the 'id', 'title' (articles only) and 'snippet' of every result.
+        :rtype: list[dict]
+        """
+        if target not in ['articles', 'comments']:
+            raise ValueError(f"Provided 'target' parameter value must match one of - articles, comments")
+        if self.database_path is None or not Path(self.database_path).is_file():
+            raise RuntimeError(f"No exported database to search, call 'do_export' first")
+
+        articles_search, comments_search = self._full_text_tables()
+        table_name, fts_table_name, _columns = articles_search if target == "articles" else comments_search
+        if target == "articles":
+            selected = (f"{table_name}.{self.articles_map.get_mapping('article_id')}, "
+                        f"{table_name}.{self.articles_map.get_mapping('title')}")
+        else:
+            selected = f"{table_name}.{self.comments_map.get_mapping('comment_id')}"
+        conn = sqlite3.connect(self.database_path)
+        try:
+            rows = conn.execute(f"SELECT {selected}, snippet({fts_table_name}, -1, '[', ']', '...', 16) "
+                                f"FROM {fts_table_name} JOIN {table_name} ON "
+                                f"{table_name}.rowid = {fts_table_name}.rowid "
+                                f"WHERE {fts_table_name} MATCH ? ORDER BY rank LIMIT ?", (query, limit)).fetchall()
+        except sqlite3.OperationalError as e:
+            raise RuntimeError(f"Failed to search the full-text index of '{self.database_path}' - {e}")
+        finally:
+            conn.close()
+        if target == "articles":
+            return [{'id': row[0], 'title': row[1], 'snippet': row[2]} for row in rows]
+        return [{'id': row[0], 'snippet': row[1]} for row in rows]
+
+    def _insert_queries(self):
+        """ Hidden (private) method building the insert query of every table. With a persistent database, rows are
+        upserted instead - a row whose key already exists is only updated if any of its values changed.
+
+        :return: Dictionary of the insert queries, keyed by the table names.
+        :rtype: dict[str, str]
+        """
+        articles_comments_table_name = f"{self.articles_table_name}_{self.comments_table_name}"
+        tables = [
+            (self.articles_table_name, self._article_columns(), 1),
+            (self.authors_table_name, self._author_columns(), 3),
+            (self.comments_table_name, self._comment_columns(), 1),
+            (articles_comments_table_name, [self.articles_map.get_mapping('article_id'),
+                                            self.comments_map.get_mapping('comment_id')], 2)
+        ]
+        queries = {}
+        for table_name, columns, key_length in tables:
+            query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+            if self.database is not None:
+                keys = columns[:key_length]
+                values = columns[key_length:]
+                if values:
+                    query += (f" ON CONFLICT ({', '.join(keys)}) DO UPDATE SET "
+                              f"{', '.join(f'{column} = excluded.{column}' for column in values)} WHERE "
+                              f"{' OR '.join(f'{column} IS NOT excluded.{column}' for column in values)}")
+                else:
+                    query += " ON CONFLICT DO NOTHING"
+            queries[table_name] = query
+        return queries
+
+    def _insert_rows(self, conn, query, rows):
+        """ Hidden (private) method inserting the `rows` with the `query`, in batches of `batch_size` rows; with a
+        persistent database, every batch is committed on its own.
+
+        :param conn: Connection to the database.
+        :type conn: sqlite3.Connection
+        :param query: Insert query of the table.
+        :type query: str
+        :param rows: Rows to insert.
+        :type rows: Iterable[tuple]
+        :return: Number of rows inserted or updated.
+        :rtype: int
+        """
+        changes = 0
+        rows = iter(rows)
+        batch = list(islice(rows, self.batch_size))
+        while batch:
+            changes += self._execute(conn, query, batch)
+            if self.database is not None:
+                conn.commit()
+            batch = list(islice(rows, self.batch_size))
+        return changes
+
+    def _insert_stream(self, conn, queries):
+        """ Hidden (private) method inserting the articles in chunks of `batch_size` articles as they're taken from the
+        articles iterable (eg. the Feed.iter_articles generator), along with their comments and the link between them,
+        committing every chunk so that the database fills in while the articles are still being fetched. If no authors
+        (or comments) have been provided, the ones of the articles are inserted along the way, otherwise the provided
+        ones are inserted after all articles.
+
+        :param conn: Connection to the database.
+        :type conn: sqlite3.Connection
+        :param queries: Insert queries of the tables, keyed by the table names.
+        :type queries: dict[str, str]
+        :return: Number of rows inserted or updated per table.
+        :rtype: dict[str, int]
+        """
+        articles_comments_table_name = f"{self.articles_table_name}_{self.comments_table_name}"
+        changes = dict.fromkeys(queries, 0)
+        seen_authors = set()
+        articles = iter(self.all_articles)
+        chunk = list(islice(articles, self.batch_size))
+        while chunk:
+            rows = {table_name: [] for table_name in queries}
+            for article in chunk:
+                rows[self.articles_table_name].append(self._article_row(article))
+                chunk_authors = [article.author]
+                for comment in article.comments:
+                    chunk_authors.append(comment.author)
+                    if self.all_comments is None:
+                        rows[self.comments_table_name].append(self._comment_row(comment))
+                    rows[articles_comments_table_name].append(self._article_comment_row(article, comment))
+                if self.all_authors is None:
+                    for author in chunk_authors:
+                        if author not in seen_authors:
+                            seen_authors.add(author)
+                            rows[self.authors_table_name].append(self._author_row(author))
+            for table_name, table_rows in rows.items():
+                changes[table_name] += self._execute(conn, queries[table_name], table_rows)
+            conn.commit()
+            chunk = list(islice(articles, self.batch_size))
+
+        if self.all_authors is not None:
+            changes[self.authors_table_name] += self._insert_rows(conn, queries[self.authors_table_name],
+                                                                  map(self._author_row, self.all_authors))
+        if self.all_comments is not None:
+            changes[self.comments_table_name] += self._insert_rows(conn, queries[self.comments_table_name],
+                                                                   map(self._comment_row, self.all_comments))
+        return changes
+
+    @staticmethod
+    def _execute(conn, query, rows):
+        # Rows written by triggers (eg. the full-text index ones) are not included in the row count
+        return max(conn.executemany(query, rows).rowcount, 0)
+
+    def _article_row(self, article):
+        if self.typed:
+            return (
+                _integer(article.article_id),
+                article.title,
+                article.content,
+                _integer(article.author.author_id),
+                _timestamp(article.published_date),
+                _timestamp(article.last_edited_date),
+                article.blog_link,
+                article.feed_link
             )
-            authors_for_insertion.append(author_data)
-        cursor.executemany(f"INSERT INTO {self.authors_table_name} VALUES (?, ?, ?, ?, ?)", authors_for_insertion)
-
-        # Generate comments insert query:
-        comments_for_insertion = []
-        for comment in self.all_comments:
-            comment_data = (
-                f"{comment.comment_id}",
-                f"{comment.content}",
-                f"{comment.published_date}",
-                f"{comment.last_updated_date}",
-                f"{comment.author.author_id}"
+        return (
+            f"{article.article_id}",
+            f"{article.title}",
+            f"{article.content}",
+            f"{article.author.author_id}",
+            f"{article.published_date}",
+            f"{article.last_edited_date}",
+            f"{article.blog_link}",
+            f"{article.feed_link}"
+        )
+
+    def _author_row(self, author):
+        if self.typed:
+            return _integer(author.author_id), author.name, author.uri, author.email, author.image_src
+        return (
+            f"{author.author_id}",
+            f"{author.name}",
+            f"{author.uri}",
+            f"{author.email}",
+            f"{author.image_src}"
+        )
+
+    def _comment_row(self, comment):
+        if self.typed:
+            return (
+                _integer(comment.comment_id),
+                comment.content,
+                _timestamp(comment.published_date),
+                _timestamp(comment.last_updated_date),
+                _integer(comment.author.author_id)
             )
-            comments_for_insertion.append(comment_data)
-        cursor.executemany(f"INSERT INTO {self.comments_table_name} VALUES (?, ?, ?, ?, ?)", comments_for_insertion)
+        return (
+            f"{comment.comment_id}",
+            f"{comment.content}",
+            f"{comment.published_date}",
+            f"{comment.last_updated_date}",
+            f"{comment.author.author_id}"
+        )
+
+    def _article_comment_row(self, article, comment):
+        if self.typed:
+            return _integer(article.article_id), _integer(comment.comment_id)
+        return (
+            f"{article.article_id}",
+            f"{comment.comment_id}"
+        )
 
-        # Generate articles-comments relationship
-        arts_comms_for_insertion = []
-        for article in self.all_articles:
+    def _article_comment_rows(self, articles_list):
+        for article in articles_list:
             if len(article.comments) > 0:
                 for comment in article.comments:
-                    arts_comms_data = (
-                        f"{article.article_id}",
-                        f"{comment.comment_id}"
-                    )
-                    arts_comms_for_insertion.append(arts_comms_data)
-        cursor.executemany(f"INSERT INTO {self.articles_table_name}_{self.comments_table_name} VALUES "
-                           f"(?, ?)", arts_comms_for_insertion)
-        conn.commit()
+                    yield self._article_comment_row(article, comment)
+
+
+_XML_INVALID_CHARACTERS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
 
 
 class FileExport:
 
-    def __init__(self, articles, authors, comments, export_type="json", encoding="UTF-8"):
+    def __init__(self, articles, authors, comments, export_type="json", encoding="UTF-8", name=None):
+        """ Constructor for the FileExport object. For the 'ndjson' export type, `articles` can be any iterable (eg. the
+        Feed.iter_articles generator) - it's consumed once, writing every article as soon as it arrives - and the
+        `authors` and `comments` can be None, in which case they're taken from the articles.
+
+        :param articles: Articles to export.
+        :type articles: Iterable[BlogArticle]
+        :param authors: Authors to export.
+        :type authors: list[BlogAuthor]
+        :param comments: Comments to export.
+        :type comments: list[BlogComment]
+        :param export_type: Format of the export - 'json', 'xml' or 'ndjson' (JSON Lines, one record per line).
+        :type export_type: str
+        :param encoding: Encoding of the output file.
+        :type encoding: str
+        :param name: Optional name put in front of the name of the timestamped output file.
+        :type name: str
+        """
         self.all_articles = articles  # type: list[BlogArticle]
         self.all_authors = authors  # type: list[BlogAuthor]
         self.all_comments = comments  # type: list[BlogComment]
-        if export_type not in ['xml', 'json']:
-            raise ValueError(f"Provided export_type parameter doesn't match one of the expected values - json or xml")
+        if export_type not in ['xml', 'json', 'ndjson']:
+            raise ValueError(f"Provided export_type parameter doesn't match one of the expected values - json, xml or "
+                             f"ndjson")
         self.export_type = export_type
         self.encoding = encoding
+        self.name = name
+
+    @staticmethod
+    def _article_data(article):
+        return {
+            'id': article.article_id,
+            'title': article.title,
+            'content': article.content,
+            'author': f"{article.author.author_id}-{article.author.name}",
+            'published_date': article.published_date.isoformat(),
+            'last_edited_date': article.last_edited_date.isoformat(),
+            'blog_link': article.blog_link,
+            'feed_link': article.feed_link,
+            'comments': {}
+        }
+
+    def _article_with_comments_data(self, article):
+        article_data = self._article_data(article)
+        comments = article_data['comments']
+        c = 0
+        for comment in article.comments:
+            c += 1
+            comments[f"comment-{c}"] = self._comment_data(comment)
+        return article_data
+
+    @staticmethod
+    def _author_data(author):
+        return {
+            'id': author.author_id,
+            'uri': author.uri,
+            'name': author.name,
+            'email': author.email,
+            'image_src': author.image_src
+        }
+
+    @staticmethod
+    def _comment_data(comment):
+        return {
+            'id': comment.comment_id,
+            'content': comment.content,
+            'published_date': comment.published_date.isoformat(),
+            'last_edited_date': comment.last_updated_date.isoformat(),
+            'author': f"{comment.author.author_id}-{comment.author.name}",
+            'article_ref': comment.article_backref
+        }
 
     def do_export(self, export_of="all"):
         """ The export method for the FileExport class - generates the output file and write all the collected data.
@@ -200,6 +697,13 @@ class FileExport:
                           f"directory called {output_dir.name}")
             Path.mkdir(output_dir, exist_ok=True)
 
+        if self.export_type == 'ndjson':
+            self._export_ndjson(output_dir, export_of)
+            return
+        elif self.export_type == 'xml':
+            self._export_xml(output_dir, export_of)
+            return
+
         if export_of == "all":
             data_dict = {
                 'articles': {},
@@ -210,125 +714,164 @@ class FileExport:
             for article in self.all_articles:
                 articles = data_dict.get('articles')
                 i += 1
-                articles[f"article-{i}"] = {
-                    'id': article.article_id,
-                    'title': article.title,
-                    'content': article.content,
-                    'author': f"{article.author.author_id}-{article.author.name}",
-                    'published_date': article.published_date.isoformat(),
-                    'last_edited_date': article.last_edited_date.isoformat(),
-                    'blog_link': article.blog_link,
-                    'feed_link': article.feed_link,
-                    'comments': {}
-                }
-                if len(article.comments) > 0:
-                    comments = data_dict.get('articles').get(f'article-{i}').get('comments')
-                    c = 0
-                    for comment in article.comments:
-                        c += 1
-                        comments[f"comment-{c}"] = {
-                            'id': comment.comment_id,
-                            'content': comment.content,
-                            'published_date': comment.published_date.isoformat(),
-                            'last_edited_date': comment.last_updated_date.isoformat(),
-                            'author': f"{comment.author.author_id}-{comment.author.name}",
-                            'article_ref': comment.article_backref
-                        }
+                articles[f"article-{i}"] = self._article_with_comments_data(article)
 
             i = 0
             for author in self.all_authors:
                 authors = data_dict.get('authors')
                 i += 1
-                authors[f"author-{i}"] = {
-                    'id': author.author_id,
-                    'uri': author.uri,
-                    'name': author.name,
-                    'email': author.email,
-                    'image_src': author.image_src
-                }
+                authors[f"author-{i}"] = self._author_data(author)
 
             i = 0
             for comment in self.all_comments:
                 comments = data_dict.get('comments')
                 i += 1
-                comments[f"comment-{i}"] = {
-                    'id': comment.comment_id,
-                    'content': comment.content,
-                    'published_date': comment.published_date.isoformat(),
-                    'last_edited_date': comment.last_updated_date.isoformat(),
-                    'author': f"{comment.author.author_id}-{comment.author.name}",
-                    'article_ref': comment.article_backref
-                }
+                comments[f"comment-{i}"] = self._comment_data(comment)
 
         elif export_of == "articles":
             data_dict = {}
             i = 0
             for article in self.all_articles:
                 i += 1
-                data_dict[f"article-{i}"] = {
-                    'id': article.article_id,
-                    'title': article.title,
-                    'content': article.content,
-                    'author': f"{article.author.author_id}-{article.author.name}",
-                    'published_date': article.published_date.isoformat(),
-                    'last_edited_date': article.last_edited_date.isoformat(),
-                    'blog_link': article.blog_link,
-                    'feed_link': article.feed_link,
-                    'comments': {}
-                }
+                data_dict[f"article-{i}"] = self._article_data(article)
                 if len(article.comments) > 0:
                     comments = data_dict.get('articles').get(f'{article}-{i}').get('comments')
                     c = 0
                     for comment in article.comments:
                         c += 1
-                        comments[f"comment-{c}"] = {
-                            'id': comment.comment_id,
-                            'content': comment.content,
-                            'published_date': comment.published_date.isoformat(),
-                            'last_edited_date': comment.last_updated_date.isoformat(),
-                            'author': f"{comment.author.author_id}-{comment.author.name}",
-                            'article_ref': comment.article_backref
-                        }
+                        comments[f"comment-{c}"] = self._comment_data(comment)
 
         elif export_of == "authors":
             data_dict = {}
             i = 0
             for author in self.all_authors:
                 i += 1
-                data_dict[f"author-{i}"] = {
-                    'id': author.author_id,
-                    'uri': author.uri,
-                    'name': author.name,
-                    'email': author.email,
-                    'image_src': author.image_src
-                }
+                data_dict[f"author-{i}"] = self._author_data(author)
 
         else:
             data_dict = {}
             i = 0
             for comment in self.all_comments:
                 i += 1
-                data_dict[f"comment-{i}"] = {
-                    'id': comment.comment_id,
-                    'content': comment.content,
-                    'published_date': comment.published_date.isoformat(),
-                    'last_edited_date': comment.last_updated_date.isoformat(),
-                    'author': f"{comment.author.author_id}-{comment.author.name}",
-                    'article_ref': comment.article_backref
-                }
+                data_dict[f"comment-{i}"] = self._comment_data(comment)
+
+        with _partial_file(f"{output_dir}/{_export_file_name('json', 'json', self.name)}") as partial_path, \
+                open(partial_path, "w+", encoding=self.encoding) as f:
+            f.write(json.dumps(data_dict, indent=4, ensure_ascii=False))
 
-        if self.export_type == 'json':
-            with open(f"{output_dir}/json_export-{datetime.now().strftime('%d%m%Y-%H%M%S')}.json", "w+",
-                      encoding=self.encoding) as f:
-                f.write(json.dumps(data_dict, indent=4, ensure_ascii=False))
+    def _export_ndjson(self, output_dir, export_of):
+        """ Hidden (private) method writing the export as JSON Lines - one record per line, each one written as soon as
+        its article arrives, so that memory stays flat however big the blog is. Every record has a 'type' key
+        ('article', 'author' or 'comment'); the comments of an article are nested in its record as a list. Authors are
+        written after all articles; if none have been provided, the distinct authors of the articles and their
+        comments are collected along the way.
+
+        :param output_dir: Directory to write the export file in.
+        :type output_dir: Path
+        :param export_of: Scope of the export - 'all', 'authors' or 'comments'.
+        :type export_of: str
+        """
+        with _partial_file(f"{output_dir}/{_export_file_name('ndjson', 'ndjson', self.name)}") as partial_path, \
+                open(partial_path, "w", encoding=self.encoding) as f:
+            def write(record_type, data):
+                f.write(json.dumps({'type': record_type, **data}, ensure_ascii=False))
+                f.write("\n")
+
+            if export_of == "all":
+                seen_authors = {}
+                for article in self.all_articles:
+                    article_data = self._article_data(article)
+                    article_data['comments'] = [self._comment_data(comment) for comment in article.comments]
+                    write('article', article_data)
+                    if self.all_authors is None:
+                        seen_authors.setdefault(article.author)
+                        for comment in article.comments:
+                            seen_authors.setdefault(comment.author)
+                for author in self.all_authors if self.all_authors is not None else seen_authors:
+                    write('author', self._author_data(author))
+            elif export_of == "authors":
+                if self.all_authors is not None:
+                    authors = self.all_authors
+                else:
+                    authors = dict.fromkeys(author for article in self.all_articles
+                                            for author in [article.author, *(c.author for c in article.comments)])
+                for author in authors:
+                    write('author', self._author_data(author))
+            else:
+                if self.all_comments is not None:
+                    comments = self.all_comments
+                else:
+                    comments = (comment for article in self.all_articles for comment in article.comments)
+                for comment in comments:
+                    write('comment', self._comment_data(comment))
+
+    def _export_xml(self, output_dir, export_of):
+        """ Hidden (private) method writing the export as XML, in the same layout the JSON data would be converted to by
+        dicttoxml - a <root> element holding an <export> one, an element per key with its 'type' ('dict', 'list',
+        'str', 'int', 'float', 'bool' or 'null') as an attribute. Elements are streamed to the file one article, author
+        or comment at a time, so memory stays bounded whatever the size of the export. Characters not allowed in XML
+        are dropped.
+
+        :param output_dir: Directory to write the export file in.
+        :type output_dir: Path
+        :param export_of: Scope of the export - 'all', 'authors' or 'comments'.
+        :type export_of: str
+        """
+        with _partial_file(f"{output_dir}/{_export_file_name('xml', 'xml', self.name)}") as partial_path, \
+                open(partial_path, "wb") as f:
+            f.write(b'<?xml version="1.0" encoding="UTF-8" ?>')
+            with etree.xmlfile(f, encoding="UTF-8") as xf:
+                with xf.element("root"), xf.element("export", type="dict"):
+                    if export_of == "all":
+                        with xf.element("articles", type="dict"):
+                            i = 0
+                            for article in self.all_articles:
+                                i += 1
+                                xf.write(self._xml_element(f"article-{i}", self._article_with_comments_data(article)))
+                        with xf.element("authors", type="dict"):
+                            for i, author in enumerate(self.all_authors, start=1):
+                                xf.write(self._xml_element(f"author-{i}", self._author_data(author)))
+                        with xf.element("comments", type="dict"):
+                            for i, comment in enumerate(self.all_comments, start=1):
+                                xf.write(self._xml_element(f"comment-{i}", self._comment_data(comment)))
+                    elif export_of == "authors":
+                        for i, author in enumerate(self.all_authors, start=1):
+                            xf.write(self._xml_element(f"author-{i}", self._author_data(author)))
+                    else:
+                        for i, comment in enumerate(self.all_comments, start=1):
+                            xf.write(self._xml_element(f"comment-{i}", self._comment_data(comment)))
+
+    @classmethod
+    def _xml_element(cls, name, value, parent=None):
+        """ Hidden (private) method building the XML element of the `value`, the way dicttoxml would.
+
+        :param name: Tag of the element.
+        :type name: str
+        :param value: Value of the element - a dictionary, list or a JSON scalar.
+        :type value: Union[dict, list, str, int, float, bool, None]
+        :param parent: Optional element to add the element to.
+        :type parent: lxml.etree._Element
+        :return: The element.
+        :rtype: lxml.etree._Element
+        """
+        element = etree.Element(name) if parent is None else etree.SubElement(parent, name)
+        if isinstance(value, dict):
+            element.set("type", "dict")
+            for key, item in value.items():
+                cls._xml_element(key, item, element)
+        elif isinstance(value, list):
+            element.set("type", "list")
+            for item in value:
+                cls._xml_element("item", item, element)
+        elif value is None:
+            element.set("type", "null")
+        elif isinstance(value, bool):
+            element.set("type", "bool")
+            element.text = "true" if value else "false"
+        elif isinstance(value, (int, float)):
+            element.set("type", type(value).__name__)
+            element.text = str(value)
         else:
-            tmp_file = f"{output_dir}/.tmp-{datetime.now().strftime('%d%m%Y-%H%M%S')}.json"
-            with open(tmp_file, "w+", encoding=self.encoding) as f:
-                f.write(json.dumps(data_dict, indent=4, ensure_ascii=False))
-            with open(tmp_file, "r+") as f:
-                data = json.load(f)
-            os.remove(tmp_file)
-            xml_dom = {"export": data}
-            xml_data = dicttoxml(xml_dom)
-            with open(f"{output_dir}/xml_export-{datetime.now().strftime('%d%m%Y-%H%M%S')}.xml", "wb") as f:
-                f.write(xml_data)
+            element.set("type", "str")
+            element.text = _XML_INVALID_CHARACTERS.sub("", str(value))
+        return element
@@ -0,0 +1,193 @@
+from bisect import bisect_left
+
+from blogger_scrapper import blog
+
+
+def _date_key(date):
+    """ Hidden (private) function turning a date into the sort key of the date index; timestamps let dates with and
+    without a timezone (eg. the fallback dates of RSS articles) be compared with one another.
+
+    :param date: The date.
+    :type date: datetime
+    :return: POSIX timestamp of the date.
+    :rtype: float
+    """
+    return date.timestamp()
+
+
+class ArticleIndex:
+
+    def __init__(self, articles_list=None):
+        """ Constructor for the ArticleIndex object - an in-memory index of scrapped articles and their comments,
+        offering lookups by ID, the articles and comments of an author and the articles published within a date range
+        without scanning all of them. It's filled incrementally, the Feed adds every page of articles as it's fetched.
+
+        The index is not thread-safe on its own, the callers adding content from several threads have to serialize the
+        calls (the Feed does so with its lock).
+
+        :param articles_list: Optional articles to index right away.
+        :type articles_list: list[BlogRSSArticle, BlogAtomArticle]
+        """
+        self._articles = {}  # type: dict
+        self._comments = {}  # type: dict
+        self._authors = {}  # type: dict
+        self._articles_by_author = {}  # type: dict[object, list]
+        self._comments_by_author = {}  # type: dict[object, list]
+        # Pages come in newest first, so the date index is only sorted when it's queried
+        self._dates = []  # type: list[tuple[float, int, BlogArticle]]
+        self._date_keys = []  # type: list[float]
+        self._dates_sorted = True
+        if articles_list is not None:
+            self.add_articles(articles_list)
+
+    @staticmethod
+    def _key(item, item_id):
+        # Same identity as the one of the data objects, IDs unless they're unknown (-1)
+        return item_id if item_id != -1 else item
+
+    def _author_key(self, author):
+        key = blog.AuthorRegistry.key(author.author_id, author.name, author.uri)
+        self._authors.setdefault(key, author)
+        return key
+
+    def add_articles(self, articles_list):
+        """ Method to add the articles in the `articles_list` to the index, along with their comments if they're already
+        loaded. Articles already in the index are skipped.
+
+        :param articles_list: The articles to index.
+        :type articles_list: list[BlogRSSArticle, BlogAtomArticle]
+        :return: Nothing
+        :rtype: None
+        """
+        for article in articles_list:
+            key = self._key(article, article.article_id)
+            if key in self._articles:
+                continue
+            self._articles[key] = article
+            self._articles_by_author.setdefault(self._author_key(article.author), []).append(article)
+            self._dates.append((_date_key(article.published_date), len(self._dates), article))
+            self._dates_sorted = False
+            if not isinstance(article.comments, blog.LazyComments) or article.comments.loaded:
+                self.add_comments(article.comments)
+        return
+
+    def add_comments(self, comments_list):
+        """ Method to add the comments in the `comments_list` to the index; comments of articles that aren't in the
+        index and comments already in it are skipped.
+
+        :param comments_list: The comments to index.
+        :type comments_list: list[BlogComment]
+        :return: Nothing
+        :rtype: None
+        """
+        for comment in comments_list:
+            key = self._key(comment, comment.comment_id)
+            if key in self._comments or comment.article_backref not in self._articles:
+                continue
+            self._comments[key] = comment
+            self._comments_by_author.setdefault(self._author_key(comment.author), []).append(comment)
+        return
+
+    def article(self, article_id):
+        """ Method to look up an article by its ID.
+
+        :param article_id: ID of the article.
+        :type article_id: int
+        :return: The article, None if it's not in the index.
+        :rtype: Union[BlogRSSArticle, BlogAtomArticle]
+        """
+        return self._articles.get(article_id)
+
+    def comment(self, comment_id):
+        """ Method to look up a comment by its ID.
+
+        :param comment_id: ID of the comment.
+        :type comment_id: int
+        :return: The comment, None if it's not in the index.
+        :rtype: BlogComment
+        """
+        return self._comments.get(comment_id)
+
+    def articles_by(self, author):
+        """ Method to return the articles written by the `author`, in the order they've been indexed in.
+
+        :param author: The author.
+        :type author: BlogAuthor
+        :return: List of the articles of the author.
+        :rtype: list[BlogRSSArticle, BlogAtomArticle]
+        """
+        return list(self._articles_by_author.get(blog.AuthorRegistry.key(author.author_id, author.name, author.uri),
+                                                 ()))
+
+    def comments_by(self, author):
+        """ Method to return the comments posted by the `author`, in the order they've been indexed in.
+
+        :param author: The author.
+        :type author: BlogAuthor
+        :return: List of the comments of the author.
+        :rtype: list[BlogComment]
+        """
+        return list(self._comments_by_author.get(blog.AuthorRegistry.key(author.author_id, author.name, author.uri),
+                                                 ()))
+
+    def published_between(self, start=None, end=None):
+        """ Method to return the articles published from the `start` date (included) until the `end` date (excluded),
+        oldest first, via a binary search of the date index.
+
+        :param start: Optional start of the range; if none is provided, the range starts with the oldest article.
+        :type start: datetime
+        :param end: Optional end of the range; if none is provided, the range ends with the newest article.
+        :type end: datetime
+        :return: List of the articles published within the range.
+        :rtype: list[BlogRSSArticle, BlogAtomArticle]
+        """
+        if not self._dates_sorted:
+            # Entries with the same date are ordered by when they've been indexed, articles are never compared
+            self._dates.sort()
+            self._date_keys = [entry[0] for entry in self._dates]
+            self._dates_sorted = True
+        _low = bisect_left(self._date_keys, _date_key(start)) if start is not None else 0
+        _high = bisect_left(self._date_keys, _date_key(end)) if end is not None else len(self._date_keys)
+        return [entry[2] for entry in self._dates[_low:_high]]
+
+    def articles(self):
+        """ Method to return all indexed articles, in the order they've been indexed in.
+
+        :return: List of the articles.
+        :rtype: list[BlogRSSArticle, BlogAtomArticle]
+        """
+        return list(self._articles.values())
+
+    def comments(self):
+        """ Method to return all indexed comments, each one once.
+
+        :return: List of the comments.
+        :rtype: list[BlogComment]
+        """
+        return list(self._comments.values())
+
+    def authors(self):
+        """ Method to return all unique authors of the indexed articles and comments.
+
+        :return: List of the authors.
+        :rtype: list[BlogAuthor]
+        """
+        return list(self._authors.values())
+
+    def __len__(self):
+        return len(self._articles)
+
+    def __contains__(self, article):
+        if isinstance(article, blog.BlogArticle):
+            return self._key(article, article.article_id) in self._articles
+        return False
+
+    def __iter__(self):
+        return iter(self.articles())
+
+    def __str__(self):
+        return (f"<ArticleIndex articles={len(self._articles)}, comments={len(self._comments)}, "
+                f"authors={len(self._authors)}>")
+
+    def __repr__(self):
+        return "ArticleIndex()"
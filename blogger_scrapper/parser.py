@@ -0,0 +1,345 @@
+import re
+from datetime import datetime
+from io import BytesIO
+
+from lxml import etree
+
+from blogger_scrapper import blog
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_GD = "{http://schemas.google.com/g/2005}"
+_THR = "{http://purl.org/syndication/thread/1.0}"
+
+_ATOM_ENTRY = f"{_ATOM}entry"
+_ATOM_LINK = f"{_ATOM}link"
+_RSS_ITEM = "item"
+_OPENSEARCH_FIELDS = {
+    'totalResults': 'total_results',
+    'startIndex': 'start_index',
+    'itemsPerPage': 'items_per_page'
+}
+
+
+def _source(data):
+    """ Hidden (private) function to turn the provided `data` into something lxml can read incrementally.
+
+    :param data: Raw bytes of the feed or a file-like object (anything with a 'read' method, eg. a response object).
+    :type data: Union[bytes, object]
+    :return: File-like object to read the feed from.
+    :rtype: object
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return BytesIO(data)
+    elif hasattr(data, 'read'):
+        return data
+    else:
+        raise ValueError(f"Provided data must be either bytes or a file-like object")
+
+
+def _iter_elements(data, tag):
+    """ Hidden (private) generator yielding every fully parsed `tag` element of the feed; the element and everything
+    parsed before it is discarded once the caller is done with it, so only one entry is kept in memory at a time.
+
+    :param data: Raw bytes of the feed or a file-like object.
+    :type data: Union[bytes, object]
+    :param tag: Fully qualified name of the elements to yield.
+    :type tag: str
+    :return: Generator of lxml elements.
+    :rtype: Iterator[lxml.etree._Element]
+    """
+    for _event, element in etree.iterparse(_source(data), events=("end",), tag=tag, huge_tree=True):
+        yield element
+        element.clear(keep_tail=True)
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+
+def _text(element):
+    """ Hidden (private) function returning all the text of the `element`, same as the 'text' attribute of a
+    BeautifulSoup Tag.
+
+    :param element: Element to collect the text of.
+    :type element: lxml.etree._Element
+    :return: Text of the element and all its children.
+    :rtype: str
+    """
+    return "".join(element.itertext())
+
+
+def _blogger_id(element_text):
+    """ Hidden (private) function to extract the numeric ID out of a Blogger ID string, eg.
+    'tag:blogger.com,1999:blog-1234.post-5678' -> 5678
+
+    :param element_text: Blogger ID string.
+    :type element_text: str
+    :return: The ID.
+    :rtype: int
+    """
+    return int(element_text.split("-")[-1])
+
+
+def _registered_author(name, uri, author_id, email, image_src, authors=None):
+    """ Hidden (private) function returning the BlogAuthor object for the provided attributes - the canonical one of the
+    `authors` registry if provided, in which case a new object is only built for authors not registered yet.
+
+    :param name: Display name of the author.
+    :type name: str
+    :param uri: URI of the author's profile.
+    :type uri: str
+    :param author_id: Blogger ID of the author, -1 if unknown.
+    :type author_id: int
+    :param email: E-mail of the author.
+    :type email: str
+    :param image_src: Link to the author's avatar.
+    :type image_src: str
+    :param authors: Optional registry of the authors of the feed.
+    :type authors: AuthorRegistry
+    :return: The author object.
+    :rtype: BlogAuthor
+    """
+    if authors is not None:
+        author = authors.find(author_id, name, uri)
+        if author is not None:
+            return author
+    author = blog.BlogAuthor(name=name, uri=uri, author_id=author_id, email=email, image_src=image_src)
+    return authors.intern(author) if authors is not None else author
+
+
+def parse_author(author_element, authors=None):
+    """ Function to initialize a BlogAuthor object out of an Atom <author> element.
+
+    :param author_element: The <author> element.
+    :type author_element: lxml.etree._Element
+    :param authors: Optional registry of the authors of the feed; if provided, the canonical object of an already
+                    registered author is returned instead of a new one.
+    :type authors: AuthorRegistry
+    :return: The author object.
+    :rtype: BlogAuthor
+    """
+    name = None
+    uri = None
+    email = None
+    image_src = None
+    for child in author_element:
+        if child.tag == f"{_ATOM}name":
+            name = _text(child)
+        elif child.tag == f"{_ATOM}uri":
+            uri = _text(child)
+        elif child.tag == f"{_ATOM}email":
+            email = _text(child)
+        elif child.tag == f"{_GD}image":
+            image_src = child.get('src')
+
+    author_id = -1
+    if uri is None:
+        uri = "Dummy-URI"
+    else:
+        try:
+            author_id = int(uri.split("/")[-1])
+        except ValueError:
+            author_id = -1
+    return _registered_author(name if name is not None else "Anonymous", uri, author_id,
+                              email if email is not None else "dummy-email@dummy.com",
+                              image_src if image_src is not None else "", authors)
+
+
+def _anonymous_author(authors=None):
+    return _registered_author("Anonymous", "", -1, "dummy-email@dummy.com", "", authors)
+
+
+def parse_atom_article(entry, authors=None):
+    """ Function to initialize a BlogAtomArticle object out of an Atom <entry> element of the posts feed. Comments are
+    not collected, the link to the comments feed of the article is saved in its `comments_link` attribute instead, along
+    with the number of comments advertised by the feed in its `total_comments` attribute.
+
+    :param entry: The <entry> element.
+    :type entry: lxml.etree._Element
+    :param authors: Optional registry of the authors of the feed, see 'parse_author'.
+    :type authors: AuthorRegistry
+    :return: The article object, with an empty list of comments.
+    :rtype: BlogAtomArticle
+    """
+    article_id = None
+    title = None
+    content = None
+    author = None
+    published_date = None
+    last_updated_date = None
+    feed_link = None
+    blog_link = None
+    comments_link = None
+    total_comments = None
+    for child in entry:
+        tag = child.tag
+        if tag == f"{_ATOM}id":
+            article_id = _blogger_id(_text(child))
+        elif tag == f"{_ATOM}title":
+            title = _text(child)
+        elif tag == f"{_ATOM}content":
+            content = _text(child)
+        elif tag == f"{_ATOM}published":
+            published_date = datetime.fromisoformat(_text(child))
+        elif tag == f"{_ATOM}updated":
+            last_updated_date = datetime.fromisoformat(_text(child))
+        elif tag == f"{_ATOM}author":
+            author = parse_author(child, authors)
+        elif tag == _ATOM_LINK:
+            rel = child.get('rel')
+            link_type = child.get('type')
+            if rel == 'replies' and link_type == "application/atom+xml":
+                comments_link = child.get('href')
+            elif rel == 'self' and link_type == "application/atom+xml":
+                feed_link = child.get('href')
+            elif rel == 'alternate' and link_type == "text/html":
+                blog_link = child.get('href')
+        elif tag == f"{_THR}total":
+            total_comments = int(_text(child))
+    return blog.BlogAtomArticle(article_id=article_id, title=title, content=content, author=author,
+                                published_date=published_date, last_edited_date=last_updated_date,
+                                blog_link=blog_link, feed_link=feed_link, comments=[], comments_link=comments_link,
+                                total_comments=total_comments)
+
+
+def parse_rss_article(item, authors=None):
+    """ Function to initialize a BlogRSSArticle object out of an RSS <item> element.
+
+    :param item: The <item> element.
+    :type item: lxml.etree._Element
+    :param authors: Optional registry of the authors of the feed, see 'parse_author'.
+    :type authors: AuthorRegistry
+    :return: The article object.
+    :rtype: BlogRSSArticle
+    """
+    article_id = None
+    title = None
+    content = None
+    author = None
+    published_date = None
+    updated_date = None
+    for child in item:
+        tag = child.tag
+        if tag == "guid":
+            article_id = _text(child).split("-")[-1]
+        elif tag == "title":
+            title = _text(child)
+        elif tag == "description":
+            content = _text(child)
+        elif tag == "author":
+            _author = _text(child).split(" ")
+            _author_name = re.sub("[()]", "", _author[1])
+            author = _registered_author(_author_name, "", -1, _author[0], "", authors)
+        elif tag == "pubDate":
+            published_date = _text(child)
+        elif tag == f"{_ATOM}updated":
+            updated_date = datetime.fromisoformat(_text(child))
+    return blog.BlogRSSArticle(article_id=article_id, title=title, content=content, author=author,
+                               published_date=published_date, last_edited_date=updated_date)
+
+
+def parse_comment(entry, article_backref=None, authors=None):
+    """ Function to initialize a BlogComment object out of an Atom <entry> element of a comments feed. If no
+    `article_backref` is provided, it's taken from the <thr:in-reply-to> element of the comment.
+
+    :param entry: The <entry> element.
+    :type entry: lxml.etree._Element
+    :param article_backref: Optional ID of the article the comment was posted to.
+    :type article_backref: int
+    :param authors: Optional registry of the authors of the feed, see 'parse_author'.
+    :type authors: AuthorRegistry
+    :return: The comment object.
+    :rtype: BlogComment
+    """
+    comment_id = -1
+    content = "Dummy Content"
+    published_date = None
+    last_updated_date = None
+    author = None
+    for child in entry:
+        tag = child.tag
+        if tag == f"{_ATOM}id":
+            comment_id = _blogger_id(_text(child))
+        elif tag == f"{_ATOM}content":
+            content = _text(child)
+        elif tag == f"{_ATOM}published":
+            published_date = datetime.fromisoformat(_text(child))
+        elif tag == f"{_ATOM}updated":
+            last_updated_date = datetime.fromisoformat(_text(child))
+        elif tag == f"{_ATOM}author":
+            author = parse_author(child, authors)
+        elif tag == f"{_THR}in-reply-to" and article_backref is None and child.get('ref'):
+            article_backref = _blogger_id(child.get('ref'))
+
+    if published_date is None:
+        published_date = datetime.now()
+    if last_updated_date is None:
+        last_updated_date = published_date
+    if author is None:
+        author = _anonymous_author(authors)
+    return blog.BlogComment(comment_id=comment_id, content=content, published_date=published_date,
+                            last_updated_date=last_updated_date, author=author, article_backref=article_backref)
+
+
+def iter_articles(data, feed_type, authors=None):
+    """ Generator yielding the articles of a posts feed page, parsed one entry at a time straight from the `data`.
+
+    :param data: Raw bytes of the feed page or a file-like object to read them from.
+    :type data: Union[bytes, object]
+    :param feed_type: Type of the feed - 'atom' or 'rss'.
+    :type feed_type: str
+    :param authors: Optional registry of the authors of the feed, shared by all the articles parsed with it.
+    :type authors: AuthorRegistry
+    :return: Generator of article objects.
+    :rtype: Iterator[Union[BlogAtomArticle, BlogRSSArticle]]
+    """
+    if feed_type == "rss":
+        for item in _iter_elements(data, _RSS_ITEM):
+            yield parse_rss_article(item, authors)
+    else:
+        for entry in _iter_elements(data, _ATOM_ENTRY):
+            yield parse_atom_article(entry, authors)
+
+
+def iter_comments(data, article_backref=None, authors=None):
+    """ Generator yielding the comments of a comments feed page, parsed one entry at a time straight from the `data`.
+
+    :param data: Raw bytes of the comments feed page or a file-like object to read them from.
+    :type data: Union[bytes, object]
+    :param article_backref: Optional ID of the article all the comments belong to; if not provided, it's taken from
+                    each comment's own reply information.
+    :type article_backref: int
+    :param authors: Optional registry of the authors of the feed, shared by all the comments parsed with it.
+    :type authors: AuthorRegistry
+    :return: Generator of comment objects.
+    :rtype: Iterator[BlogComment]
+    """
+    for entry in _iter_elements(data, _ATOM_ENTRY):
+        yield parse_comment(entry, article_backref=article_backref, authors=authors)
+
+
+def parse_feed_info(data):
+    """ Function to read the paging information and links of a feed page (Atom or RSS); parsing stops as soon as the
+    first entry is reached, so the entries themselves are never parsed.
+
+    :param data: Raw bytes of the feed page or a file-like object to read them from.
+    :type data: Union[bytes, object]
+    :return: Dictionary with the 'total_results', 'start_index' and 'items_per_page' values (None if missing) and the
+            'links' of the feed, keyed by their 'rel' attribute.
+    :rtype: dict
+    """
+    info = {
+        'total_results': None,
+        'start_index': None,
+        'items_per_page': None,
+        'links': {}
+    }
+    for event, element in etree.iterparse(_source(data), events=("start", "end")):
+        if event == "start":
+            if element.tag in (_ATOM_ENTRY, _RSS_ITEM):
+                break
+            continue
+        local_name = etree.QName(element).localname
+        if local_name in _OPENSEARCH_FIELDS and element.text:
+            info[_OPENSEARCH_FIELDS[local_name]] = int(element.text)
+        elif element.tag == _ATOM_LINK and element.get('rel'):
+            info['links'][element.get('rel')] = element.get('href')
+    return info
@@ -0,0 +1,96 @@
+import random
+
+RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+
+
+class FetchError(RuntimeError):
+
+    def __init__(self, message, status=None, retryable=True):
+        """ Error raised when a page of a feed couldn't be fetched.
+
+        :param message: Description of the error.
+        :type message: str
+        :param status: HTTP status of the response, None if there was no response (eg. connection errors, timeouts).
+        :type status: int
+        :param retryable: Whether fetching the page again may succeed.
+        :type retryable: bool
+        """
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+
+    def __reduce__(self):
+        # Raised in the workers of the 'process' backend, so it has to survive pickling along with its attributes
+        return self.__class__, (self.args[0], self.status, self.retryable)
+
+
+class RetryPolicy:
+
+    def __init__(self, max_attempts=3, backoff=1.0, max_backoff=30.0, jitter=True, retry_statuses=RETRY_STATUSES):
+        """ Constructor for the RetryPolicy object, deciding which failed fetches of a feed page are attempted again and
+        how long to wait before doing so - exponentially longer after every failed attempt, with a random jitter so
+        that pages failing together aren't all retried at the same moment.
+
+        :param max_attempts: Maximum number of attempts to fetch a page, including the first one.
+        :type max_attempts: int
+        :param backoff: Number of seconds to wait before the second attempt; doubled for every further attempt.
+        :type backoff: float
+        :param max_backoff: Maximum number of seconds to wait before an attempt.
+        :type max_backoff: float
+        :param jitter: Whether to wait a random time between 0 and the backoff ('full jitter') instead of exactly the
+                    backoff.
+        :type jitter: bool
+        :param retry_statuses: HTTP statuses of the responses worth retrying; connection errors and timeouts are always
+                    retried.
+        :type retry_statuses: tuple[int]
+        """
+        if max_attempts < 1:
+            raise ValueError(f"Provided 'max_attempts' parameter must be a positive integer")
+        if backoff < 0 or max_backoff < backoff:
+            raise ValueError(f"Provided 'backoff' and 'max_backoff' parameters must not be negative, with "
+                             f"'backoff' <= 'max_backoff'")
+
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = tuple(retry_statuses)
+
+    def is_retryable(self, status):
+        """ Method to tell whether a response with the HTTP `status` is worth retrying.
+
+        :param status: HTTP status of the response.
+        :type status: int
+        :return: Whether the request should be retried.
+        :rtype: bool
+        """
+        return status in self.retry_statuses
+
+    def should_retry(self, error, attempt):
+        """ Method to tell whether a page whose `attempt`-th fetch failed with the `error` should be fetched again.
+
+        :param error: The error the fetch failed with.
+        :type error: FetchError
+        :param attempt: Number of the failed attempt, starting with 1.
+        :type attempt: int
+        :return: Whether to attempt the fetch again.
+        :rtype: bool
+        """
+        return error.retryable and attempt < self.max_attempts
+
+    def delay(self, attempt):
+        """ Method to return the number of seconds to wait after the `attempt`-th failed attempt.
+
+        :param attempt: Number of the failed attempt, starting with 1.
+        :type attempt: int
+        :return: Number of seconds to wait before the next attempt.
+        :rtype: float
+        """
+        backoff = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+    def __str__(self):
+        return f"<RetryPolicy max_attempts={self.max_attempts}, backoff={self.backoff}, max_backoff={self.max_backoff}>"
+
+    def __repr__(self):
+        return f"RetryPolicy(max_attempts={self.max_attempts}, backoff={self.backoff})"
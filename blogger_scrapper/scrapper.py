@@ -1,10 +1,19 @@
+import warnings
+from time import monotonic
+
 from blogger_scrapper.export import SqlExport, FileExport
-from blogger_scrapper.blog import Blogsite
+from blogger_scrapper.blog import Blogsite, COMMENTS_MODES
+from blogger_scrapper.checkpoint import FeedCheckpoint
+from blogger_scrapper.session import HttpSession
+from blogger_scrapper.state import ScrapeState, merge_articles
 
 
 class Scrapper:
 
-    def __init__(self, site, feed="atom", export_type="json"):
+    def __init__(self, site, feed="atom", export_type="json", session=None, backend="thread", max_workers=10,
+                 comments_mode="article", incremental=False, state_directory="output/.state", cache=None,
+                 database=None, throttle=None, retry_policy=None, deadline=None, resumable=False,
+                 checkpoint_directory="output/.checkpoint", executor=None, export_name=None):
         """ Constructor for the scrapper; this class initializes the BlogSite sub-class and that in turn initializes the
         blog Feed class. This class provides the high level access to all the functionality.
 
@@ -12,31 +21,168 @@ class Scrapper:
         :type site: str
         :param feed: Choice of which feed to attempt for the scrapping - atom or rss
         :type feed: str
+        :param session: Optional HTTP session to be shared by all requests of the scrapping; if none is provided, a new
+                    one is created and owned by the scrapper.
+        :type session: HttpSession
+        :param backend: Execution backend used to fetch the feed pages - 'thread' or 'process'.
+        :type backend: str
+        :param max_workers: Number of feed pages fetched at the same time.
+        :type max_workers: int
+        :param comments_mode: How the comments are collected - 'article' (comments feed of every article), 'bulk'
+                    (blog-wide comments feed, far fewer requests for large blogs) or 'lazy' (loaded right before the
+                    export, concurrently).
+        :type comments_mode: str
+        :param incremental: Whether to only collect the articles and comments created or updated since the last
+                    successful scrape of the site, merging them into the content collected by the previous scrapes for
+                    the export. The first incremental scrape of a site is a full one.
+        :type incremental: bool
+        :param state_directory: Directory where the state of the incremental scrapes is kept.
+        :type state_directory: str
+        :param cache: Optional on-disk HTTP cache for the session created by the scrapper; to be set on the provided
+                    `session` instead, if there is one.
+        :type cache: HttpCache
+        :param database: Optional path of a persistent SQLite database for the 'sql' export, updated in place by every
+                    scrape instead of creating a new database each time.
+        :type database: str
+        :param throttle: Optional per-host rate limiting and concurrency control for the session created by the
+                    scrapper, adapting to the throttling of the site; to be set on the provided `session` instead, if
+                    there is one.
+        :type throttle: HostThrottle
+        :param retry_policy: Optional policy deciding which failed pages of the feed are attempted again and when.
+        :type retry_policy: RetryPolicy
+        :param deadline: Optional number of seconds the 'scrap' method is allowed to run for; once they have passed, the
+                    requests in flight are abandoned and the content collected so far is exported.
+        :type deadline: float
+        :param resumable: Whether to save every feed page to a checkpoint as soon as it has been fetched, so that a
+                    scrape that died (or was cut by its deadline) is resumed by the next one instead of starting over.
+        :type resumable: bool
+        :param checkpoint_directory: Directory where the checkpoint of the resumable scrapes is kept.
+        :type checkpoint_directory: str
+        :param executor: Optional executor shared with other scrappers, to fetch all pages of the site with; see the
+                    BatchScrapper class.
+        :type executor: concurrent.futures.Executor
+        :param export_name: Optional name put in front of the name of the export file, eg. to tell the sites apart.
+        :type export_name: str
         """
         if not site:
             raise ValueError("No site URL has been provided")
 
-        if export_type not in ['json', 'xml', 'sql']:
+        if export_type not in ['json', 'xml', 'sql', 'ndjson']:
             raise ValueError(f"Unknown export_type provided - '{export_type}'; available formats are 'json', 'xml', "
-                             f"'sql'")
+                             f"'sql', 'ndjson'")
+        if comments_mode not in COMMENTS_MODES:
+            raise ValueError(f"Unknown comments_mode provided - '{comments_mode}'; available modes are 'article', "
+                             f"'bulk', 'lazy'")
+        if session is not None and cache is not None:
+            raise ValueError(f"Provided 'cache' parameter can't be used along with a 'session', set the cache on the "
+                             f"session instead")
+        if deadline is not None and deadline <= 0:
+            raise ValueError(f"Provided 'deadline' parameter must be a positive number of seconds")
+        if session is not None and throttle is not None:
+            raise ValueError(f"Provided 'throttle' parameter can't be used along with a 'session', set the throttle on "
+                             f"the session instead")
 
-        self.site = Blogsite(site, feed=feed)
+        self.session = session if session is not None else HttpSession(cache=cache, throttle=throttle)
+        self.state = ScrapeState(state_directory) if incremental else None
+        self.checkpoint = FeedCheckpoint(checkpoint_directory) if resumable else None
+        updated_min = self.state.high_water_mark(site) if incremental else None
+        self.site = Blogsite(site, feed=feed, session=self.session, backend=backend, max_workers=max_workers,
+                             updated_min=updated_min, retry_policy=retry_policy, executor=executor)
         self.feed = self.site.blog_feed
         self.export_type = export_type
+        self.comments_mode = comments_mode
+        self.database = database
+        self.deadline = deadline
+        self.export_name = export_name
+        self.report = None
 
     def scrap(self):
-        """ High level method that takes care of collecting all data from the site and then exporting it.
+        """ High level method that takes care of collecting all data from the site and then exporting it. If the
+        scrapper has a `deadline`, whatever has been collected once it passes is exported, and the report tells what
+        has been cut.
 
+        :return: Report of the scrape, also kept in the `report` attribute; see the '_report' method.
+        :rtype: dict
         """
-        articles = self.feed.fetch_all()
-        authors = self.feed.get_all_authors(articles)
-        comments = self.feed.get_all_comments(articles)
+        started = monotonic()
+        deadline = started + self.deadline if self.deadline is not None else None
+        self.feed.cut_comment_pages = []
+        self.feed.cut_comments = []
+        if self.export_type in ('ndjson', 'sql') and self.state is None and self.checkpoint is None and \
+                self.comments_mode != "bulk":
+            # Articles are exported as their pages arrive, nothing is kept in memory; comments of the 'lazy' mode would
+            # be loaded one article at a time by the export, so they're fetched along with the articles instead
+            if self.comments_mode == "lazy":
+                warnings.warn(f"Comments mode 'lazy' doesn't apply to the streamed '{self.export_type}' export, the "
+                              f"comments are fetched along with their articles ('article' mode) instead")
+            articles = self.feed.iter_articles(comments_mode="article", ordered=True, deadline=deadline)
+            if self.export_type == 'sql':
+                SqlExport(articles, None, None, database=self.database, name=self.export_name).do_export()
+            else:
+                FileExport(articles, None, None, 'ndjson', self.feed.site_encoding, name=self.export_name).do_export()
+            return self._report(started)
+
+        articles = self.feed.fetch_all(comments_mode=self.comments_mode, deadline=deadline, checkpoint=self.checkpoint)
+        if self.comments_mode == "lazy":
+            self.feed.load_comments(articles, deadline=deadline)
+            for article in self.feed.cut_comments:
+                # Left empty rather than fetched one at a time by the export, past the deadline
+                article.comments.set([])
+        if self.state is not None:
+            changed_comments = self.feed.orphan_comments
+            if self.feed.updated_min is not None and self.comments_mode != "bulk" and self.feed.feed_type == "atom":
+                # New comments on articles that didn't change themselves only show up in the blog-wide comments feed
+                changed_comments = self.feed.fetch_all_comments(deadline=deadline)
+            articles = merge_articles(self.state.load_snapshot(self.site.canonical_url), articles, changed_comments)
+        # Authors and comments come straight from the index of the feed, unless articles of the previous scrapes have
+        # been merged in, as those aren't indexed
+        _indexed_articles = None if self.state is None else articles
+        authors = self.feed.get_all_authors(_indexed_articles)
+        comments = self.feed.get_all_comments(_indexed_articles)
         if self.export_type == 'sql':
-            sql_export = SqlExport(articles, authors, comments)
+            sql_export = SqlExport(articles, authors, comments, database=self.database, name=self.export_name)
             sql_export.do_export()
         elif self.export_type == 'json':
-            json_export = FileExport(articles, authors, comments, 'json', self.feed.site_encoding)
+            json_export = FileExport(articles, authors, comments, 'json', self.feed.site_encoding,
+                                     name=self.export_name)
             json_export.do_export()
+        elif self.export_type == 'ndjson':
+            ndjson_export = FileExport(articles, authors, comments, 'ndjson', self.feed.site_encoding,
+                                       name=self.export_name)
+            ndjson_export.do_export()
         else:
-            xml_export = FileExport(articles, authors, comments, 'xml', self.feed.site_encoding)
+            xml_export = FileExport(articles, authors, comments, 'xml', self.feed.site_encoding, name=self.export_name)
             xml_export.do_export()
+        report = self._report(started)
+        if self.state is not None and report['completed']:
+            # Only saved once the export succeeded, so that a failed run is simply repeated by the next one
+            self.state.save(self.site.canonical_url, articles)
+        elif self.state is not None:
+            warnings.warn(f"Scrape of '{self.site.canonical_url}' was cut by its deadline, the state of the "
+                          f"incremental scrapes is left as it was so that the next scrape collects the missing content")
+        return report
+
+    def _report(self, started):
+        """ Hidden (private) method to build the report of the scrape started at `started` (as per time.monotonic()),
+        listing the content cut by the deadline.
+
+        :param started: Time the scrape started at.
+        :type started: float
+        :return: Dictionary telling whether the scrape 'completed' within its deadline, the number of 'seconds' it
+                took, the numbers of the feed pages whose articles were cut ('cut_pages'), the numbers of the pages of
+                the blog-wide comments feed that were cut ('cut_comment_pages') and the IDs of the articles exported
+                without their comments ('cut_comments').
+        :rtype: dict
+        """
+        self.report = {
+            'completed': not (self.feed.cut_pages or self.feed.cut_comment_pages or self.feed.cut_comments),
+            'seconds': round(monotonic() - started, 3),
+            'cut_pages': [page.number for page in self.feed.cut_pages],
+            'cut_comment_pages': [page.number for page in self.feed.cut_comment_pages],
+            'cut_comments': [article.article_id for article in self.feed.cut_comments]
+        }
+        if not self.report['completed']:
+            warnings.warn(f"Scrape deadline of {self.deadline} seconds passed - cut {len(self.report['cut_pages'])} "
+                          f"feed pages, {len(self.report['cut_comment_pages'])} comments feed pages and the comments "
+                          f"of {len(self.report['cut_comments'])} articles")
+        return self.report
@@ -0,0 +1,190 @@
+import urllib3
+
+
+class _CountingPoolManager(urllib3.PoolManager):
+    """ PoolManager that keeps a reference to every connection pool it has created, so that the connection counters of
+    the pools survive them being evicted from the manager, and that passes every request through the throttle of the
+    session, if it has one.
+    """
+
+    def __init__(self, *args, throttle=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.created_pools = []
+        self.throttle = throttle
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        self.created_pools.append(pool)
+        return pool
+
+    def request(self, method, url, *args, **kwargs):
+        # Overridden here rather than 'urlopen', which is called again for every redirect of the request
+        if self.throttle is None:
+            return super().request(method, url, *args, **kwargs)
+        # urllib3 would retry the throttled responses itself, sleeping through their 'Retry-After' header while holding
+        # the slot of the request; they're retried here instead, once the throttle lets them through again
+        kwargs.setdefault('retries', urllib3.Retry(3, respect_retry_after_header=False))
+        host = urllib3.util.parse_url(url).netloc
+        attempt = 0
+        while True:
+            ticket = self.throttle.acquire(host)
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except Exception:
+                self.throttle.release(ticket)
+                raise
+            self.throttle.release(ticket, response.status, response.headers.get('Retry-After'))
+            if response.status not in self.throttle.throttle_statuses or attempt >= self.throttle.retries:
+                return response
+            response.drain_conn()
+            attempt += 1
+
+
+class HttpSession:
+
+    def __init__(self, pool_size=10, num_pools=10, block=False, headers=None, cache=None, throttle=None,
+                 connect_timeout=10.0, read_timeout=30.0):
+        """ Constructor for the HttpSession object - a single pooled HTTP client meant to be shared by all objects that
+        talk to the Blogger site (Blogsite, Feed, FeedPage and BlogAtomArticle), so that the TCP/TLS connections to a
+        host are kept alive and re-used between requests instead of being opened for every single call.
+
+        :param pool_size: Number of connections kept alive per host; should be at least the number of workers used
+                    when fetching the feed pages, otherwise the excess connections are dropped after every request.
+        :type pool_size: int
+        :param num_pools: Number of per-host connection pools kept at the same time.
+        :type num_pools: int
+        :param block: Whether to block and wait for a free connection when all `pool_size` connections of a host are
+                    in use, instead of opening a new one.
+        :type block: bool
+        :param headers: Optional headers to send with every request.
+        :type headers: dict
+        :param cache: Optional on-disk cache for the GET requests of the session.
+        :type cache: HttpCache
+        :param throttle: Optional per-host rate limiting and concurrency control for the requests of the session;
+                    responses served by the cache without reaching the site don't count.
+        :type throttle: HostThrottle
+        :param connect_timeout: Number of seconds to wait for a connection to the host before giving up on the request;
+                    None waits indefinitely.
+        :type connect_timeout: float
+        :param read_timeout: Number of seconds to wait for the host to send data (between any two chunks of the
+                    response, not for the whole of it) before giving up on the request; None waits indefinitely.
+        :type read_timeout: float
+        """
+        if pool_size < 1 or num_pools < 1:
+            raise ValueError(f"Provided 'pool_size' and 'num_pools' parameters must be positive integers")
+        if (connect_timeout is not None and connect_timeout <= 0) or (read_timeout is not None and read_timeout <= 0):
+            raise ValueError(f"Provided 'connect_timeout' and 'read_timeout' parameters must be positive numbers")
+
+        self.pool_size = pool_size
+        self.num_pools = num_pools
+        self.block = block
+        self.headers = headers or {}
+        self.cache = cache
+        self.throttle = throttle
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._http = self._new_pool_manager()
+
+    def _new_pool_manager(self):
+        """ Hidden (private) method to create the underlying pool manager with the session's configuration.
+
+        :return: The pool manager used for all requests of the session.
+        :rtype: _CountingPoolManager
+        """
+        # Default timeout of every request of the session, a stalled response would hold a worker forever otherwise
+        timeout = urllib3.Timeout(connect=self.connect_timeout, read=self.read_timeout)
+        return _CountingPoolManager(num_pools=self.num_pools, maxsize=self.pool_size, block=self.block,
+                                    headers=self.headers, timeout=timeout, throttle=self.throttle)
+
+    def request(self, method, url, headers=None, **kwargs):
+        """ Method to perform a request through the pooled connections of the session.
+
+        :param method: HTTP method of the request.
+        :type method: str
+        :param url: URL to send the request to.
+        :type url: str
+        :param headers: Optional headers for this request only; they're merged with the session's own headers.
+        :type headers: dict
+        :return: The response object as returned by urllib3, or rebuilt from the cache of the session.
+        :rtype: urllib3.response.HTTPResponse
+        """
+        if headers:
+            headers = {**self.headers, **headers}
+        if self.cache is not None and method == "GET" and kwargs.get('preload_content', True):
+            return self.cache.get(self._http, url, headers={**self.headers, **(headers or {})}, **kwargs)
+        return self._http.request(method, url, headers=headers, **kwargs)
+
+    def get(self, url, headers=None, **kwargs):
+        """ Shorthand for a GET request through the session.
+
+        :param url: URL to send the request to.
+        :type url: str
+        :param headers: Optional headers for this request only.
+        :type headers: dict
+        :return: The response object as returned by urllib3.
+        :rtype: urllib3.response.HTTPResponse
+        """
+        return self.request("GET", url, headers=headers, **kwargs)
+
+    @property
+    def requests_sent(self):
+        return sum(pool.num_requests for pool in self._http.created_pools)
+
+    @property
+    def connections_opened(self):
+        return sum(pool.num_connections for pool in self._http.created_pools)
+
+    @property
+    def connections_reused(self):
+        return max(self.requests_sent - self.connections_opened, 0)
+
+    def stats(self):
+        """ Method to return the connection counters of the session. Counters only cover the requests made in the
+        current process, requests made from copies of the session sent to other processes are not included.
+
+        :return: Dictionary with the number of requests sent, connections opened and connections re-used, along with
+                the counters of the cache (under 'cache') and the state of the throttle (under 'throttle') if the
+                session has them.
+        :rtype: dict
+        """
+        stats = {
+            'requests': self.requests_sent,
+            'connections_opened': self.connections_opened,
+            'connections_reused': self.connections_reused
+        }
+        if self.cache is not None:
+            stats['cache'] = self.cache.stats()
+        if self.throttle is not None:
+            stats['throttle'] = self.throttle.stats()
+        return stats
+
+    def close(self):
+        """ Method to close all pooled connections of the session; the session can still be used afterwards, new
+        connections will simply be opened.
+
+        """
+        self._http.clear()
+
+    def __getstate__(self):
+        # Connection pools can't be sent to another process, only the configuration of the session is
+        return {
+            'pool_size': self.pool_size,
+            'num_pools': self.num_pools,
+            'block': self.block,
+            'headers': self.headers,
+            'cache': self.cache,
+            'throttle': self.throttle,
+            'connect_timeout': self.connect_timeout,
+            'read_timeout': self.read_timeout
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._http = self._new_pool_manager()
+
+    def __str__(self):
+        return (f"<HttpSession pool_size={self.pool_size}, connections_opened={self.connections_opened}, "
+                f"connections_reused={self.connections_reused}>")
+
+    def __repr__(self):
+        return f"HttpSession(pool_size={self.pool_size}, num_pools={self.num_pools})"
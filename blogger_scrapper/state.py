@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+from datetime import datetime
+from pathlib import Path
+
+# The index file is shared by all sites, scrapes of several sites at once (see BatchScrapper) update it in turn
+_index_lock = threading.Lock()
+
+
+class ScrapeState:
+
+    def __init__(self, directory="output/.state"):
+        """ Constructor for the ScrapeState object, keeping track of the previous successful scrapes of every site so
+        that the next scrape only has to collect what has changed since. For each site, the high-water mark (the latest
+        update date seen in the site's content) and a snapshot of all its articles are saved in the `directory`.
+
+        :param directory: Directory to keep the state in, created if it doesn't exist.
+        :type directory: str
+        """
+        self.directory = Path(directory)
+        self._index_file = self.directory / "state.json"
+
+    def _load_index(self):
+        """ Hidden (private) method to read the index file of the state, holding the information for every site.
+
+        :return: Dictionary with the state of every site, keyed by the site URL.
+        :rtype: dict
+        """
+        if not self._index_file.is_file():
+            return {}
+        with open(self._index_file, "r", encoding="UTF-8") as f:
+            return json.load(f)
+
+    def _snapshot_file(self, site):
+        return self.directory / f"{hashlib.sha1(site.encode('UTF-8')).hexdigest()}.pickle"
+
+    def high_water_mark(self, site):
+        """ Method to return the high-water mark of the last successful scrape of the `site`, meaning that everything
+        updated after this date has not been collected yet.
+
+        :param site: URL of the site.
+        :type site: str
+        :return: The high-water mark, None if the site has never been scrapped or its snapshot is gone.
+        :rtype: datetime
+        """
+        site_state = self._load_index().get(site)
+        if site_state is None or not self._snapshot_file(site).is_file():
+            return None
+        return datetime.fromisoformat(site_state['high_water_mark'])
+
+    def load_snapshot(self, site):
+        """ Method to return all the articles collected for the `site` so far.
+
+        :param site: URL of the site.
+        :type site: str
+        :return: List of the articles of the last successful scrape, empty if there's none.
+        :rtype: list[BlogRSSArticle, BlogAtomArticle]
+        """
+        snapshot_file = self._snapshot_file(site)
+        if not snapshot_file.is_file():
+            return []
+        with open(snapshot_file, "rb") as f:
+            return pickle.load(f)
+
+    def save(self, site, articles_list):
+        """ Method to save the `articles_list` as the snapshot of the `site` after a successful scrape, along with its
+        high-water mark, calculated from the update dates of the articles and their comments.
+
+        :param site: URL of the site.
+        :type site: str
+        :param articles_list: All articles of the site, including the ones that didn't change in the last scrape.
+        :type articles_list: list[BlogRSSArticle, BlogAtomArticle]
+        :return: The new high-water mark of the site, None if it couldn't be calculated.
+        :rtype: datetime
+        """
+        Path.mkdir(self.directory, parents=True, exist_ok=True)
+        snapshot_file = self._snapshot_file(site)
+        tmp_file = snapshot_file.with_suffix(".tmp")
+        with open(tmp_file, "wb") as f:
+            pickle.dump(list(articles_list), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, snapshot_file)
+
+        mark = high_water_mark(articles_list)
+        with _index_lock:
+            index = self._load_index()
+            if mark is None:
+                index.pop(site, None)
+            else:
+                index[site] = {
+                    'high_water_mark': mark.isoformat(),
+                    'articles': len(articles_list),
+                    'last_run': datetime.now().isoformat()
+                }
+            tmp_index = self._index_file.with_suffix(".tmp")
+            with open(tmp_index, "w", encoding="UTF-8") as f:
+                json.dump(index, f, indent=4)
+            os.replace(tmp_index, self._index_file)
+        return mark
+
+    def reset(self, site):
+        """ Method to forget the state of the `site`, so that its next scrape is a full one.
+
+        :param site: URL of the site.
+        :type site: str
+        """
+        with _index_lock:
+            index = self._load_index()
+            if index.pop(site, None) is not None:
+                with open(self._index_file, "w", encoding="UTF-8") as f:
+                    json.dump(index, f, indent=4)
+        if self._snapshot_file(site).is_file():
+            os.remove(self._snapshot_file(site))
+
+
+def high_water_mark(articles_list):
+    """ Function to return the latest update date of the provided articles and their comments. Dates without timezone
+    information are skipped, as they can't be compared to the feed's dates.
+
+    :param articles_list: Articles to go through.
+    :type articles_list: list[BlogRSSArticle, BlogAtomArticle]
+    :return: The latest update date, None if there is none.
+    :rtype: datetime
+    """
+    mark = None
+    for article in articles_list:
+        dates = [article.last_edited_date, article.published_date]
+        dates.extend(comment.last_updated_date for comment in article.comments)
+        for date in dates:
+            if date.tzinfo is not None and (mark is None or date > mark):
+                mark = date
+    return mark
+
+
+def merge_articles(previous_articles, changed_articles, changed_comments=()):
+    """ Function to merge the articles collected by an incremental scrape into the ones of the previous scrapes.
+    Changed articles replace their previous version; comments of a changed article that are missing from its new
+    version are kept, since an incremental scrape may only have collected the recent ones. The `changed_comments` are
+    added to (or replace the previous version in) the articles they belong to. Articles and comments deleted from the
+    site can't be detected and are kept.
+
+    :param previous_articles: Articles of the previous scrapes.
+    :type previous_articles: list[BlogRSSArticle, BlogAtomArticle]
+    :param changed_articles: Articles created or updated since the previous scrape.
+    :type changed_articles: list[BlogRSSArticle, BlogAtomArticle]
+    :param changed_comments: Optional comments created or updated since the previous scrape, whose articles might not
+                    have changed.
+    :type changed_comments: list[BlogComment]
+    :return: List of all articles, newest first.
+    :rtype: list[BlogRSSArticle, BlogAtomArticle]
+    """
+    merged = {article.article_id: article for article in previous_articles}
+    for article in changed_articles:
+        previous = merged.get(article.article_id)
+        if previous is not None and len(previous.comments) > 0:
+            known_comments = {comment.comment_id for comment in article.comments}
+            article.comments.extend(comment for comment in previous.comments
+                                    if comment.comment_id not in known_comments)
+        merged[article.article_id] = article
+
+    for comment in changed_comments:
+        article = merged.get(comment.article_backref)
+        if article is None:
+            continue
+        for i, known_comment in enumerate(article.comments):
+            if known_comment.comment_id == comment.comment_id:
+                article.comments[i] = comment
+                break
+        else:
+            article.comments.append(comment)
+
+    return sorted(merged.values(), key=lambda article: article.published_date.timestamp(), reverse=True)
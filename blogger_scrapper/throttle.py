@@ -0,0 +1,335 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+THROTTLE_STATUSES = (429, 503)
+
+
+def _retry_after_seconds(value):
+    """ Hidden (private) function to read the value of a 'Retry-After' header - either a number of seconds or an HTTP
+    date.
+
+    :param value: Value of the header.
+    :type value: str
+    :return: Number of seconds to wait, None if the value can't be read.
+    :rtype: float
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class _HostState:
+
+    def __init__(self, rate, concurrency):
+        self.condition = threading.Condition()
+        self.rate = rate
+        self.concurrency = concurrency
+        # Thresholds between the slow start (doubling every round) and the additive increase, set by the first backoff
+        self.rate_threshold = float("inf")
+        self.concurrency_threshold = float("inf")
+        self.tokens = 1.0
+        self.refilled = time.monotonic()
+        self.blocked_until = 0.0
+        self.last_backoff = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.throttled = 0
+        self.backoffs = 0
+        self.waited = 0.0
+
+
+class HostThrottle:
+
+    def __init__(self, rate=10.0, concurrency=4, max_rate=None, max_concurrency=10, min_rate=0.5,
+                 min_concurrency=1, decrease_factor=0.7, burst=None, throttle_statuses=THROTTLE_STATUSES, retries=3,
+                 global_rate=None, global_concurrency=None):
+        """ Constructor for the HostThrottle object - per-host rate limiting and concurrency control meant to be used by
+        an HttpSession, so that the scrapping goes as fast as the site allows without getting blocked. Every host gets
+        a token bucket refilled at its current `rate` and a cap on the number of requests in flight.
+
+        Both are adapted to the responses of the host (AIMD): healthy responses ramp them up - doubling every round
+        until the first backoff, by one per round afterwards - while a throttling response (one of the
+        `throttle_statuses`) or a failed connection cuts them by the `decrease_factor`, at most once per round of
+        requests. A 'Retry-After' header of a throttling response holds back all requests to the host until it passes.
+        The session retries throttled requests itself, once the throttle lets them through again. Other server errors
+        (500, 502, 504) aren't throttling - they neither slow the host down nor get retried by the session, retrying
+        them is left to the RetryPolicy of the feed. On top of the
+        per-host limits, the optional `global_rate` and `global_concurrency` cap the requests to all hosts together -
+        when scraping many sites at once through the same session.
+
+        :param rate: Initial number of requests per second allowed per host.
+        :type rate: float
+        :param concurrency: Initial number of requests in flight allowed per host.
+        :type concurrency: int
+        :param max_rate: Optional maximum the rate is ramped up to; if none is provided, the rate is only bounded by
+                    the concurrency.
+        :type max_rate: float
+        :param max_concurrency: Maximum number of requests in flight per host; should not be over the number of
+                    connections kept alive per host by the session.
+        :type max_concurrency: int
+        :param min_rate: Minimum the rate is cut down to.
+        :type min_rate: float
+        :param min_concurrency: Minimum the number of requests in flight is cut down to.
+        :type min_concurrency: int
+        :param decrease_factor: Factor the rate and concurrency are multiplied by on a throttling response.
+        :type decrease_factor: float
+        :param burst: Optional number of requests that can be sent at once after an idle period; defaults to the
+                    current concurrency.
+        :type burst: int
+        :param throttle_statuses: HTTP statuses taken as a sign of the host throttling the requests.
+        :type throttle_statuses: tuple[int]
+        :param retries: Number of times a throttled request is retried by the session before its response is returned
+                    as-is.
+        :type retries: int
+        :param global_rate: Optional number of requests per second allowed to all hosts together; not adapted.
+        :type global_rate: float
+        :param global_concurrency: Optional number of requests in flight allowed to all hosts together; not adapted.
+        :type global_concurrency: int
+        """
+        if rate <= 0 or min_rate <= 0 or (max_rate is not None and max_rate < rate) or min_rate > rate:
+            raise ValueError(f"Provided 'rate', 'min_rate' and 'max_rate' parameters must be positive numbers, with "
+                             f"'min_rate' <= 'rate' <= 'max_rate'")
+        if not 1 <= min_concurrency <= concurrency <= max_concurrency:
+            raise ValueError(f"Provided 'concurrency', 'min_concurrency' and 'max_concurrency' parameters must be "
+                             f"positive integers, with 'min_concurrency' <= 'concurrency' <= 'max_concurrency'")
+        if not 0 < decrease_factor < 1:
+            raise ValueError(f"Provided 'decrease_factor' parameter must be between 0 and 1")
+        if retries < 0:
+            raise ValueError(f"Provided 'retries' parameter must not be negative")
+        if (global_rate is not None and global_rate <= 0) or \
+                (global_concurrency is not None and global_concurrency < 1):
+            raise ValueError(f"Provided 'global_rate' and 'global_concurrency' parameters must be positive numbers")
+
+        self.rate = rate
+        self.concurrency = concurrency
+        self.max_rate = max_rate
+        self.max_concurrency = max_concurrency
+        self.min_rate = min_rate
+        self.min_concurrency = min_concurrency
+        self.decrease_factor = decrease_factor
+        self.burst = burst
+        self.throttle_statuses = tuple(throttle_statuses)
+        self.retries = retries
+        self.global_rate = global_rate
+        self.global_concurrency = global_concurrency
+        self._hosts = {}  # type: dict[str, _HostState]
+        self._lock = threading.Lock()
+        # Fixed limits shared by all hosts, only kept if there are any
+        self._global = None
+        if global_rate is not None or global_concurrency is not None:
+            self._global = _HostState(global_rate, global_concurrency)
+
+    def _host(self, host):
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState(self.rate, self.concurrency)
+            return state
+
+    def _refill(self, state, now):
+        """ Hidden (private) method to add the tokens earned by the host since the last refill to its bucket.
+
+        :param state: State of the host.
+        :type state: _HostState
+        :param now: Current time, as per time.monotonic().
+        :type now: float
+        """
+        burst = self.burst if self.burst is not None else max(int(state.concurrency), 1)
+        state.tokens = min(burst, state.tokens + (now - state.refilled) * state.rate)
+        state.refilled = now
+
+    def acquire(self, host):
+        """ Method to wait until a request can be sent to the `host` - the host isn't held back by a 'Retry-After'
+        header, has less requests in flight than its concurrency allows and has a token left in its bucket. Every call
+        has to be followed by a call of the 'release' method once the request is done.
+
+        :param host: The host the request is sent to.
+        :type host: str
+        :return: Ticket of the request, to be passed to the 'release' method.
+        :rtype: tuple
+        """
+        state = self._host(host)
+        with state.condition:
+            started_waiting = time.monotonic()
+            while True:
+                now = time.monotonic()
+                self._refill(state, now)
+                if state.blocked_until > now:
+                    timeout = state.blocked_until - now
+                elif state.in_flight >= int(state.concurrency):
+                    # Woken up by the release of another request
+                    timeout = None
+                elif state.tokens < 1:
+                    timeout = (1 - state.tokens) / state.rate
+                else:
+                    break
+                state.condition.wait(timeout)
+            state.tokens -= 1
+            state.in_flight += 1
+            state.requests += 1
+            state.waited += now - started_waiting
+        if self._global is not None:
+            # Taken while holding the slot of the host, the global state never waits for a host so this can't deadlock
+            now = self._acquire_global()
+        return state, now
+
+    def _acquire_global(self):
+        """ Hidden (private) method to wait until the global limits let a request through.
+
+        :return: Current time, as per time.monotonic(), once the request can be sent.
+        :rtype: float
+        """
+        state = self._global
+        with state.condition:
+            started_waiting = time.monotonic()
+            while True:
+                now = time.monotonic()
+                if state.rate is not None:
+                    state.tokens = min(max(state.rate, 1.0), state.tokens + (now - state.refilled) * state.rate)
+                    state.refilled = now
+                if state.concurrency is not None and state.in_flight >= state.concurrency:
+                    timeout = None
+                elif state.rate is not None and state.tokens < 1:
+                    timeout = (1 - state.tokens) / state.rate
+                else:
+                    break
+                state.condition.wait(timeout)
+            state.tokens -= 1
+            state.in_flight += 1
+            state.requests += 1
+            state.waited += now - started_waiting
+        return now
+
+    def release(self, ticket, status=None, retry_after=None):
+        """ Method to mark the request of the `ticket` as done, adapting the rate and concurrency of its host to the
+        outcome.
+
+        :param ticket: Ticket of the request, as returned by the 'acquire' method.
+        :type ticket: tuple
+        :param status: HTTP status of the response, None if the request failed without one (eg. connection errors).
+        :type status: int
+        :param retry_after: Optional value of the 'Retry-After' header of the response.
+        :type retry_after: str
+        """
+        state, sent = ticket
+        if self._global is not None:
+            with self._global.condition:
+                self._global.in_flight -= 1
+                self._global.condition.notify()
+        with state.condition:
+            state.in_flight -= 1
+            now = time.monotonic()
+            if status is None or status in self.throttle_statuses:
+                state.throttled += 1
+                # Responses to the requests sent before the last backoff don't count, the whole round of requests in
+                # flight would cut the rate down to the minimum otherwise
+                if sent >= state.last_backoff:
+                    self._back_off(state, now)
+                _delay = _retry_after_seconds(retry_after) if status is not None else None
+                if _delay:
+                    state.blocked_until = max(state.blocked_until, now + _delay)
+            elif status < 400:
+                self._ramp_up(state)
+            state.condition.notify_all()
+
+    def _back_off(self, state, now):
+        state.rate = max(self.min_rate, state.rate * self.decrease_factor)
+        state.concurrency = max(self.min_concurrency, state.concurrency * self.decrease_factor)
+        state.rate_threshold = state.rate
+        state.concurrency_threshold = state.concurrency
+        state.tokens = min(state.tokens, 0.0)
+        state.last_backoff = now
+        state.backoffs += 1
+
+    def _ramp_up(self, state):
+        # A round is about `rate` responses (or `concurrency` of them), so adding a fraction of one per response adds
+        # one per round
+        if state.rate < state.rate_threshold:
+            state.rate += 1
+        else:
+            state.rate += 1 / state.rate
+        if self.max_rate is not None:
+            state.rate = min(state.rate, self.max_rate)
+        if state.concurrency < state.concurrency_threshold:
+            state.concurrency += 1
+        else:
+            state.concurrency += 1 / state.concurrency
+        state.concurrency = min(state.concurrency, self.max_concurrency)
+
+    def global_stats(self):
+        """ Method to return the current state of the global limits.
+
+        :return: Dictionary with the number of requests 'in_flight' to all hosts, the number of 'requests' sent and the
+                total number of seconds requests 'waited' for the global limits; None if there are no global limits.
+        :rtype: dict
+        """
+        if self._global is None:
+            return None
+        with self._global.condition:
+            return {
+                'in_flight': self._global.in_flight,
+                'requests': self._global.requests,
+                'waited': round(self._global.waited, 3)
+            }
+
+    def stats(self):
+        """ Method to return the current state of every host. Only covers the requests made in the current process,
+        requests made from copies of the throttle sent to other processes are not included.
+
+        :return: Dictionary keyed by host, with the current 'rate' (requests per second) and 'concurrency', the number
+                of requests 'in_flight', the numbers of 'requests' sent, 'throttled' responses and 'backoffs', the total
+                number of seconds requests 'waited' for and how long the host is still held back by a 'Retry-After'
+                header ('blocked_for', in seconds).
+        :rtype: dict
+        """
+        with self._lock:
+            hosts = dict(self._hosts)
+        stats = {}
+        now = time.monotonic()
+        for host, state in hosts.items():
+            with state.condition:
+                stats[host] = {
+                    'rate': round(state.rate, 2),
+                    'concurrency': int(state.concurrency),
+                    'in_flight': state.in_flight,
+                    'requests': state.requests,
+                    'throttled': state.throttled,
+                    'backoffs': state.backoffs,
+                    'waited': round(state.waited, 3),
+                    'blocked_for': round(max(state.blocked_until - now, 0.0), 3)
+                }
+        return stats
+
+    def __getstate__(self):
+        # Locks can't be sent to another process, the copy starts over with the configuration of the throttle
+        return {
+            'rate': self.rate,
+            'concurrency': self.concurrency,
+            'max_rate': self.max_rate,
+            'max_concurrency': self.max_concurrency,
+            'min_rate': self.min_rate,
+            'min_concurrency': self.min_concurrency,
+            'decrease_factor': self.decrease_factor,
+            'burst': self.burst,
+            'throttle_statuses': self.throttle_statuses,
+            'retries': self.retries,
+            'global_rate': self.global_rate,
+            'global_concurrency': self.global_concurrency
+        }
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __str__(self):
+        return f"<HostThrottle hosts={len(self._hosts)}, rate={self.rate}, concurrency={self.concurrency}>"
+
+    def __repr__(self):
+        return f"HostThrottle(rate={self.rate}, concurrency={self.concurrency})"
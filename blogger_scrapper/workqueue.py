@@ -0,0 +1,506 @@
+"""
+    Durable queue of the pages of one or more feeds, fetched by independent worker processes and merged afterwards.
+
+    python -m blogger_scrapper.workqueue enqueue output/queue.db foobar.blogspot.com barfoo.blogspot.com
+    python -m blogger_scrapper.workqueue work output/queue.db --workers 4
+    python -m blogger_scrapper.workqueue merge output/queue.db --export json
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+import warnings
+from datetime import datetime
+from pathlib import Path
+
+from lxml import etree
+from urllib3.exceptions import HTTPError
+
+from blogger_scrapper import parser
+from blogger_scrapper.blog import AuthorRegistry, Blogsite
+from blogger_scrapper.export import FileExport, SqlExport, site_export_name
+from blogger_scrapper.index import ArticleIndex
+from blogger_scrapper.retry import FetchError, RetryPolicy
+from blogger_scrapper.session import HttpSession
+
+JOB_KINDS = ("page", "comments")
+JOB_STATUSES = ("pending", "leased", "done", "failed")
+
+
+class QueueJob:
+
+    def __init__(self, job_id, feed, kind, number, url, feed_type, attempts, owner):
+        """ A job leased from the WorkQueue - a single page of a posts feed or of a blog-wide comments feed.
+
+        :param job_id: ID of the job in the queue.
+        :type job_id: int
+        :param feed: URL of the feed the page belongs to.
+        :type feed: str
+        :param kind: Kind of the page - 'page' for the posts feed, 'comments' for the blog-wide comments feed.
+        :type kind: str
+        :param number: Number of the page in its feed.
+        :type number: int
+        :param url: URL of the page.
+        :type url: str
+        :param feed_type: Type of the feed - 'atom' or 'rss'.
+        :type feed_type: str
+        :param attempts: Number of times the job has been leased, this lease included.
+        :type attempts: int
+        :param owner: ID of the worker holding the lease.
+        :type owner: str
+        """
+        self.id = job_id
+        self.feed = feed
+        self.kind = kind
+        self.number = number
+        self.url = url
+        self.feed_type = feed_type
+        self.attempts = attempts
+        self.owner = owner
+
+    def __str__(self):
+        return f"<QueueJob id={self.id}, kind={self.kind}, number={self.number}, attempts={self.attempts}>"
+
+    def __repr__(self):
+        return f"QueueJob({self.id}, '{self.kind}', {self.number})"
+
+
+class WorkQueue:
+
+    def __init__(self, path="output/queue.db"):
+        """ Constructor for the WorkQueue object - a durable queue, kept in a SQLite database, of the pages of feeds to
+        fetch. The page plan of a feed (and of its blog-wide comments feed) is enqueued once, then any number of
+        workers - threads, processes, or processes on other hosts sharing the file system the database is kept on -
+        lease the pages, fetch and parse them and acknowledge their results. A lease that isn't acknowledged in time
+        (its worker died) expires and the page is handed to another worker. Once all pages of a feed are done, the
+        'merge' method assembles its articles, authors and comments for the exporters.
+
+        The leases rely on the clocks of the hosts of the workers being roughly in sync.
+
+        :param path: Path of the queue database, its directory is created if it doesn't exist.
+        :type path: str
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._connection = None
+
+    def _connect(self):
+        """ Hidden (private) method to open (and create, if needed) the queue database.
+
+        :return: Connection to the queue database.
+        :rtype: sqlite3.Connection
+        """
+        if self._connection is None:
+            Path.mkdir(self.path.parent, parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS feeds (feed TEXT PRIMARY KEY, feed_type TEXT, "
+                                     "site_encoding TEXT, total_results INTEGER, created TEXT)")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY, feed TEXT, kind TEXT, "
+                                     "number INTEGER, url TEXT, status TEXT DEFAULT 'pending', "
+                                     "attempts INTEGER DEFAULT 0, owner TEXT, lease_expires REAL, "
+                                     "available_at REAL DEFAULT 0, result BLOB, error TEXT, "
+                                     "UNIQUE (feed, kind, number))")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available_at)")
+        return self._connection
+
+    def enqueue_feed(self, feed, comments=True, page_size=500):
+        """ Method to enqueue the pages of the `feed`, and those of its blog-wide comments feed. Enqueuing a feed
+        already in the queue only adds its missing pages, unless its number of entries changed in the meantime - its
+        entries have then shifted between its pages and all of its jobs are replaced.
+
+        :param feed: The feed, its page plan is read from its `pages` attribute.
+        :type feed: Feed
+        :param comments: Whether to also enqueue the pages of the blog-wide comments feed; only available for Atom
+                    feeds.
+        :type comments: bool
+        :param page_size: Number of comments requested per page of the comments feed.
+        :type page_size: int
+        :return: Number of jobs added to the queue.
+        :rtype: int
+        """
+        comment_pages = feed.comment_pages(page_size) if comments and feed.feed_type == "atom" else {}
+        jobs = [(feed.url, "page", page.number, page.url) for page in feed.pages.values()]
+        jobs.extend((feed.url, "comments", page.number, page.url) for page in comment_pages.values())
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute("SELECT total_results FROM feeds WHERE feed = ?", (feed.url,)).fetchone()
+                if row is not None and row[0] != feed.total_results:
+                    warnings.warn(f"Feed at '{feed.url}' changed since it has been enqueued, replacing all its jobs")
+                    connection.execute("DELETE FROM jobs WHERE feed = ?", (feed.url,))
+                connection.execute("INSERT INTO feeds VALUES (?, ?, ?, ?, ?) ON CONFLICT (feed) DO UPDATE SET "
+                                   "total_results = excluded.total_results",
+                                   (feed.url, feed.feed_type, feed.site_encoding, feed.total_results,
+                                    datetime.now().isoformat()))
+                added = 0
+                for job in jobs:
+                    added += connection.execute("INSERT OR IGNORE INTO jobs (feed, kind, number, url) "
+                                                "VALUES (?, ?, ?, ?)", job).rowcount
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return added
+
+    def lease(self, owner, lease_seconds=60.0, max_attempts=None):
+        """ Method to lease the next job available - a pending one whose retry delay has passed, or one whose lease has
+        expired. The job is leased to the `owner` until acknowledged, failed, or `lease_seconds` have passed.
+
+        :param owner: ID of the worker leasing the job.
+        :type owner: str
+        :param lease_seconds: Number of seconds the worker has to complete the job.
+        :type lease_seconds: float
+        :param max_attempts: Optional number of leases after which a job whose lease expired is failed for good instead
+                    of being leased again, so that a page killing its workers isn't handed from one to the next forever.
+        :type max_attempts: int
+        :return: The leased job, None if no job is available at the moment.
+        :rtype: QueueJob
+        """
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            # Taking the write lock up front keeps two workers from leasing the same job
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if max_attempts is not None:
+                    connection.execute("UPDATE jobs SET status = 'failed', owner = NULL, lease_expires = NULL, "
+                                       "error = 'Lease expired on each of its ' || attempts || ' attempts' "
+                                       "WHERE status = 'leased' AND lease_expires <= ? AND attempts >= ?",
+                                       (now, max_attempts))
+                row = connection.execute(
+                    "SELECT jobs.id, jobs.feed, jobs.kind, jobs.number, jobs.url, feeds.feed_type, jobs.attempts "
+                    "FROM jobs JOIN feeds ON feeds.feed = jobs.feed "
+                    "WHERE (jobs.status = 'pending' AND jobs.available_at <= ?) "
+                    "OR (jobs.status = 'leased' AND jobs.lease_expires <= ?) "
+                    "ORDER BY jobs.id LIMIT 1", (now, now)
+                ).fetchone()
+                if row is not None:
+                    connection.execute("UPDATE jobs SET status = 'leased', owner = ?, lease_expires = ?, "
+                                       "attempts = attempts + 1 WHERE id = ?", (owner, now + lease_seconds, row[0]))
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        job_id, feed, kind, number, url, feed_type, attempts = row
+        return QueueJob(job_id, feed, kind, number, url, feed_type, attempts + 1, owner)
+
+    def ack(self, job, result):
+        """ Method to complete the `job` with its `result`.
+
+        :param job: The leased job.
+        :type job: QueueJob
+        :param result: Parsed content of the page - its articles or comments.
+        :type result: list
+        :return: Whether the result has been kept; False if the lease was lost to another worker in the meantime.
+        :rtype: bool
+        """
+        data = pickle.dumps(list(result), protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            return self._connect().execute("UPDATE jobs SET status = 'done', result = ?, error = NULL, owner = NULL, "
+                                           "lease_expires = NULL WHERE id = ? AND status = 'leased' AND owner = ?",
+                                           (data, job.id, job.owner)).rowcount == 1
+
+    def fail(self, job, error, retry_in=None):
+        """ Method to give the `job` back after a failed attempt, either to be attempted again in `retry_in` seconds or
+        for good.
+
+        :param job: The leased job.
+        :type job: QueueJob
+        :param error: Description of the failure.
+        :type error: str
+        :param retry_in: Optional number of seconds after which the job may be leased again; the job is failed for
+                    good if not provided.
+        :type retry_in: float
+        :return: Whether the job has been given back; False if the lease was lost to another worker in the meantime.
+        :rtype: bool
+        """
+        status = "pending" if retry_in is not None else "failed"
+        available_at = time.time() + retry_in if retry_in is not None else 0
+        with self._lock:
+            return self._connect().execute("UPDATE jobs SET status = ?, error = ?, available_at = ?, owner = NULL, "
+                                           "lease_expires = NULL WHERE id = ? AND status = 'leased' AND owner = ?",
+                                           (status, error, available_at, job.id, job.owner)).rowcount == 1
+
+    def requeue_failed(self, feed=None):
+        """ Method to make the failed jobs of the `feed`, or of all feeds, available again with a fresh number of
+        attempts.
+
+        :param feed: Optional URL of the feed.
+        :type feed: str
+        :return: Number of jobs requeued.
+        :rtype: int
+        """
+        with self._lock:
+            if feed is None:
+                return self._connect().execute("UPDATE jobs SET status = 'pending', attempts = 0, available_at = 0 "
+                                               "WHERE status = 'failed'").rowcount
+            return self._connect().execute("UPDATE jobs SET status = 'pending', attempts = 0, available_at = 0 "
+                                           "WHERE status = 'failed' AND feed = ?", (feed,)).rowcount
+
+    def feeds(self):
+        """ Method to return the feeds in the queue.
+
+        :return: Dictionary keyed by the URL of the feed, in the order the feeds have been enqueued, with the
+                'feed_type', the 'site_encoding' and the number of entries ('total_results') of the feed.
+        :rtype: dict
+        """
+        with self._lock:
+            rows = self._connect().execute("SELECT feed, feed_type, site_encoding, total_results FROM feeds "
+                                           "ORDER BY rowid").fetchall()
+        return {feed: {'feed_type': feed_type, 'site_encoding': site_encoding, 'total_results': total_results}
+                for feed, feed_type, site_encoding, total_results in rows}
+
+    def stats(self, feed=None):
+        """ Method to return the number of jobs in every status, of the `feed` or of all feeds.
+
+        :param feed: Optional URL of the feed.
+        :type feed: str
+        :return: Dictionary with the number of jobs per status; leased jobs whose lease has expired count as pending.
+        :rtype: dict
+        """
+        query = "SELECT status, lease_expires < ?, COUNT(*) FROM jobs {}GROUP BY status, lease_expires < ?"
+        with self._lock:
+            if feed is None:
+                rows = self._connect().execute(query.format(""), (time.time(), time.time())).fetchall()
+            else:
+                rows = self._connect().execute(query.format("WHERE feed = ? "),
+                                               (time.time(), feed, time.time())).fetchall()
+        stats = {status: 0 for status in JOB_STATUSES}
+        for status, expired, count in rows:
+            stats["pending" if status == "leased" and expired else status] += count
+        return stats
+
+    def merge(self, feed):
+        """ Method to assemble the results of the jobs of the `feed` - the articles of its pages in page order, with
+        the comments of its comments feed attached to them, and a single canonical object per author. Jobs not done
+        (yet) are left out, with a warning.
+
+        :param feed: URL of the feed.
+        :type feed: str
+        :return: Tuple of the articles, the authors and the comments of the feed.
+        :rtype: tuple[list, list[BlogAuthor], list[BlogComment]]
+        """
+        with self._lock:
+            rows = self._connect().execute("SELECT kind, number, status, result FROM jobs WHERE feed = ? "
+                                           "ORDER BY kind DESC, number", (feed,)).fetchall()
+        not_done = [f"{kind} {number}" for kind, number, status, _result in rows if status != "done"]
+        if not_done:
+            warnings.warn(f"{len(not_done)} jobs of the feed at '{feed}' aren't done, leaving them out of the merge - "
+                          f"{', '.join(not_done)}")
+
+        authors = AuthorRegistry()
+        articles_by_id = {}
+        orphan_comments = 0
+        for kind, _number, status, result in rows:
+            if status != "done":
+                continue
+            for item in pickle.loads(result):
+                item.author = authors.intern(item.author)
+                if kind == "page":
+                    # Entries shifting between the pages while they were fetched show up twice, the first one is kept
+                    articles_by_id.setdefault(item.article_id, item)
+                    continue
+                article = articles_by_id.get(item.article_backref)
+                if article is not None:
+                    article.comments.append(item)
+                else:
+                    orphan_comments += 1
+        if orphan_comments:
+            warnings.warn(f"{orphan_comments} comments of the feed at '{feed}' belong to articles not in the merge")
+        index = ArticleIndex(list(articles_by_id.values()))
+        return index.articles(), index.authors(), index.comments()
+
+    def clear(self, feed=None):
+        """ Method to delete the jobs of the `feed`, or of all feeds if none is provided.
+
+        :param feed: Optional URL of the feed.
+        :type feed: str
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if feed is None:
+                    connection.execute("DELETE FROM jobs")
+                    connection.execute("DELETE FROM feeds")
+                else:
+                    connection.execute("DELETE FROM jobs WHERE feed = ?", (feed,))
+                    connection.execute("DELETE FROM feeds WHERE feed = ?", (feed,))
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        """ Method to close the queue database; the queue can still be used afterwards, it's simply re-opened.
+
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def __getstate__(self):
+        # The database connection can't be sent to another process, the copy opens its own
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __str__(self):
+        return f"<WorkQueue path={self.path}>"
+
+    def __repr__(self):
+        return f"WorkQueue(path='{self.path}')"
+
+
+def _fetch_job(job, session, retry_policy):
+    """ Hidden (private) function to fetch and parse the page of the `job`.
+
+    :param job: The leased job.
+    :type job: QueueJob
+    :param session: HTTP session to fetch the page with.
+    :type session: HttpSession
+    :param retry_policy: Policy deciding which failures are worth another attempt.
+    :type retry_policy: RetryPolicy
+    :return: The articles or the comments of the page.
+    :rtype: list
+    """
+    try:
+        content = session.get(job.url)
+    except HTTPError as e:
+        raise FetchError(f"Failed to load the {job.kind} {job.number} at '{job.url}' - {e}")
+    if content.status != 200:
+        raise FetchError(f"Loading the {job.kind} {job.number} at '{job.url}' returned unexpected HTTP code "
+                         f"- {content.status}", status=content.status,
+                         retryable=retry_policy.is_retryable(content.status))
+    # Authors are only made canonical across the pages by the merge
+    try:
+        if job.kind == "comments":
+            return list(parser.iter_comments(content.data))
+        return list(parser.iter_articles(content.data, job.feed_type))
+    except etree.XMLSyntaxError as e:
+        raise FetchError(f"Failed to parse the {job.kind} {job.number} at '{job.url}' - {e}")
+
+
+def run_worker(queue, session=None, owner=None, retry_policy=None, lease_seconds=60.0, idle_timeout=None,
+               poll_interval=0.5, max_jobs=None):
+    """ Function running a worker of the `queue` - leasing its jobs one after the other, fetching and parsing their
+    pages and acknowledging their results, until the queue has no job left pending or leased to another worker (whose
+    lease may yet expire). Any number of workers can run against the same queue, in threads, processes or on other
+    hosts.
+
+    :param queue: The queue to work on.
+    :type queue: WorkQueue
+    :param session: Optional HTTP session to fetch the pages with.
+    :type session: HttpSession
+    :param owner: Optional ID of the worker; defaults to the host name and process ID, plus a random suffix.
+    :type owner: str
+    :param retry_policy: Optional policy deciding which failed jobs are attempted again and when; its `max_attempts`
+                    also bounds the leases of a job whose workers keep dying on it.
+    :type retry_policy: RetryPolicy
+    :param lease_seconds: Number of seconds the worker has to complete a job before it's handed to another worker.
+    :type lease_seconds: float
+    :param idle_timeout: Optional number of seconds after which to stop when no job has been available, instead of
+                    waiting for the retries and the jobs leased by other workers.
+    :type idle_timeout: float
+    :param poll_interval: Number of seconds between two attempts at leasing a job when none is available.
+    :type poll_interval: float
+    :param max_jobs: Optional number of jobs after which the worker stops.
+    :type max_jobs: int
+    :return: Number of jobs completed by the worker.
+    :rtype: int
+    """
+    session = session if session is not None else HttpSession()
+    owner = owner if owner is not None else f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+    completed = 0
+    idle_since = None
+    while max_jobs is None or completed < max_jobs:
+        job = queue.lease(owner, lease_seconds, retry_policy.max_attempts)
+        if job is None:
+            stats = queue.stats()
+            if not stats['pending'] and not stats['leased']:
+                break
+            idle_since = idle_since if idle_since is not None else time.monotonic()
+            if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                break
+            time.sleep(poll_interval)
+            continue
+        idle_since = None
+        try:
+            result = _fetch_job(job, session, retry_policy)
+        except FetchError as e:
+            retry_in = retry_policy.delay(job.attempts) if retry_policy.should_retry(e, job.attempts) else None
+            queue.fail(job, str(e), retry_in)
+            continue
+        except Exception as e:
+            # A page the parser can't make sense of would fail the same way again, it's failed for good
+            queue.fail(job, f"{type(e).__name__}: {e}")
+            continue
+        if queue.ack(job, result):
+            completed += 1
+    return completed
+
+
+def _worker_process(path, lease_seconds, idle_timeout):
+    return run_worker(WorkQueue(path), lease_seconds=lease_seconds, idle_timeout=idle_timeout)
+
+
+def main(argv=None):
+    argparser = argparse.ArgumentParser(prog="python -m blogger_scrapper.workqueue",
+                                        description=__doc__.strip().splitlines()[0])
+    commands = argparser.add_subparsers(dest="command", required=True)
+    enqueue = commands.add_parser("enqueue", help="Enqueue the pages of the feeds of the sites")
+    enqueue.add_argument("queue", help="Path of the queue database")
+    enqueue.add_argument("sites", nargs="+", help="URLs of the Blogger sites")
+    enqueue.add_argument("--feed", choices=("atom", "rss"), default="atom")
+    enqueue.add_argument("--no-comments", action="store_true", help="Don't enqueue the comments feeds")
+    work = commands.add_parser("work", help="Run workers until the queue is done")
+    work.add_argument("queue", help="Path of the queue database")
+    work.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+    work.add_argument("--lease", type=float, default=60.0, help="Seconds a worker has to complete a job")
+    work.add_argument("--idle-timeout", type=float, default=None,
+                      help="Seconds after which a worker stops when no job has been available")
+    merge = commands.add_parser("merge", help="Merge and export the results of the feeds")
+    merge.add_argument("queue", help="Path of the queue database")
+    merge.add_argument("--export", choices=("json", "xml", "sql", "ndjson"), default="json")
+    args = argparser.parse_args(argv)
+
+    queue = WorkQueue(args.queue)
+    if args.command == "enqueue":
+        for site in args.sites:
+            feed = Blogsite(site, feed=args.feed).blog_feed
+            added = queue.enqueue_feed(feed, comments=not args.no_comments)
+            print(f"{feed.url}: {added} jobs enqueued")
+    elif args.command == "work":
+        with multiprocessing.Pool(args.workers) as pool:
+            completed = pool.starmap(_worker_process, [(args.queue, args.lease, args.idle_timeout)] * args.workers)
+        print(f"{sum(completed)} jobs completed - {queue.stats()}")
+    else:
+        for feed, feed_info in queue.feeds().items():
+            articles, authors, comments = queue.merge(feed)
+            name = site_export_name(feed)
+            if args.export == "sql":
+                SqlExport(articles, authors, comments, name=name).do_export()
+            else:
+                FileExport(articles, authors, comments, args.export, feed_info['site_encoding'],
+                           name=name).do_export()
+            print(f"{feed}: {len(articles)} articles, {len(authors)} authors, {len(comments)} comments exported")
+    stats = queue.stats()
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
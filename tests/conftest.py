@@ -0,0 +1,35 @@
+"""
+    Fixtures of the tests, run against the local stub of a Blogger site of the benchmarks.
+"""
+
+import os
+import sys
+
+import pytest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, _ROOT)
+sys.path.insert(0, os.path.join(_ROOT, "benchmarks"))
+
+from stub_server import StubBlog, StubServer  # noqa: E402
+from blogger_scrapper.retry import RetryPolicy  # noqa: E402
+
+POSTS = 120
+PAGE_SIZE = 25
+
+
+@pytest.fixture(autouse=True)
+def _working_directory(tmp_path, monkeypatch):
+    # Exports, checkpoints and queues default to the 'output' directory of the working directory
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def stub():
+    with StubServer(StubBlog(posts=POSTS, comments_every=0, content_size=100)) as server:
+        yield server
+
+
+@pytest.fixture
+def retry_policy():
+    return RetryPolicy(backoff=0.01, max_backoff=0.05)
@@ -0,0 +1,82 @@
+"""
+    Tests of the fetching of the feed pages - failed and malformed pages, their retry, and the checkpoint resume.
+"""
+
+import pytest
+
+from conftest import PAGE_SIZE, POSTS
+from blogger_scrapper.blog import Blogsite
+from blogger_scrapper.checkpoint import FeedCheckpoint
+
+pytestmark = pytest.mark.filterwarnings("ignore")
+
+
+def _feed(stub, retry_policy, feed_type="atom"):
+    return Blogsite(stub.url, feed=feed_type, max_workers=4, retry_policy=retry_policy).blog_feed
+
+
+@pytest.mark.parametrize("feed_type", ["atom", "rss"])
+def test_failed_page_allow_partial(stub, retry_policy, feed_type):
+    stub._server.failing_pages = {str(PAGE_SIZE + 1)}
+    feed = _feed(stub, retry_policy, feed_type)
+
+    articles = feed.fetch_all(comments_mode="lazy", allow_partial=True)
+
+    assert [page.number for page in feed.failed_pages] == [2]
+    assert len(articles) == POSTS - PAGE_SIZE
+    # The failing page is attempted as many times as the retry policy allows, and no more
+    assert stub.failed == retry_policy.max_attempts
+
+
+@pytest.mark.parametrize("feed_type", ["atom", "rss"])
+def test_malformed_page_allow_partial(stub, retry_policy, feed_type):
+    stub._server.malformed_pages = {str(2 * PAGE_SIZE + 1)}
+    feed = _feed(stub, retry_policy, feed_type)
+
+    articles = feed.fetch_all(comments_mode="lazy", allow_partial=True)
+
+    assert [page.number for page in feed.failed_pages] == [3]
+    assert len(articles) == POSTS - PAGE_SIZE
+
+
+def test_failed_page_raises_without_allow_partial(stub, retry_policy):
+    stub._server.failing_pages = {str(PAGE_SIZE + 1)}
+    feed = _feed(stub, retry_policy)
+
+    with pytest.raises(RuntimeError, match="page numbers 2"):
+        feed.fetch_all(comments_mode="lazy")
+
+
+def test_retry_failed_pages(stub, retry_policy):
+    stub._server.failing_pages = {str(PAGE_SIZE + 1), str(3 * PAGE_SIZE + 1)}
+    feed = _feed(stub, retry_policy)
+    feed.fetch_all(comments_mode="lazy", allow_partial=True)
+    assert sorted(page.number for page in feed.failed_pages) == [2, 4]
+
+    stub._server.failing_pages = set()
+    articles = feed.retry_failed_pages(comments_mode="lazy")
+
+    assert len(articles) == 2 * PAGE_SIZE
+    assert feed.failed_pages == []
+    assert len(feed.index.articles()) == POSTS
+
+
+def test_checkpoint_resume(stub, retry_policy):
+    expected = [article.article_id for article in _feed(stub, retry_policy).fetch_all(comments_mode="lazy")]
+    checkpoint = FeedCheckpoint("checkpoint")
+    stub._server.failing_pages = {str(PAGE_SIZE + 1)}
+    feed = _feed(stub, retry_policy)
+    feed.fetch_all(comments_mode="lazy", allow_partial=True, checkpoint=checkpoint)
+    assert [run['completed'] for run in checkpoint.stats().values()] == [len(feed.pages) - 1]
+
+    # A new feed object, as after a restart, only fetches the page missing from the checkpoint
+    stub._server.failing_pages = set()
+    feed = _feed(stub, retry_policy)
+    requests = stub.requests
+    articles = feed.fetch_all(comments_mode="lazy", checkpoint=checkpoint)
+
+    assert stub.requests - requests == 1
+    assert [article.article_id for article in articles] == expected
+    assert len(feed.index.articles()) == POSTS
+    assert checkpoint.stats() == {}
+    checkpoint.close()
@@ -0,0 +1,77 @@
+"""
+    Tests of the work queue - expired leases and poison jobs.
+"""
+
+import time
+
+import pytest
+
+from conftest import PAGE_SIZE, POSTS
+from blogger_scrapper import workqueue
+from blogger_scrapper.blog import Blogsite
+from blogger_scrapper.workqueue import WorkQueue, run_worker
+
+pytestmark = pytest.mark.filterwarnings("ignore")
+
+
+@pytest.fixture
+def queue():
+    queue = WorkQueue("queue.db")
+    yield queue
+    queue.close()
+
+
+def _enqueue(queue, stub):
+    feed = Blogsite(stub.url).blog_feed
+    return feed, queue.enqueue_feed(feed, comments=False)
+
+
+def test_lease_expiry(stub, queue, retry_policy):
+    feed, jobs = _enqueue(queue, stub)
+
+    # A worker dying on the same job on each of its leases
+    leased = []
+    for _attempt in range(retry_policy.max_attempts):
+        leased.append(queue.lease("dead", lease_seconds=0.01, max_attempts=retry_policy.max_attempts))
+        time.sleep(0.02)
+    assert len({job.id for job in leased}) == 1
+    assert [job.attempts for job in leased] == [1, 2, 3]
+
+    # Its lease expired on every attempt, the job is failed for good instead of being leased again
+    completed = run_worker(queue, retry_policy=retry_policy, poll_interval=0.01)
+    assert completed == jobs - 1
+    assert queue.stats(feed.url)['failed'] == 1
+    articles, _authors, _comments = queue.merge(feed.url)
+    assert len(articles) == POSTS - PAGE_SIZE
+
+
+def test_expired_lease_handed_to_another_worker(stub, queue, retry_policy):
+    feed, jobs = _enqueue(queue, stub)
+    dead = queue.lease("dead", lease_seconds=0.01)
+    time.sleep(0.02)
+
+    assert run_worker(queue, retry_policy=retry_policy, poll_interval=0.01) == jobs
+    # The late worker lost its lease, its result isn't kept
+    assert not queue.ack(dead, [])
+    articles, _authors, _comments = queue.merge(feed.url)
+    assert len(articles) == POSTS
+
+
+def test_poison_job(stub, queue, retry_policy, monkeypatch):
+    feed, jobs = _enqueue(queue, stub)
+    iter_articles = workqueue.parser.iter_articles
+
+    def poisoned(data, feed_type):
+        if f"<openSearch:startIndex>{PAGE_SIZE + 1}<".encode() in data:
+            raise ValueError("Unexpected entry")
+        return iter_articles(data, feed_type)
+
+    monkeypatch.setattr(workqueue.parser, "iter_articles", poisoned)
+    requests = stub.requests
+    completed = run_worker(queue, retry_policy=retry_policy, poll_interval=0.01)
+
+    # The page the parser can't make sense of is failed on its first attempt, the rest of the jobs are completed
+    assert completed == jobs - 1
+    assert stub.requests - requests == jobs
+    assert queue.stats(feed.url)['failed'] == 1
+    assert len(queue.merge(feed.url)[0]) == POSTS - PAGE_SIZE